@@ -9,15 +9,23 @@ Usage:
     python main.py              # Interactive clause analysis
     python main.py --evaluate   # Run evaluation suite
     python main.py --compare    # Compare prompt strategies
+    python main.py --review     # Playbook review (or pipe: cat c.txt | python main.py --review --playbook NAME)
 """
 
 import argparse
+import io
 import os
 import sys
 
+import orjson
+
 from src.logging_config import setup_logging
+from src.breach_analysis import generate_breach_report
 from src.embeddings import load_clause_database
-from src.rag_pipeline import analyze_clause, STRATEGIES
+from src.kb_search import search_knowledge_base
+from src.playbook_review import review_contract
+from src.rag_pipeline import analyze_clause, ANALYZE_STRATEGIES
+from src.retrieval import search_similar_clauses_by_vector
 from src.evaluation import (
     evaluate_retrieval,
     compare_strategies,
@@ -60,6 +68,15 @@ def interactive_mode(db: dict):
     print(f"  Powered by RAG ({store_name} + {provider_name})")
     print("=" * 60)
 
+    # Sample texts are fixed: embed them in one batched call up front and
+    # memoize their retrieval results so repeat selections skip the search.
+    sample_embeddings = dict(zip(
+        SAMPLE_CLAUSES,
+        db["provider"].embed([s["text"] for s in SAMPLE_CLAUSES.values()]),
+    ))
+    sample_retrievals: dict[str, list[dict]] = {}
+    strategy = "few_shot"
+
     while True:
         print("\nOptions:")
         print("  [1-3]  Analyze a sample clause")
@@ -76,24 +93,28 @@ def interactive_mode(db: dict):
             print("Goodbye!")
             break
 
-        # Select prompt strategy
-        strategy = "few_shot"
-
+        # Select prompt strategy (persists for the rest of the session)
         if choice == "s":
             print("\nAvailable strategies:")
-            for name in STRATEGIES:
+            for name in sorted(ANALYZE_STRATEGIES):
                 marker = " (default)" if name == "few_shot" else ""
                 print(f"  - {name}{marker}")
             strategy = input("Strategy: ").strip()
-            if strategy not in STRATEGIES:
+            if strategy not in ANALYZE_STRATEGIES:
                 print(f"Unknown strategy. Using few_shot.")
                 strategy = "few_shot"
             continue
 
         # Get the clause text
+        retrieved = None
         if choice in SAMPLE_CLAUSES:
             clause_text = SAMPLE_CLAUSES[choice]["text"]
             print(f"\nAnalyzing: {SAMPLE_CLAUSES[choice]['name']}")
+            if choice not in sample_retrievals:
+                sample_retrievals[choice] = search_similar_clauses_by_vector(
+                    sample_embeddings[choice], db
+                )
+            retrieved = sample_retrievals[choice]
         elif choice == "p":
             print("Paste your clause (enter a blank line when done):")
             lines = []
@@ -112,7 +133,7 @@ def interactive_mode(db: dict):
 
         # Run the RAG pipeline
         print("\nSearching knowledge base and generating analysis...")
-        result = analyze_clause(clause_text, db, strategy=strategy)
+        result = analyze_clause(clause_text, db, strategy=strategy, retrieved=retrieved)
 
         # Display draft header
         print(f"\n{'=' * 60}")
@@ -130,8 +151,7 @@ def interactive_mode(db: dict):
         print(f"\n--- Analysis ---")
         analysis = result["analysis"]
         if isinstance(analysis, dict):
-            import json
-            print(json.dumps(analysis, indent=2))
+            print(orjson.dumps(analysis, option=orjson.OPT_INDENT_2).decode())
         else:
             print(analysis)
 
@@ -155,8 +175,15 @@ def main():
                         help="Run breach notification analysis")
     parser.add_argument("--kb", action="store_true",
                         help="Interactive knowledge base search")
+    parser.add_argument("--playbook",
+                        help="Playbook name or number for --review (required when piping a contract)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Re-classify every clause instead of reusing cached classifications")
     args = parser.parse_args()
 
+    if args.no_cache:
+        os.environ["CLASSIFY_CACHE_ENABLED"] = "false"
+
     print("Initializing knowledge base...")
     db = load_clause_database()
 
@@ -171,8 +198,6 @@ def main():
         print_comparison_results(comparison)
 
     elif args.breach:
-        from src.breach_analysis import generate_breach_report
-
         print("\n--- Data Breach Response Accelerator ---")
         print("Enter breach parameters:\n")
 
@@ -222,8 +247,6 @@ def main():
                         print(f"  * {note}")
 
     elif args.kb:
-        from src.kb_search import search_knowledge_base
-
         print("\n" + "=" * 60)
         print("  LEGAL KNOWLEDGE BASE")
         print("  Ask questions about contracts, breach notification, playbooks")
@@ -271,40 +294,61 @@ def main():
             print(f"\n{result['disclaimer']}")
 
     elif args.review:
-        from glob import glob
-        from src.playbook_review import review_contract
-
-        playbook_files = sorted(glob("data/playbooks/*.json"))
-        if not playbook_files:
+        with os.scandir("data/playbooks") as it:
+            entries = sorted(
+                (e for e in it if e.name.endswith(".json") and e.is_file()),
+                key=lambda e: e.name,
+            )
+        if not entries:
             print("No playbooks found in data/playbooks/")
             sys.exit(1)
 
-        print("\nAvailable playbooks:")
-        for i, path in enumerate(playbook_files, 1):
-            name = os.path.splitext(os.path.basename(path))[0]
-            print(f"  [{i}] {name}")
+        playbook_files = [e.path for e in entries]
+        names = [e.name.removesuffix(".json") for e in entries]
+        piped = not sys.stdin.isatty()
 
-        choice = input("\nSelect playbook number: ").strip()
-        try:
-            playbook_path = playbook_files[int(choice) - 1]
-        except (ValueError, IndexError):
-            print("Invalid selection.")
+        if args.playbook:
+            choice = args.playbook
+        elif piped:
+            # stdin carries the contract, so the playbook can't be prompted for
+            print(f"--playbook is required when piping a contract. Available: {', '.join(names)}")
             sys.exit(1)
+        else:
+            print("\nAvailable playbooks:")
+            for i, name in enumerate(names, 1):
+                print(f"  [{i}] {name}")
+            choice = input("\nSelect playbook number: ").strip()
 
-        print("\nPaste your contract text (enter two blank lines when done):")
-        lines = []
-        blank_count = 0
-        while True:
-            line = input()
-            if line == "":
-                blank_count += 1
-                if blank_count >= 2:
+        if choice in names:
+            playbook_path = playbook_files[names.index(choice)]
+        else:
+            try:
+                playbook_path = playbook_files[int(choice) - 1]
+            except (ValueError, IndexError):
+                print("Invalid selection.")
+                sys.exit(1)
+
+        if piped:
+            # e.g. cat contract.txt | python main.py --review --playbook saas-vendor-review
+            contract_text = sys.stdin.read().strip()
+        else:
+            print("\nPaste your contract text (enter two blank lines when done):")
+            buf = io.StringIO()
+            blank_count = 0
+            while True:
+                try:
+                    line = input()
+                except EOFError:
                     break
-                lines.append(line)
-            else:
-                blank_count = 0
-                lines.append(line)
-        contract_text = "\n".join(lines).strip()
+                if line == "":
+                    blank_count += 1
+                    if blank_count >= 2:
+                        break
+                else:
+                    blank_count = 0
+                buf.write(line)
+                buf.write("\n")
+            contract_text = buf.getvalue().strip()
 
         if len(contract_text) < 50:
             print("Contract text too short (minimum 50 characters).")
@@ -9,12 +9,12 @@ Usage:
     python -m scripts.upsert_to_pinecone
 """
 
-import json
 import os
 
 from dotenv import load_dotenv
 
-from src.embeddings import get_embeddings, infer_practice_area
+from src.clauses_cache import load_clauses
+from src.embeddings import embed_batched, infer_practice_area
 from src.provider import create_provider
 from src.vector_store import PineconeVectorStore
 
@@ -30,8 +30,7 @@ def main():
         raise SystemExit(1)
 
     data_path = "data/clauses.json"
-    with open(data_path) as f:
-        clauses = json.load(f)
+    clauses = load_clauses(data_path)
 
     print(f"Loaded {len(clauses)} clauses from {data_path}")
 
@@ -42,10 +41,12 @@ def main():
     ]
 
     print(f"Creating embeddings via {provider.provider_name}...")
-    embeddings = get_embeddings(texts_to_embed, provider)
+    embeddings = embed_batched(texts_to_embed, provider)
     print(f"Created {len(embeddings)} embeddings of dimension {embeddings.shape[1]}")
 
     ids = [clause["id"] for clause in clauses]
+    # Few distinct clause types, so derive each practice area once
+    practice_areas = {t: infer_practice_area(t) for t in {c["type"] for c in clauses}}
     metadata = []
     for clause in clauses:
         metadata.append({
@@ -58,7 +59,7 @@ def main():
             "source": "clauses_json",
             "doc_type": "clause",
             "clause_type": clause["type"],
-            "practice_area": infer_practice_area(clause["type"]),
+            "practice_area": practice_areas[clause["type"]],
         })
 
     print(f"Connecting to Pinecone index '{index_name}'...")
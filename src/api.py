@@ -9,42 +9,97 @@ Usage:
     python -m src.api
 """
 
+import asyncio
 import json
 import logging
 import os
 import time
 
+from contextlib import asynccontextmanager
 from pathlib import Path
 
+import anyio.to_thread
 from fastapi import FastAPI, Depends, HTTPException, Security, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.security import APIKeyHeader
 from dotenv import load_dotenv
 
 from src.api_models import (
     AnalyzeRequest, AnalyzeResponse,
-    SearchRequest, SearchResponse, SearchResult,
+    SearchRequest, SearchResponse,
     HealthResponse, ErrorResponse, SourceInfo,
     ContractReviewRequest, ContractReviewResponse,
     BreachRequest, BreachResponse,
     KBSearchRequest, KBSearchResponse,
 )
+from src.breach_analysis import breach_query, generate_breach_report
 from src.embeddings import load_clause_database
-from src.rag_pipeline import analyze_clause, STRATEGIES
-from src.retrieval import search_similar_clauses
+from src.kb_search import search_knowledge_base
+from src.playbook_review import review_contract
+from src.rag_pipeline import analyze_clause, analyze_clause_stream, STRATEGIES
+from src.retrieval import search_similar_clauses, search_similar_clauses_by_vector
+from src.semantic_cache import SemanticCache
 from src.logging_config import setup_logging
 
 load_dotenv()
 setup_logging()
 logger = logging.getLogger(__name__)
 
+# Reported by /health; fixed at import, so not rebuilt per probe
+_STRATEGY_NAMES: tuple[str, ...] = tuple(STRATEGIES)
+
+# --- Database lifecycle ---
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start loading the knowledge base in a worker thread at startup.
+
+    The server begins accepting connections immediately; requests that
+    need the database await the load instead of triggering it, so the
+    embedding/index load never runs on the event loop or twice.
+    """
+    # Sync endpoints run in anyio's worker threads and mostly wait on LLM
+    # and embedding calls; the default of 40 threads caps concurrent requests
+    anyio.to_thread.current_default_thread_limiter().total_tokens = int(
+        os.environ.get("API_THREAD_LIMIT", "128")
+    )
+
+    logger.info("Initializing knowledge base...")
+
+    def _store_db(future: asyncio.Future) -> None:
+        if not future.cancelled() and future.exception() is None:
+            app.state.db = future.result()
+
+    app.state.db = None
+    app.state.db_future = asyncio.get_running_loop().run_in_executor(
+        None, load_clause_database
+    )
+    app.state.db_future.add_done_callback(_store_db)
+    yield
+
+
+async def get_db(request: Request) -> dict:
+    """
+    Get the loaded database.
+
+    Once loading has finished the database is returned directly; only
+    requests that arrive during startup wait on the load.
+    """
+    db = request.app.state.db
+    if db is not None:
+        return db
+    return await request.app.state.db_future
+
+
 # --- App setup ---
 
 app = FastAPI(
     title="Legal RAG API",
     description="RAG-powered legal contract analysis and knowledge base search",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # --- CORS ---
@@ -77,18 +132,34 @@ def verify_api_key(api_key: str = Security(API_KEY_HEADER)) -> str:
     return api_key
 
 
-# --- Database lifecycle ---
+# --- Semantic cache ---
 
-_db: dict | None = None
+_semantic_cache: SemanticCache | None = None
 
 
-def get_db() -> dict:
-    """Get the loaded database, initializing on first call."""
-    global _db
-    if _db is None:
-        logger.info("Initializing knowledge base...")
-        _db = load_clause_database()
-    return _db
+def semantic_cache_enabled() -> bool:
+    """Semantic caching is opt-in via SEMANTIC_CACHE_ENABLED=1."""
+    return os.environ.get("SEMANTIC_CACHE_ENABLED", "").lower() in ("1", "true", "yes")
+
+
+def get_semantic_cache(dim: int) -> SemanticCache:
+    """
+    Get the process-wide semantic cache, creating it on first use.
+
+    Created lazily because the embedding dimension is only known once the
+    first query has been embedded. Threshold, capacity, and the evidence
+    overlap required for a hit are tunable via SEMANTIC_CACHE_THRESHOLD,
+    SEMANTIC_CACHE_CAPACITY, and SEMANTIC_CACHE_EVIDENCE_THRESHOLD.
+    """
+    global _semantic_cache
+    if _semantic_cache is None or _semantic_cache.dim != dim:
+        _semantic_cache = SemanticCache(
+            dim,
+            threshold=float(os.environ.get("SEMANTIC_CACHE_THRESHOLD", "0.97")),
+            capacity=int(os.environ.get("SEMANTIC_CACHE_CAPACITY", "1024")),
+            evidence_threshold=float(os.environ.get("SEMANTIC_CACHE_EVIDENCE_THRESHOLD", "0.8")),
+        )
+    return _semantic_cache
 
 
 # --- Request logging middleware ---
@@ -96,13 +167,13 @@ def get_db() -> dict:
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     """Log every request with timing."""
-    start = time.time()
+    start = time.perf_counter()
     response = await call_next(request)
-    elapsed = time.time() - start
+    elapsed = time.perf_counter() - start
+    # Lazy %-formatting: nothing is formatted when INFO is disabled
     logger.info(
-        f"{request.method} {request.url.path} "
-        f"status={response.status_code} "
-        f"time={elapsed:.3f}s"
+        "%s %s status=%d time=%.3fs",
+        request.method, request.url.path, response.status_code, elapsed,
     )
     return response
 
@@ -118,7 +189,7 @@ def health(db: dict = Depends(get_db)):
         provider=db["provider"].provider_name,
         vector_store=os.environ.get("VECTOR_STORE_PROVIDER", "faiss").upper(),
         document_count=store.total_vectors,
-        available_strategies=list(STRATEGIES.keys()),
+        available_strategies=_STRATEGY_NAMES,
     )
 
 
@@ -135,23 +206,32 @@ def analyze(req: AnalyzeRequest, db: dict = Depends(get_db)):
     a risk analysis with citations. Output is always a draft
     requiring attorney review.
     """
-    # knowledge_base_qa has different output semantics — use /ask instead
-    analyze_strategies = {k for k in STRATEGIES if k != "knowledge_base_qa"}
-    if req.strategy not in analyze_strategies:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Unknown strategy '{req.strategy}'. "
-                   f"Available: {sorted(analyze_strategies)}"
-        )
-
     logger.info(f"Analyze request: strategy={req.strategy}, top_k={req.top_k}")
 
-    result = analyze_clause(
-        req.clause_text,
-        db,
-        strategy=req.strategy,
-        top_k=req.top_k,
-    )
+    result = None
+    cache = None
+    retrieved = None
+    evidence_ids = None
+    scope = f"analyze:{req.strategy}:{req.top_k}"
+    if semantic_cache_enabled():
+        # Embed and retrieve once: the results serve the cache lookup (a hit
+        # must cite mostly the same sources) and, on a miss, the analysis
+        query_embedding = db["provider"].embed([req.clause_text])
+        retrieved = search_similar_clauses_by_vector(query_embedding, db, top_k=req.top_k)
+        evidence_ids = [r["clause"]["id"] for r in retrieved]
+        cache = get_semantic_cache(query_embedding.shape[1])
+        result = cache.get(query_embedding, scope, evidence_ids)
+
+    if result is None:
+        result = analyze_clause(
+            req.clause_text,
+            db,
+            strategy=req.strategy,
+            top_k=req.top_k,
+            retrieved=retrieved,
+        )
+        if cache is not None:
+            cache.put(query_embedding, result, scope, evidence_ids)
 
     return AnalyzeResponse(
         analysis=result["analysis"],
@@ -164,6 +244,35 @@ def analyze(req: AnalyzeRequest, db: dict = Depends(get_db)):
     )
 
 
+@app.post("/analyze/stream", dependencies=[Depends(verify_api_key)])
+def analyze_stream(req: AnalyzeRequest, db: dict = Depends(get_db)):
+    """
+    Analyze a contract clause, streaming the result as server-sent events.
+
+    Sends one "source" event per retrieved clause as soon as retrieval
+    finishes, "token" events as the LLM generates, then a final "done"
+    event carrying the parsed analysis, review status, and disclaimer.
+    """
+    logger.info(f"Analyze stream request: strategy={req.strategy}, top_k={req.top_k}")
+
+    def events():
+        try:
+            for event in analyze_clause_stream(
+                req.clause_text, db, strategy=req.strategy, top_k=req.top_k
+            ):
+                yield f"data: {json.dumps(event)}\n\n"
+        except Exception:
+            # Headers are already sent, so report the failure in-band
+            logger.exception("Analyze stream failed")
+            yield f"data: {json.dumps({'type': 'error', 'detail': 'Analysis failed'})}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.post(
     "/search",
     response_model=SearchResponse,
@@ -182,31 +291,44 @@ def search(req: SearchRequest, db: dict = Depends(get_db)):
         req.query, db, top_k=req.top_k, filters=req.filters
     )
 
-    search_results = []
-    for r in results:
-        clause = r["clause"]
-        search_results.append(SearchResult(
-            id=clause.get("id", ""),
-            title=clause.get("title", ""),
-            text=clause.get("text", ""),
-            score=r["score"],
-            source=clause.get("source", ""),
-            doc_type=clause.get("doc_type", ""),
-            risk_level=clause.get("risk_level", ""),
-        ))
-
-    return SearchResponse(
-        results=search_results,
-        query=req.query,
-        total_results=len(search_results),
-    )
+    # Plain dicts: response_model validates them once on the way out, where
+    # SearchResult instances would be built and then validated again
+    search_results = [
+        {
+            "id": r["clause"]["id"],
+            "title": r["clause"]["title"],
+            "text": r["clause"]["text"],
+            "score": r["score"],
+            "source": r["clause"]["source"],
+            "doc_type": r["clause"]["doc_type"],
+            "risk_level": r["clause"]["risk_level"],
+        }
+        for r in results
+    ]
+
+    return {
+        "results": search_results,
+        "query": req.query,
+        "total_results": len(search_results),
+    }
 
 
 @app.post("/ask", response_model=KBSearchResponse, dependencies=[Depends(verify_api_key)])
 def ask(req: KBSearchRequest, db: dict = Depends(get_db)):
     """Ask a natural language question across the full knowledge base."""
-    from src.kb_search import search_knowledge_base
-    return search_knowledge_base(req.query, db, top_k=req.top_k, use_router=req.use_router)
+    if not semantic_cache_enabled():
+        return search_knowledge_base(req.query, db, top_k=req.top_k, use_router=req.use_router)
+
+    # The router may rewrite the query, so the raw-query embedding is only
+    # used as the cache key; a hit skips both the routing and answer LLM calls.
+    query_embedding = db["provider"].embed([req.query])
+    cache = get_semantic_cache(query_embedding.shape[1])
+    scope = f"ask:{req.top_k}:{req.use_router}"
+    result = cache.get(query_embedding, scope)
+    if result is None:
+        result = search_knowledge_base(req.query, db, top_k=req.top_k, use_router=req.use_router)
+        cache.put(query_embedding, result, scope)
+    return result
 
 
 @app.post(
@@ -222,8 +344,6 @@ def contract_review(req: ContractReviewRequest, db: dict = Depends(get_db)):
     and generates a clause-by-clause report with risk assessments.
     Output is always a draft requiring attorney review.
     """
-    from src.playbook_review import review_contract
-
     playbook_path = os.path.realpath(f"data/playbooks/{req.playbook}.json")
     allowed_dir = os.path.realpath("data/playbooks")
     if not playbook_path.startswith(allowed_dir + os.sep):
@@ -257,10 +377,16 @@ def contract_review(req: ContractReviewRequest, db: dict = Depends(get_db)):
 )
 def breach_analysis(req: BreachRequest, db: dict = Depends(get_db)):
     """Analyze data breach notification requirements across jurisdictions."""
-    from src.breach_analysis import generate_breach_report
-
-    params = req.model_dump()
-    report = generate_breach_report(params, db)
+    if semantic_cache_enabled():
+        query_embedding = db["provider"].embed([breach_query(req.model_dump())])
+        report = generate_breach_report(
+            req,
+            db,
+            query_embedding=query_embedding,
+            cache=get_semantic_cache(query_embedding.shape[1]),
+        )
+    else:
+        report = generate_breach_report(req, db)
 
     if "error" in report:
         raise HTTPException(status_code=400, detail=report)
@@ -297,4 +423,14 @@ if _static_dir.is_dir():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("src.api:app", host="0.0.0.0", port=8000, reload=True)
+
+    # uvicorn picks uvloop/httptools automatically when installed
+    # (uvicorn[standard]); reload is for local development only.
+    dev = os.environ.get("ENV", "").lower() == "dev"
+    uvicorn.run(
+        "src.api:app",
+        host=os.environ.get("API_HOST", "0.0.0.0"),
+        port=int(os.environ.get("API_PORT", "8000")),
+        reload=dev,
+        workers=None if dev else int(os.environ.get("WORKERS", "2")),
+    )
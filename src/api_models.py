@@ -4,7 +4,13 @@ API request/response models for the legal RAG pipeline.
 All models use Pydantic v2 for validation and serialization.
 """
 
-from pydantic import BaseModel, Field
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field
+
+# Prompt strategies /analyze serves (rag_pipeline.ANALYZE_STRATEGIES);
+# knowledge_base_qa has different output semantics and is served by /ask
+AnalyzeStrategy = Literal["basic", "structured", "few_shot"]
 
 
 # --- Requests ---
@@ -17,7 +23,7 @@ class AnalyzeRequest(BaseModel):
         description="The contract clause text to analyze",
         json_schema_extra={"example": "Employee agrees not to compete for 2 years worldwide."}
     )
-    strategy: str = Field(
+    strategy: AnalyzeStrategy = Field(
         default="few_shot",
         description="Prompt strategy to use",
         json_schema_extra={"example": "few_shot"}
@@ -53,6 +59,8 @@ class SearchRequest(BaseModel):
 
 class SourceInfo(BaseModel):
     """A retrieved source document."""
+    model_config = ConfigDict(frozen=True)
+
     id: str
     title: str
     score: float
@@ -72,6 +80,8 @@ class AnalyzeResponse(BaseModel):
 
 class SearchResult(BaseModel):
     """A single search result."""
+    model_config = ConfigDict(frozen=True)
+
     id: str
     title: str
     text: str
@@ -90,11 +100,13 @@ class SearchResponse(BaseModel):
 
 class HealthResponse(BaseModel):
     """System health status."""
+    model_config = ConfigDict(frozen=True)
+
     status: str  # "healthy" or "degraded"
     provider: str
     vector_store: str
     document_count: int
-    available_strategies: list[str]
+    available_strategies: tuple[str, ...]
 
 
 class ErrorResponse(BaseModel):
@@ -107,6 +119,8 @@ class ErrorResponse(BaseModel):
 
 class BreachRequest(BaseModel):
     """Request body for breach notification analysis."""
+    model_config = ConfigDict(frozen=True)
+
     data_types_compromised: list[str] = Field(
         ..., min_length=1,
         description="Types of data compromised (e.g., ['ssn', 'email', 'financial'])"
@@ -7,13 +7,26 @@ and generates a jurisdiction-by-jurisdiction notification matrix.
 
 import json
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
 
-from src.retrieval import search_similar_clauses
+import numpy as np
+
+from src.embeddings import get_embeddings
+from src.retrieval import search_similar_clauses_grouped, format_retrieval_results
 from src.generation import generate_analysis
 from src.output_parser import parse_json_response_or_raw
+from src.semantic_cache import SemanticCache
+
+if TYPE_CHECKING:
+    from src.api_models import BreachRequest
 
 logger = logging.getLogger(__name__)
 
+# Concurrent per-state LLM calls (a breach rarely spans more states than this)
+BREACH_MAX_WORKERS = 10
+
 # Breach parameter schema for input validation
 BREACH_PARAMS_REQUIRED = {"data_types_compromised", "affected_states"}
 
@@ -31,42 +44,50 @@ def validate_breach_params(params: dict) -> list[str]:
     return errors
 
 
+def breach_query(breach_params: dict) -> str:
+    """Build the statute retrieval query that captures the breach specifics."""
+    return (
+        f"Data breach notification requirements for breach involving "
+        f"{', '.join(breach_params['data_types_compromised'])}. "
+        f"Encryption status: {breach_params.get('encryption_status', 'unknown')}. "
+        f"Number of affected individuals: {breach_params.get('number_of_affected_individuals', 'unknown')}."
+    )
+
+
 def retrieve_applicable_statutes(
     breach_params: dict,
     db: dict,
     top_k_per_state: int = 5,
+    query_embedding: np.ndarray | None = None,
 ) -> dict[str, list[dict]]:
     """
     Retrieve applicable statute provisions for each affected state.
 
     Uses metadata filtering to get state-specific results, then
     semantic search within each state's provisions to find the most
-    relevant sections for the specific breach type.
+    relevant sections for the specific breach type. Pass query_embedding
+    when the caller already embedded breach_query(breach_params).
 
     Returns: {state_abbr: [list of retrieval results]}
     """
     affected_states = breach_params["affected_states"]
-    data_types = breach_params["data_types_compromised"]
 
-    # Build a query that captures the breach specifics
-    query = (
-        f"Data breach notification requirements for breach involving "
-        f"{', '.join(data_types)}. "
-        f"Encryption status: {breach_params.get('encryption_status', 'unknown')}. "
-        f"Number of affected individuals: {breach_params.get('number_of_affected_individuals', 'unknown')}."
+    # The query is the same for every state, so it is embedded once and
+    # one store search is split into per-state results
+    if query_embedding is None:
+        query_embedding = get_embeddings([breach_query(breach_params)], db["provider"])
+    states = list(dict.fromkeys(state.upper() for state in affected_states))
+
+    results_by_state = search_similar_clauses_grouped(
+        query_embedding,
+        db,
+        group_key="jurisdiction",
+        group_values=states,
+        top_k=top_k_per_state,
+        filters={"source": "statutes"},
     )
-
-    results_by_state = {}
-    for state in affected_states:
-        state_upper = state.upper()
-        state_results = search_similar_clauses(
-            query,
-            db,
-            top_k=top_k_per_state,
-            filters={"jurisdiction": state_upper, "source": "statutes"},
-        )
-        results_by_state[state_upper] = state_results
-        logger.info(f"Retrieved {len(state_results)} provisions for {state_upper}")
+    for state, state_results in results_by_state.items():
+        logger.info(f"Retrieved {len(state_results)} provisions for {state}")
 
     return results_by_state
 
@@ -113,16 +134,23 @@ def analyze_breach_for_state(
     state: str,
     statute_results: list[dict],
     provider,
+    params_json: str | None = None,
 ) -> dict:
-    """Generate breach notification analysis for a single state."""
-    from src.retrieval import format_retrieval_results
+    """
+    Generate breach notification analysis for a single state.
 
+    params_json is breach_params already serialized for the prompt; the
+    report pipeline serializes once and reuses it for every state.
+    Parameters are serialized compactly: indentation only costs tokens.
+    """
     statute_context = format_retrieval_results(statute_results)
+    if params_json is None:
+        params_json = json.dumps(breach_params, separators=(",", ":"))
 
     messages = [
         {"role": "system", "content": "You are an expert privacy attorney. Return only valid JSON."},
         {"role": "user", "content": BREACH_ANALYSIS_PROMPT.format(
-            breach_params=json.dumps(breach_params, indent=2),
+            breach_params=params_json,
             statute_context=statute_context,
             state=state,
         )},
@@ -134,8 +162,10 @@ def analyze_breach_for_state(
 
 
 def generate_breach_report(
-    breach_params: dict,
+    breach_params: "dict | BreachRequest",
     db: dict,
+    query_embedding: np.ndarray | None = None,
+    cache: SemanticCache | None = None,
 ) -> dict:
     """
     Full breach response pipeline.
@@ -145,34 +175,77 @@ def generate_breach_report(
     3. Generate per-state analysis
     4. Build cross-jurisdiction summary matrix
 
+    Accepts a plain dict (CLI) or a BreachRequest (API). A BreachRequest
+    was already validated by pydantic, so the dict checks are skipped.
+
+    With a cache (keyed by query_embedding, which is then required),
+    a state's analysis is reused when the other breach parameters match
+    exactly and the retrieved statute provisions overlap.
+
     Returns a complete breach report with per-state details and summary.
     """
-    errors = validate_breach_params(breach_params)
-    if errors:
-        return {"error": "Invalid breach parameters", "details": errors}
+    if hasattr(breach_params, "model_dump"):
+        params_json = breach_params.model_dump_json()
+        breach_params = breach_params.model_dump()
+    else:
+        errors = validate_breach_params(breach_params)
+        if errors:
+            return {"error": "Invalid breach parameters", "details": errors}
+        params_json = json.dumps(breach_params, separators=(",", ":"))
 
     logger.info(f"Breach analysis: {len(breach_params['affected_states'])} states, "
                 f"data types: {breach_params['data_types_compromised']}")
 
     # Retrieve statutes
-    statutes_by_state = retrieve_applicable_statutes(breach_params, db)
-
-    # Analyze per state
-    state_analyses = []
-    for state, statutes in statutes_by_state.items():
-        if not statutes:
-            logger.warning(f"No statute data found for {state}")
-            state_analyses.append({
-                "jurisdiction": state,
-                "error": f"No breach notification statute data available for {state}",
-            })
-            continue
+    statutes_by_state = retrieve_applicable_statutes(
+        breach_params, db, query_embedding=query_embedding
+    )
 
-        logger.info(f"Analyzing breach requirements for {state}...")
-        analysis = analyze_breach_for_state(
-            breach_params, state, statutes, db["provider"]
-        )
-        state_analyses.append(analysis)
+    # Every parameter except the state list can change a state's answer
+    shared_params = json.dumps(
+        {k: v for k, v in breach_params.items() if k != "affected_states"},
+        sort_keys=True,
+    )
+
+    # Analyze states in parallel; each is an independent LLM call
+    state_analyses = [None] * len(statutes_by_state)
+    with ThreadPoolExecutor(max_workers=BREACH_MAX_WORKERS) as executor:
+        futures = []
+        for i, (state, statutes) in enumerate(statutes_by_state.items()):
+            if not statutes:
+                logger.warning(f"No statute data found for {state}")
+                state_analyses[i] = {
+                    "jurisdiction": state,
+                    "error": f"No breach notification statute data available for {state}",
+                }
+                continue
+
+            scope = f"breach:{state}:{shared_params}"
+            evidence_ids = [s["clause"]["id"] for s in statutes]
+            if cache is not None:
+                cached = cache.get(query_embedding, scope, evidence_ids)
+                if cached is not None:
+                    logger.info(f"Reusing cached breach analysis for {state}")
+                    state_analyses[i] = cached
+                    continue
+
+            logger.info(f"Analyzing breach requirements for {state}...")
+            futures.append((i, state, scope, evidence_ids, executor.submit(
+                analyze_breach_for_state,
+                breach_params, state, statutes, db["provider"], params_json,
+            )))
+
+        for i, state, scope, evidence_ids, future in futures:
+            try:
+                state_analyses[i] = future.result()
+                if cache is not None:
+                    cache.put(query_embedding, state_analyses[i], scope, evidence_ids)
+            except Exception:
+                logger.exception(f"Breach analysis failed for {state}")
+                state_analyses[i] = {
+                    "jurisdiction": state,
+                    "error": f"Analysis failed for {state}. Manual review required.",
+                }
 
     # Build summary
     summary = _build_summary(breach_params, state_analyses)
@@ -191,10 +264,28 @@ def generate_breach_report(
     }
 
 
+# "30 days", "72 hours", "within 10 business days"
+_DEADLINE_PATTERN = re.compile(
+    r"(\d+)\s*(?:-\s*)?(?:business\s+|calendar\s+)?(hour|day)s?", re.IGNORECASE
+)
+
+
+def _deadline_days(deadline) -> float | None:
+    """Parse the first "<n> days/hours" in a deadline into days, or None."""
+    if not isinstance(deadline, str):
+        return None
+    match = _DEADLINE_PATTERN.search(deadline)
+    if match is None:
+        return None
+    count = int(match.group(1))
+    return count / 24 if match.group(2).lower() == "hour" else count
+
+
 def _build_summary(breach_params: dict, state_analyses: list[dict]) -> dict:
     """Build cross-jurisdiction summary from individual state analyses."""
     notifications_required = 0
     ag_notifications = []
+    earliest_days = None
     earliest_deadline = None
     earliest_deadline_state = None
     safe_harbor_applies = False
@@ -209,11 +300,11 @@ def _build_summary(breach_params: dict, state_analyses: list[dict]) -> dict:
             jurisdiction = analysis.get("jurisdiction", "Unknown")
             details = analysis.get("ag_notification_details", "")
             ag_notifications.append(f"{jurisdiction}: {details}")
-        deadline = analysis.get("deadline", "")
-        if deadline and ("day" in deadline.lower() or "hour" in deadline.lower()):
-            if earliest_deadline is None or len(deadline) < len(earliest_deadline):
-                earliest_deadline = deadline
-                earliest_deadline_state = analysis.get("jurisdiction")
+        days = _deadline_days(analysis.get("deadline"))
+        if days is not None and (earliest_days is None or days < earliest_days):
+            earliest_days = days
+            earliest_deadline = analysis["deadline"]
+            earliest_deadline_state = analysis.get("jurisdiction")
         if analysis.get("safe_harbor_applies"):
             safe_harbor_applies = True
             if not safe_harbor_reason:
@@ -0,0 +1,201 @@
+"""
+Classification Cache — Skip the LLM for clause text it has already typed.
+
+Contracts repeat boilerplate (notices, governing law, entire agreement)
+both within a document and across documents. Classifications are keyed
+on sha256(model + prompt + normalized text), where normalization
+lowercases and collapses whitespace over the same 2000 characters the
+classifier sees, and prompt identifies the instructions used (so editing
+the prompt invalidates old entries).
+
+Always keeps an in-process LRU. With CLASSIFY_CACHE_DB set to a file
+path, entries are also persisted in SQLite (WAL mode, one connection per
+process) so they survive restarts and are shared by worker processes.
+Set CLASSIFY_CACHE_ENABLED=false to bypass the cache entirely.
+
+With CLASSIFY_SEMANTIC_CACHE=1, clauses that differ only in wording
+(party names, numbering, punctuation) can also be served by embedding
+similarity via get_similar()/put_similar(), at the cost of one embedding
+per clause instead of an LLM call.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from src.semantic_cache import SemanticCache
+
+logger = logging.getLogger(__name__)
+
+MEMORY_CACHE_SIZE = 4096
+SEMANTIC_CACHE_SIZE = 1024
+
+_WHITESPACE = re.compile(r"\s+")
+
+# key -> {"clause_type", "confidence"}; oldest first
+_memory: OrderedDict[str, dict] = OrderedDict()
+_lock = threading.Lock()
+
+# Shared SQLite connection, reopened if CLASSIFY_CACHE_DB changes
+_db_lock = threading.Lock()
+_db_path: str | None = None
+_db_conn: sqlite3.Connection | None = None
+
+_semantic: SemanticCache | None = None
+
+
+def enabled() -> bool:
+    return os.environ.get("CLASSIFY_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+
+
+def semantic_enabled() -> bool:
+    """Near-duplicate lookups are opt-in via CLASSIFY_SEMANTIC_CACHE=1."""
+    return enabled() and os.environ.get("CLASSIFY_SEMANTIC_CACHE", "").lower() in ("1", "true", "yes")
+
+
+def _key(clause_text: str, model: str, prompt: str) -> str:
+    normalized = _WHITESPACE.sub(" ", clause_text[:2000]).strip().lower()
+    return hashlib.sha256(f"{model}\x00{prompt}\x00{normalized}".encode("utf-8")).hexdigest()
+
+
+def _connect() -> sqlite3.Connection | None:
+    """Return the process-wide connection; callers must hold _db_lock."""
+    global _db_path, _db_conn
+    path = os.environ.get("CLASSIFY_CACHE_DB")
+    if path != _db_path:
+        _close()
+    if not path:
+        return None
+    if _db_conn is None:
+        conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS clause_classification_cache ("
+            "hash TEXT PRIMARY KEY, model TEXT, clause_type TEXT, confidence TEXT)"
+        )
+        _db_path, _db_conn = path, conn
+    return _db_conn
+
+
+def _close() -> None:
+    global _db_path, _db_conn
+    if _db_conn is not None:
+        _db_conn.close()
+    _db_path, _db_conn = None, None
+
+
+def _remember(key: str, result: dict) -> None:
+    with _lock:
+        _memory[key] = result
+        _memory.move_to_end(key)
+        while len(_memory) > MEMORY_CACHE_SIZE:
+            _memory.popitem(last=False)
+
+
+def get(clause_text: str, model: str, prompt: str = "") -> dict | None:
+    """Return the cached classification for this text, model and prompt, or None."""
+    if not enabled():
+        return None
+    key = _key(clause_text, model, prompt)
+    with _lock:
+        cached = _memory.get(key)
+        if cached is not None:
+            _memory.move_to_end(key)
+            return dict(cached)
+
+    with _db_lock:
+        try:
+            conn = _connect()
+        except sqlite3.Error:
+            logger.warning("Classification cache DB unavailable", exc_info=True)
+            return None
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(
+                "SELECT clause_type, confidence FROM clause_classification_cache WHERE hash = ?",
+                (key,),
+            ).fetchone()
+        except sqlite3.Error:
+            logger.warning("Classification cache lookup failed", exc_info=True)
+            return None
+
+    if row is None:
+        return None
+    result = {"clause_type": row[0], "confidence": row[1]}
+    _remember(key, result)
+    return dict(result)
+
+
+def put(clause_text: str, model: str, result: dict, prompt: str = "") -> None:
+    """Record a classification for later lookups."""
+    if not enabled():
+        return
+    key = _key(clause_text, model, prompt)
+    entry = {
+        "clause_type": result["clause_type"],
+        "confidence": result.get("confidence", "medium"),
+    }
+    _remember(key, entry)
+
+    with _db_lock:
+        try:
+            conn = _connect()
+        except sqlite3.Error:
+            logger.warning("Classification cache DB unavailable", exc_info=True)
+            return
+        if conn is None:
+            return
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO clause_classification_cache VALUES (?, ?, ?, ?)",
+                    (key, model, entry["clause_type"], entry["confidence"]),
+                )
+        except sqlite3.Error:
+            logger.warning("Classification cache write failed", exc_info=True)
+
+
+def _semantic_cache(dim: int) -> SemanticCache:
+    global _semantic
+    with _lock:
+        if _semantic is None or _semantic.dim != dim:
+            _semantic = SemanticCache(
+                dim=dim,
+                threshold=float(os.environ.get("CLASSIFY_SEMANTIC_CACHE_THRESHOLD", "0.97")),
+                capacity=SEMANTIC_CACHE_SIZE,
+            )
+        return _semantic
+
+
+def get_similar(embedding: np.ndarray, model: str, prompt: str = "") -> dict | None:
+    """Return the classification of a near-identical clause seen before, or None."""
+    embedding = np.asarray(embedding).reshape(-1)
+    cached = _semantic_cache(len(embedding)).get(embedding, scope=f"{model}\x00{prompt}")
+    return dict(cached) if cached is not None else None
+
+
+def put_similar(embedding: np.ndarray, model: str, result: dict, prompt: str = "") -> None:
+    """Record a classification for near-duplicate lookups."""
+    embedding = np.asarray(embedding).reshape(-1)
+    entry = {
+        "clause_type": result["clause_type"],
+        "confidence": result.get("confidence", "medium"),
+    }
+    _semantic_cache(len(embedding)).put(embedding, entry, scope=f"{model}\x00{prompt}")
+
+
+def clear() -> None:
+    """Forget in-process entries (the SQLite file, if any, is left alone)."""
+    global _semantic
+    with _lock:
+        _memory.clear()
+        _semantic = None
+    with _db_lock:
+        _close()
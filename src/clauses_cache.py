@@ -0,0 +1,28 @@
+"""
+Clauses Cache — Parse data/clauses.json once per process.
+
+The API startup, the CLI, and the ingestion scripts all read the same
+clauses file. load_clauses() memoizes the parsed list keyed by the
+file's real path and modification time, so repeat loads skip the read
+and JSON decode, and an edited file is picked up automatically.
+"""
+
+import json
+import os
+from functools import lru_cache
+
+
+def load_clauses(path: str) -> list[dict]:
+    """
+    Return the parsed clauses list from a clauses.json file.
+
+    The result is shared between callers — treat it as read-only.
+    """
+    real_path = os.path.realpath(path)
+    return _load(real_path, os.stat(real_path).st_mtime_ns)
+
+
+@lru_cache(maxsize=8)
+def _load(real_path: str, mtime_ns: int) -> list[dict]:
+    with open(real_path, "rb") as f:
+        return json.loads(f.read())
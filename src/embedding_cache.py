@@ -0,0 +1,76 @@
+"""
+Embedding Cache — Reuse document vectors across index rebuilds.
+
+Any change to the corpus invalidates the persisted FAISS index, but most
+documents are usually unchanged. Vectors are stored in a SQLite file next
+to the index, keyed on sha256(embedding model + embedded text), so a
+rebuild only sends new or edited texts to the embedding API.
+
+Entries are never evicted; delete the file to reclaim space after large
+corpus changes.
+"""
+
+import hashlib
+import logging
+import sqlite3
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Stay below SQLite's default limit on host parameters per statement
+_LOOKUP_CHUNK = 500
+
+
+def _key(text: str, model: str) -> bytes:
+    return hashlib.sha256(f"{model}\x00{text}".encode("utf-8", "surrogatepass")).digest()
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=5)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS embedding_cache (hash BLOB PRIMARY KEY, vector BLOB)")
+    return conn
+
+
+def lookup(path: str, model: str, texts: list[str]) -> list[np.ndarray | None]:
+    """Return the stored float32 vector for each text, or None where there is none."""
+    keys = [_key(text, model) for text in texts]
+    found: dict[bytes, bytes] = {}
+    try:
+        conn = _connect(path)
+        try:
+            unique = list(dict.fromkeys(keys))
+            for i in range(0, len(unique), _LOOKUP_CHUNK):
+                chunk = unique[i:i + _LOOKUP_CHUNK]
+                found.update(conn.execute(
+                    "SELECT hash, vector FROM embedding_cache WHERE hash IN "
+                    f"({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall())
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        logger.warning("Embedding cache lookup failed, embedding everything", exc_info=True)
+        return [None] * len(texts)
+    return [
+        np.frombuffer(found[key], dtype="<f4") if key in found else None
+        for key in keys
+    ]
+
+
+def store(path: str, model: str, texts: list[str], vectors: np.ndarray) -> None:
+    """Save one vector per text for later lookups."""
+    rows = [
+        (_key(text, model), np.asarray(vector, dtype="<f4").tobytes())
+        for text, vector in zip(texts, vectors)
+    ]
+    try:
+        conn = _connect(path)
+        try:
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO embedding_cache VALUES (?, ?)", rows)
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        logger.warning("Embedding cache write failed", exc_info=True)
@@ -10,54 +10,139 @@ import hashlib
 import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import numpy as np
 from dotenv import load_dotenv
 
+from src import embedding_cache
+from src.clauses_cache import load_clauses
 from src.provider import create_provider
 from src.schemas import validate_document
-from src.vector_store import create_vector_store, FaissVectorStore
+from src.vector_store import create_vector_store, FaissVectorStore, VectorStore
 
 logger = logging.getLogger(__name__)
 
 # Load API key from .env file
 load_dotenv()
 
+# Embedding requests in flight at once per get_embeddings() call; lower on 429s
+EMBED_MAX_WORKERS = int(os.environ.get("EMBED_MAX_WORKERS", "8"))
 
-def get_embeddings(texts: list[str], provider, batch_size: int = 100) -> np.ndarray:
+
+def get_embeddings(
+    texts: list[str],
+    provider,
+    batch_size: int = 100,
+    max_workers: int | None = None,
+) -> np.ndarray:
     """
     Convert text strings into vector embeddings, batching for API limits.
 
     OpenAI allows up to 2048 texts per request, but large batches risk
     token limits. Default batch_size=100 is safe for most text lengths.
+    Batches are independent network round-trips, so up to max_workers
+    (default EMBED_MAX_WORKERS) are in flight at once; each result is
+    copied into one preallocated array at its input offset as it arrives,
+    so rows line up with texts and no final concatenate is needed.
     """
     if len(texts) <= batch_size:
         return provider.embed(texts)
 
-    all_embeddings = []
-    for i in range(0, len(texts), batch_size):
-        batch = texts[i:i + batch_size]
-        logger.info(f"Embedding batch {i//batch_size + 1}/{(len(texts)-1)//batch_size + 1} ({len(batch)} texts)")
-        embeddings = provider.embed(batch)
-        all_embeddings.append(embeddings)
+    starts = range(0, len(texts), batch_size)
+    workers = min(max_workers or EMBED_MAX_WORKERS, len(starts))
+    logger.info("Embedding %d texts in %d batches (%d workers)", len(texts), len(starts), workers)
+    embeddings = None
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(provider.embed, texts[i:i + batch_size]): i for i in starts}
+        # Copy each batch out as soon as it lands, so finished batches aren't
+        # held while an earlier one is still in flight
+        for future in as_completed(futures):
+            start = futures.pop(future)
+            batch = future.result()
+            if embeddings is None:
+                embeddings = np.empty((len(texts), batch.shape[1]), dtype=np.float32)
+            embeddings[start:start + len(batch)] = batch
+    return embeddings
+
+
+def embed_batched(
+    texts: list[str],
+    provider,
+    batch_size: int = 96,
+    max_workers: int | None = None,
+) -> np.ndarray:
+    """
+    Embed texts in micro-batches issued concurrently.
+
+    Same as get_embeddings() with a batch size that also fits providers
+    capping requests at 96 texts (e.g. Cohere on Bedrock).
+    """
+    return get_embeddings(texts, provider, batch_size=batch_size, max_workers=max_workers)
+
 
-    return np.concatenate(all_embeddings, axis=0)
+def _embed_documents(texts: list[str], provider, cache_path: str | None) -> np.ndarray:
+    """
+    get_embeddings() for document texts. Each distinct text is embedded once
+    (boilerplate repeats across sources), and vectors cached at cache_path
+    by earlier builds are reused.
+    """
+    unique = list(dict.fromkeys(texts))
+    if len(unique) == len(texts):
+        return _embed_unique(texts, provider, cache_path)
+    logger.info("Embedding %d distinct texts for %d documents", len(unique), len(texts))
+    row = {text: i for i, text in enumerate(unique)}
+    return _embed_unique(unique, provider, cache_path)[[row[text] for text in texts]]
+
+
+def _embedding_model_key(provider) -> str:
+    """Embedding model name, plus the requested dimensions when vectors are shortened."""
+    model = getattr(provider, "embedding_model", "") or ""
+    dimensions = getattr(provider, "embedding_dimensions", None)
+    return f"{model}@{dimensions}" if dimensions else model
+
+
+def _embed_unique(texts: list[str], provider, cache_path: str | None) -> np.ndarray:
+    if not cache_path or not texts:
+        return get_embeddings(texts, provider)
+
+    model = _embedding_model_key(provider)
+    os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+    cached = embedding_cache.lookup(cache_path, model, texts)
+    missing = [i for i, vector in enumerate(cached) if vector is None]
+    logger.info("Embedding cache: reusing %d of %d vectors", len(texts) - len(missing), len(texts))
+
+    fresh = None
+    if missing:
+        missing_texts = [texts[i] for i in missing]
+        fresh = get_embeddings(missing_texts, provider)
+        embedding_cache.store(cache_path, model, missing_texts, fresh)
+
+    dim = fresh.shape[1] if fresh is not None else cached[0].shape[0]
+    embeddings = np.empty((len(texts), dim), dtype=np.float32)
+    for i, vector in enumerate(cached):
+        if vector is not None:
+            embeddings[i] = vector
+    if fresh is not None:
+        embeddings[missing] = fresh
+    return embeddings
+
+
+PRACTICE_AREAS = {
+    "NDA": "intellectual_property",
+    "Employment": "employment_labor",
+    "Service Agreement": "commercial_contracts",
+}
 
 
 def infer_practice_area(clause_type: str) -> str:
     """Map clause type to a practice area for metadata enrichment."""
-    mapping = {
-        "NDA": "intellectual_property",
-        "Employment": "employment_labor",
-        "Service Agreement": "commercial_contracts",
-    }
-    return mapping.get(clause_type, "general")
+    return PRACTICE_AREAS.get(clause_type, "general")
 
 
 def _load_clauses_json(data_path: str) -> list[dict]:
     """Load clauses.json and convert each clause to unified schema format."""
-    with open(data_path) as f:
-        raw_clauses = json.load(f)
+    raw_clauses = load_clauses(data_path)
 
     documents = []
     for clause in raw_clauses:
@@ -99,56 +184,57 @@ def load_documents(
     if documents is None and data_path is None:
         raise ValueError("Must provide either documents or data_path")
 
-    provider = create_provider()
     provider_name = os.environ.get("VECTOR_STORE_PROVIDER", "faiss")
-    store = create_vector_store(provider_name)
-
-    if documents is None:
-        documents = _load_clauses_json(data_path)
+    # Creating the provider (mostly importing its SDK) takes longer than a
+    # warm start's other work, so it runs while documents and any persisted
+    # index are read; only the content hash below needs it
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        provider_future = executor.submit(create_provider)
+        store = create_vector_store(provider_name)
+
+        if documents is None:
+            documents = _load_clauses_json(data_path)
+
+        persisted = bool(
+            index_path
+            and isinstance(store, FaissVectorStore)
+            and store.load(index_path)
+            and store.total_vectors == len(documents)
+        )
+        provider = provider_future.result()
 
     logger.info("Loading %d documents", len(documents))
     print(f"Loaded {len(documents)} documents")
 
-    # Content fingerprint to detect stale persisted indexes
-    content_hash = hashlib.sha256(
-        "|".join(d["doc_id"] + ":" + d["text"][:64] for d in documents).encode()
-    ).hexdigest()[:16]
-
-    # Try loading from persisted index if available
-    if index_path and isinstance(store, FaissVectorStore):
-        if store.load(index_path) and store.total_vectors == len(documents):
-            stored_hash = store.get_content_hash()
-            if stored_hash == content_hash:
-                logger.info("Loaded persisted FAISS index from %s", index_path)
-                print(f"Loaded persisted index ({store.total_vectors} vectors)")
-                return {
-                    "store": store,
-                    "documents": documents,
-                    "clauses": documents,
-                    "provider": provider,
-                }
-            logger.info("Persisted index content hash mismatch, rebuilding")
-
-    # Validate documents (warn but don't fail)
+    # Fingerprint of everything the persisted index was built from: the full
+    # documents (embedded text and the metadata saved alongside it) and the
+    # embedding model and vector size, so any edit or model switch forces a rebuild.
+    # Hashed one document at a time so the whole corpus is never a single string.
+    hasher = hashlib.blake2b(digest_size=8)
+    encode = json.JSONEncoder(sort_keys=True, default=str).encode
+    hasher.update(encode(_embedding_model_key(provider)).encode())
+    for doc in documents:
+        hasher.update(encode(doc).encode())
+    content_hash = hasher.hexdigest()
+
+    # Reuse the persisted index if it was built from exactly these documents
+    if persisted:
+        if store.get_content_hash() == content_hash:
+            logger.info("Loaded persisted FAISS index from %s", index_path)
+            print(f"Loaded persisted index ({store.total_vectors} vectors)")
+            return _database(store, documents, provider)
+        logger.info("Persisted index content hash mismatch, rebuilding")
+
+    # One pass: validate (warn but don't fail), build the embedding text, and
+    # flatten metadata for the vector store upsert
+    ids, texts_to_embed, metadata = [], [], []
     for doc in documents:
         errors = validate_document(doc)
         if errors:
             logger.warning("Document %s validation: %s", doc.get("doc_id", "?"), errors)
 
-    # Build embedding text
-    texts_to_embed = [
-        f"{doc['title']}: {doc['text']}"
-        for doc in documents
-    ]
-
-    print(f"Creating embeddings via {provider.provider_name}...")
-    embeddings = get_embeddings(texts_to_embed, provider)
-    print(f"Created {len(embeddings)} embeddings of dimension {embeddings.shape[1]}")
-
-    # Build metadata — flatten for vector store upsert
-    ids = [doc["doc_id"] for doc in documents]
-    metadata = []
-    for doc in documents:
+        ids.append(doc["doc_id"])
+        texts_to_embed.append(f"{doc['title']}: {doc['text']}")
         flat = {
             "title": doc["title"],
             "text": doc["text"],
@@ -164,6 +250,12 @@ def load_documents(
             flat["type"] = flat["clause_type"]
         metadata.append(flat)
 
+    print(f"Creating embeddings via {provider.provider_name}...")
+    # Unchanged documents keep their vectors from the last build
+    cache_path = f"{index_path}.embeddings.sqlite3" if index_path else None
+    embeddings = _embed_documents(texts_to_embed, provider, cache_path)
+    print(f"Created {len(embeddings)} embeddings of dimension {embeddings.shape[1]}")
+
     count = store.upsert(ids, embeddings, metadata)
     logger.info("Vector store loaded: %d vectors via %s", count, provider.provider_name)
     print(f"Vector store ({provider_name}) loaded with {count} vectors")
@@ -173,6 +265,11 @@ def load_documents(
         store.save(index_path, content_hash=content_hash)
         logger.info("Saved FAISS index to %s", index_path)
 
+    return _database(store, documents, provider)
+
+
+def _database(store: VectorStore, documents: list[dict], provider) -> dict:
+    """Build the db dict every pipeline takes; 'clauses' is the same list as 'documents'."""
     return {
         "store": store,
         "documents": documents,
@@ -181,7 +278,10 @@ def load_documents(
     }
 
 
-def load_clause_database(data_path: str = "data/clauses.json") -> dict:
+def load_clause_database(
+    data_path: str = "data/clauses.json",
+    index_path: str = "data/index/main",
+) -> dict:
     """
     Load clauses from JSON, create embeddings, and build vector store.
 
@@ -193,4 +293,4 @@ def load_clause_database(data_path: str = "data/clauses.json") -> dict:
     - 'documents': same as 'clauses'
     - 'provider': the LLM provider (reused for query-time embedding and chat)
     """
-    return load_documents(data_path=data_path, index_path="data/index/main")
+    return load_documents(data_path=data_path, index_path=index_path)
@@ -8,7 +8,9 @@ and an LLM-as-Judge pattern for generation scoring.
 
 import json
 import logging
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from src.embeddings import load_clause_database
 from src.retrieval import search_similar_clauses
@@ -16,6 +18,9 @@ from src.rag_pipeline import analyze_clause
 
 logger = logging.getLogger(__name__)
 
+# Test cases evaluated at once; each runs the pipeline plus one judge call
+EVAL_MAX_WORKERS = int(os.environ.get("EVAL_MAX_WORKERS", "8"))
+
 # Ground truth test cases for evaluation.
 # Each includes expected retrieval IDs, risk level, and required issues.
 TEST_CASES = [
@@ -159,7 +164,7 @@ def evaluate_generation(db: dict, strategy: str = "few_shot") -> dict:
     all_scores = {"risk_accuracy": [], "issue_coverage": [],
                   "actionability": [], "grounding": [], "total": []}
 
-    for test in TEST_CASES:
+    def score(test: dict) -> dict:
         pipeline_result = analyze_clause(
             test["clause"], db, strategy=strategy
         )
@@ -181,12 +186,18 @@ def evaluate_generation(db: dict, strategy: str = "few_shot") -> dict:
         judge_response = db["provider"].chat(judge_messages, temperature=0.0)
 
         try:
-            scores = json.loads(judge_response)
+            return json.loads(judge_response)
         except (json.JSONDecodeError, TypeError):
-            scores = {"risk_accuracy": 0, "issue_coverage": 0,
-                      "actionability": 0, "grounding": 0, "total": 0,
-                      "notes": "Failed to parse judge response"}
+            return {"risk_accuracy": 0, "issue_coverage": 0,
+                    "actionability": 0, "grounding": 0, "total": 0,
+                    "notes": "Failed to parse judge response"}
+
+    # Test cases are independent round-trips; map() keeps results in order
+    workers = max(1, min(EVAL_MAX_WORKERS, len(TEST_CASES)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        case_scores = list(executor.map(score, TEST_CASES))
 
+    for test, scores in zip(TEST_CASES, case_scores):
         for key in all_scores:
             all_scores[key].append(scores.get(key, 0))
 
@@ -0,0 +1,99 @@
+"""
+Execution Gate — Decide whether a clause needs an LLM round-trip at all.
+
+Cheap checks run before retrieval and generation:
+- Too short to be a contract clause (blank or accidental input)
+- No contract language at all (obvious non-contract text)
+- Exact duplicate of a clause already analyzed with the same options
+
+The first two produce a canned "rejected" response; duplicates return
+the earlier result unchanged.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+MIN_CLAUSE_CHARS = 40
+DUPLICATE_CACHE_SIZE = 256
+
+_LEGAL_TERMS = re.compile(
+    r"shall|agree|warrant|indemnif|confidential|liab|oblig|covenant|"
+    r"terminat|licen[cs]|breach|party|parties|employ|compet|govern|"
+    r"represent|consent|damages|payment|contract|vendor|customer|client",
+    re.IGNORECASE,
+)
+
+# sha256(scope + clause) -> earlier pipeline result; oldest first
+_recent: OrderedDict[str, dict] = OrderedDict()
+_lock = threading.Lock()
+
+
+def _key(clause_text: str, scope: str) -> str:
+    return hashlib.sha256(f"{scope}\x00{clause_text.strip()}".encode("utf-8")).hexdigest()
+
+
+def _rejection(reason: str, message: str) -> dict:
+    return {
+        "analysis": {"reason": reason, "message": message},
+        "review_status": "rejected",
+    }
+
+
+def should_short_circuit(clause_text: str, scope: str = "") -> dict | None:
+    """
+    Return a response that makes the LLM call unnecessary, or None.
+
+    A rejection only carries "analysis" and "review_status"; the caller
+    fills in the remaining result fields. A duplicate returns the full
+    result recorded by remember().
+
+    Args:
+        clause_text: The clause submitted for analysis.
+        scope: Options that affect the output (strategy, top_k, ...), so
+               duplicates only match when they would produce the same answer.
+    """
+    text = clause_text.strip()
+    if len(text) < MIN_CLAUSE_CHARS:
+        logger.info("Execution gate: clause too short (%d chars)", len(text))
+        return _rejection(
+            "too_short",
+            f"Clause is too short to analyze. Paste the full clause text "
+            f"(at least {MIN_CLAUSE_CHARS} characters).",
+        )
+    if not _LEGAL_TERMS.search(text):
+        logger.info("Execution gate: no contract language found")
+        return _rejection(
+            "not_contract_text",
+            "This doesn't look like contract language. Paste a clause from "
+            "a contract to analyze it.",
+        )
+
+    with _lock:
+        key = _key(text, scope)
+        cached = _recent.get(key)
+        if cached is not None:
+            _recent.move_to_end(key)
+            logger.info("Execution gate: duplicate clause, reusing earlier result")
+            return dict(cached)
+    return None
+
+
+def remember(clause_text: str, result: dict, scope: str = "") -> None:
+    """Record a completed result so an identical request can reuse it."""
+    with _lock:
+        key = _key(clause_text, scope)
+        _recent[key] = result
+        _recent.move_to_end(key)
+        while len(_recent) > DUPLICATE_CACHE_SIZE:
+            _recent.popitem(last=False)
+
+
+def clear() -> None:
+    """Forget all recorded results."""
+    with _lock:
+        _recent.clear()
@@ -3,8 +3,16 @@ LLM Generation Module — Prompt Engineering for Legal Analysis
 
 Three prompt strategies for analyzing legal clauses, designed to be
 compared against each other via the evaluation framework.
+
+System prompts (and few-shot examples) are constant strings so the
+message prefix is byte-identical across requests and eligible for
+provider-side prompt caching; per-request content goes last.
 """
 
+import logging
+from collections.abc import Iterator
+
+logger = logging.getLogger(__name__)
 
 # --- Strategy 1: Basic (baseline) ---
 
@@ -125,31 +133,33 @@ Similar clauses from knowledge base:
     },
 ]
 
+# System message and worked examples, shared by every few-shot prompt (read-only)
+_FEW_SHOT_PREFIX = ({"role": "system", "content": FEW_SHOT_SYSTEM_PROMPT}, *FEW_SHOT_EXAMPLES)
+
+
 def build_few_shot_prompt(query_clause: str, retrieved_context: str) -> list[dict]:
     """
     Few-shot prompt with a worked example before the actual query.
     The example uses a different clause type to encourage generalization.
     """
-    messages = [
-        {"role": "system", "content": FEW_SHOT_SYSTEM_PROMPT},
-    ]
-    messages.extend(FEW_SHOT_EXAMPLES)
-    messages.append({
-        "role": "user",
-        "content": f"""Now analyze this clause:
+    return [
+        *_FEW_SHOT_PREFIX,
+        {
+            "role": "user",
+            "content": f"""Now analyze this clause:
 
 CLAUSE TO REVIEW:
 {query_clause}
 
 SIMILAR CLAUSES FROM KNOWLEDGE BASE:
-{retrieved_context}"""
-    })
-    return messages
+{retrieved_context}""",
+        },
+    ]
 
 
 # --- Strategy 4: Knowledge Base QA (unified search) ---
 
-KNOWLEDGE_BASE_QA_PROMPT = """You are a legal knowledge base assistant. Answer the user's question based ONLY on the retrieved documents below.
+KNOWLEDGE_BASE_QA_PROMPT = """You are a legal knowledge base assistant. Answer the user's question based ONLY on the retrieved documents provided with the question.
 
 Rules:
 - Answer the specific question asked
@@ -158,28 +168,31 @@ Rules:
 - Do not make up or infer legal requirements not supported by the sources
 - If comparing across jurisdictions or clause types, organize the answer clearly
 
-Retrieved documents:
-{retrieved_context}
-
 Respond in JSON:
-{{
+{
     "answer": "Your answer to the question, with [source-id] citations inline",
     "sources_used": [
-        {{"id": "doc-id", "title": "doc title", "relevance": "why this source was relevant"}}
+        {"id": "doc-id", "title": "doc title", "relevance": "why this source was relevant"}
     ],
     "confidence": "high | medium | low",
     "caveats": ["Any important limitations or assumptions"],
     "related_queries": ["2-3 follow-up questions the user might want to ask"]
-}}"""
+}"""
 
 
 def build_knowledge_base_qa_prompt(query: str, retrieved_context: str) -> list[dict]:
-    """Knowledge base question-answering prompt with citation requirements."""
+    """
+    Knowledge base question-answering prompt with citation requirements.
+
+    The system prompt is a constant so providers can cache it as a prompt
+    prefix; retrieved documents travel in the user message.
+    """
     return [
-        {"role": "system", "content": KNOWLEDGE_BASE_QA_PROMPT.format(
-            retrieved_context=retrieved_context
-        )},
-        {"role": "user", "content": query},
+        {"role": "system", "content": KNOWLEDGE_BASE_QA_PROMPT},
+        {"role": "user", "content": f"""Retrieved documents:
+{retrieved_context}
+
+Question: {query}"""},
     ]
 
 
@@ -198,3 +211,65 @@ def generate_analysis(
     provider's chat_model for cost efficiency.
     """
     return provider.chat(messages, model=model, temperature=temperature, max_tokens=max_tokens)
+
+
+def generate_json(
+    messages: list[dict],
+    provider,
+    schema: dict,
+    model: str | None = None,
+    temperature: float = 0.2,
+    max_tokens: int = 1500,
+) -> str:
+    """
+    Like generate_analysis(), but ask for a reply matching a JSON schema.
+
+    schema is {"name": str, "schema": <JSON Schema>}. Providers with
+    chat_json() constrain decoding to it; others get a plain chat() call,
+    so the prompt must still describe the expected JSON. So do models or
+    API versions that reject the schema (HTTP 400 about response_format):
+    the request is retried once through chat(), and later calls for that
+    provider and model skip chat_json() altogether.
+    """
+    chat_json = getattr(provider, "chat_json", None)
+    key = (type(provider).__name__, model or getattr(provider, "chat_model", None))
+    if chat_json is not None and key not in _JSON_SCHEMA_UNSUPPORTED:
+        try:
+            return chat_json(messages, schema, model=model, temperature=temperature, max_tokens=max_tokens)
+        except Exception as e:
+            if not _rejects_response_format(e):
+                raise
+            logger.warning("%s model %s rejected JSON schema output, using plain chat: %s", *key, e)
+            _JSON_SCHEMA_UNSUPPORTED.add(key)
+    return provider.chat(messages, model=model, temperature=temperature, max_tokens=max_tokens)
+
+
+# (provider class, model) pairs whose chat_json() came back 400
+_JSON_SCHEMA_UNSUPPORTED: set[tuple[str, str | None]] = set()
+
+
+def _rejects_response_format(exc: Exception) -> bool:
+    """A 400 saying the model or API version does not support the requested response_format."""
+    message = str(exc)
+    return getattr(exc, "status_code", None) == 400 and (
+        "response_format" in message or "json_schema" in message
+    )
+
+
+def generate_analysis_stream(
+    messages: list[dict],
+    provider,
+    model: str | None = None,
+    temperature: float = 0.2,
+    max_tokens: int = 1500,
+) -> Iterator[str]:
+    """
+    Stream the LLM response as text chunks.
+
+    Providers without chat_stream() yield the full response as one chunk.
+    """
+    chat_stream = getattr(provider, "chat_stream", None)
+    if chat_stream is None:
+        yield provider.chat(messages, model=model, temperature=temperature, max_tokens=max_tokens)
+        return
+    yield from chat_stream(messages, model=model, temperature=temperature, max_tokens=max_tokens)
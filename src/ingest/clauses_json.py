@@ -1,6 +1,6 @@
 """Ingestor for the original hand-authored clauses.json file."""
 
-import json
+from src.clauses_cache import load_clauses
 from src.ingest.base import BaseIngestor
 
 
@@ -11,8 +11,8 @@ class ClausesJsonIngestor(BaseIngestor):
         self.data_path = data_path
 
     def load_raw(self) -> list[dict]:
-        with open(self.data_path) as f:
-            return json.load(f)
+        # Shared with load_clause_database(); transform() only reads it
+        return load_clauses(self.data_path)
 
     def transform(self, raw_data: list[dict]) -> list[dict]:
         practice_area_map = {
@@ -10,6 +10,7 @@ Expected output: ~4,000-5,000 documents (non-empty clause annotations).
 import hashlib
 import logging
 import re
+from functools import lru_cache
 
 from src.ingest.base import BaseIngestor
 
@@ -59,6 +60,42 @@ QUESTION_TO_CLAUSE_TYPE = {
     "Highlight the parts (if any) of this contract related to \"Rofr/Rofo/Rofn\"": "right_of_first_refusal",
 }
 
+# The quoted label is what identifies a question (dataset questions also
+# carry a trailing "Details: ..." description), so lookups key on it
+_QUOTED_LABEL = re.compile(r'"([^"]+)"')
+_LABEL_TO_CLAUSE_TYPE = {
+    _QUOTED_LABEL.search(question).group(1): clause_type
+    for question, clause_type in QUESTION_TO_CLAUSE_TYPE.items()
+}
+
+
+# Map CUAD clause types to practice areas (anything unlisted is "general")
+CLAUSE_TYPE_TO_PRACTICE_AREA = {
+    **dict.fromkeys(
+        ["ip_ownership_assignment", "joint_ip_ownership", "license_grant",
+         "non_transferable_license", "affiliate_license_ip_loss",
+         "source_code_escrow", "irrevocable_perpetual_license", "unlimited_license"],
+        "intellectual_property",
+    ),
+    **dict.fromkeys(
+        ["non_compete", "no_solicit_employees", "non_disparagement",
+         "competitive_restriction_exception"],
+        "employment_labor",
+    ),
+    **dict.fromkeys(
+        ["cap_on_liability", "indemnification", "uncapped_liability",
+         "insurance", "liquidated_damages", "warranty_duration",
+         "minimum_commitment", "volume_restriction", "price_restrictions",
+         "revenue_profit_sharing"],
+        "commercial_contracts",
+    ),
+}
+
+@lru_cache(maxsize=1024)
+def _safe_title(contract_title: str) -> str:
+    """ID-safe contract title prefix (each contract has dozens of clauses)."""
+    return re.sub(r'[^a-zA-Z0-9]', '_', contract_title)[:30]
+
 
 class CuadIngestor(BaseIngestor):
     source_name = "cuad"
@@ -77,57 +114,43 @@ class CuadIngestor(BaseIngestor):
         """Download CUAD from HuggingFace."""
         from datasets import load_dataset
         dataset = load_dataset("theatticusproject/cuad-qa", split=self.split, revision="refs/convert/parquet")
-        return [dict(row) for row in dataset]
+        # Only the columns transform() reads: each row also carries the full
+        # contract text as "context", repeated for all ~40 questions. to_list()
+        # converts whole Arrow columns instead of formatting row by row.
+        return dataset.select_columns(["title", "question", "answers"]).to_list()
 
     def _extract_clause_type(self, question: str) -> str:
         """Extract a clean clause type label from a CUAD question string."""
-        # Try exact match first
-        if question in QUESTION_TO_CLAUSE_TYPE:
-            return QUESTION_TO_CLAUSE_TYPE[question]
+        match = _QUOTED_LABEL.search(question)
+        if not match:
+            return "unknown"
 
-        # Fuzzy: extract the quoted part
-        match = re.search(r'"([^"]+)"', question)
-        if match:
-            return match.group(1).lower().replace(" ", "_").replace("-", "_")
+        label = match.group(1)
+        if label in _LABEL_TO_CLAUSE_TYPE:
+            return _LABEL_TO_CLAUSE_TYPE[label]
 
-        return "unknown"
+        # Unmapped label: derive a snake_case type from it
+        return label.lower().replace(" ", "_").replace("-", "_")
 
     def _make_doc_id(self, contract_title: str, clause_type: str, text: str) -> str:
         """Generate a deterministic, unique document ID."""
-        content_hash = hashlib.md5(text.encode()).hexdigest()[:8]
-        safe_title = re.sub(r'[^a-zA-Z0-9]', '_', contract_title)[:30]
-        return f"cuad-{safe_title}-{clause_type}-{content_hash}"
+        content_hash = hashlib.blake2b(text.encode(), digest_size=4).hexdigest()
+        return f"cuad-{_safe_title(contract_title)}-{clause_type}-{content_hash}"
 
     def _infer_practice_area(self, clause_type: str) -> str:
         """Map CUAD clause types to practice areas."""
-        ip_types = {"ip_ownership_assignment", "joint_ip_ownership", "license_grant",
-                     "non_transferable_license", "affiliate_license_ip_loss",
-                     "source_code_escrow", "irrevocable_perpetual_license", "unlimited_license"}
-        employment_types = {"non_compete", "no_solicit_employees", "non_disparagement",
-                           "competitive_restriction_exception"}
-        commercial_types = {"cap_on_liability", "indemnification", "uncapped_liability",
-                           "insurance", "liquidated_damages", "warranty_duration",
-                           "minimum_commitment", "volume_restriction", "price_restrictions",
-                           "revenue_profit_sharing"}
-
-        if clause_type in ip_types:
-            return "intellectual_property"
-        elif clause_type in employment_types:
-            return "employment_labor"
-        elif clause_type in commercial_types:
-            return "commercial_contracts"
-        return "general"
+        return CLAUSE_TYPE_TO_PRACTICE_AREA.get(clause_type, "general")
 
     def transform(self, raw_data: list[dict]) -> list[dict]:
         """
         Extract clause annotations from CUAD rows.
 
         Each row with non-empty answers produces one document per
-        unique answer text. Deduplicates by text hash to avoid
-        indexing the same clause span multiple times.
+        unique answer text. Deduplicates by text to avoid indexing
+        the same clause span multiple times.
         """
         docs = []
-        seen_hashes = set()
+        seen_texts = set()
 
         for row in raw_data:
             answers = row.get("answers", {})
@@ -135,34 +158,34 @@ class CuadIngestor(BaseIngestor):
             if not answer_texts:
                 continue  # Skip rows with no annotations
 
+            # Constant across the row's answers
             question = row.get("question", "")
             clause_type = self._extract_clause_type(question)
             contract_title = row.get("title", "unknown_contract")
+            title = f"{clause_type.replace('_', ' ').title()} — {contract_title}"
+            practice_area = self._infer_practice_area(clause_type)
 
             for text in answer_texts:
                 text = text.strip()
                 if not text or len(text) < 10:
                     continue  # Skip very short fragments
 
-                # Deduplicate
-                text_hash = hashlib.md5(text.encode()).hexdigest()
-                if text_hash in seen_hashes:
+                # Deduplicate (the set holds the answer strings themselves,
+                # so nothing is hashed beyond the doc ID)
+                if text in seen_texts:
                     continue
-                seen_hashes.add(text_hash)
-
-                doc_id = self._make_doc_id(contract_title, clause_type, text)
-                clause_type_display = clause_type.replace("_", " ").title()
+                seen_texts.add(text)
 
                 docs.append({
-                    "doc_id": doc_id,
+                    "doc_id": self._make_doc_id(contract_title, clause_type, text),
                     "source": "cuad",
                     "doc_type": "clause",
-                    "title": f"{clause_type_display} — {contract_title}",
+                    "title": title,
                     "text": text,
                     "metadata": {
                         "clause_type": clause_type,
                         "source_contract": contract_title,
-                        "practice_area": self._infer_practice_area(clause_type),
+                        "practice_area": practice_area,
                         "category": clause_type,
                     },
                 })
@@ -12,7 +12,6 @@ Usage:
 
 import argparse
 import logging
-import os
 import time
 
 from dotenv import load_dotenv
@@ -78,15 +77,12 @@ def main():
     # Load into vector store
     logger.info("Building vector store...")
     start = time.time()
-    db = load_documents(documents=all_docs)
+    # With a FAISS store, load_documents saves the index here (with its
+    # content hash) and reuses it or its cached vectors on later runs, so
+    # clauses ingested before are not embedded again
+    load_documents(documents=all_docs, index_path=args.save_index)
     elapsed = time.time() - start
-    logger.info(f"Vector store built in {elapsed:.1f}s with {len(all_docs)} documents")
-
-    # Persist the index
-    store_provider = os.environ.get("VECTOR_STORE_PROVIDER", "faiss")
-    if store_provider == "faiss" and hasattr(db["store"], "save"):
-        db["store"].save(args.save_index)
-        logger.info(f"Index saved to {args.save_index}")
+    logger.info(f"Vector store ready in {elapsed:.1f}s with {len(all_docs)} documents")
 
     # Print summary
     print(f"\n{'=' * 50}")
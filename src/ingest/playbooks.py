@@ -1,9 +1,10 @@
 """Ingestor for firm playbook JSON files."""
 
-import json
 import glob
 import logging
 
+import orjson
+
 from src.ingest.base import BaseIngestor
 
 logger = logging.getLogger(__name__)
@@ -19,8 +20,8 @@ class PlaybookIngestor(BaseIngestor):
         files = sorted(glob.glob(f"{self.data_dir}/*.json"))
         playbooks = []
         for path in files:
-            with open(path) as f:
-                playbooks.append(json.load(f))
+            with open(path, "rb") as f:
+                playbooks.append(orjson.loads(f.read()))
         return playbooks
 
     def transform(self, raw_data: list[dict]) -> list[dict]:
@@ -6,10 +6,11 @@ Loads structured statute data and creates two document types per state:
 2. Individual provision documents (for semantic search within a state)
 """
 
-import json
 import glob
 import logging
 
+import orjson
+
 from src.ingest.base import BaseIngestor
 
 logger = logging.getLogger(__name__)
@@ -26,8 +27,8 @@ class StatuteIngestor(BaseIngestor):
         files = sorted(glob.glob(f"{self.data_dir}/*.json"))
         statutes = []
         for path in files:
-            with open(path) as f:
-                statutes.append(json.load(f))
+            with open(path, "rb") as f:
+                statutes.append(orjson.loads(f.read()))
         return statutes
 
     def transform(self, raw_data: list[dict]) -> list[dict]:
@@ -44,38 +45,38 @@ class StatuteIngestor(BaseIngestor):
             abbr = statute["jurisdiction_abbr"]
             citation = statute["statute_citation"]
 
-            # 1. Full summary document
-            summary_text = self._build_summary_text(statute)
-            docs.append({
-                "doc_id": f"statute-{abbr.lower()}-summary",
-                "source": "statutes",
-                "doc_type": "statute",
-                "title": f"{jurisdiction} Data Breach Notification Law",
-                "text": summary_text,
-                "metadata": {
-                    "jurisdiction": abbr,
-                    "citation": citation,
-                    "practice_area": "privacy",
-                    "category": "breach_notification",
-                },
-            })
-
-            # 2. PI definition document
-            pi_def = "; ".join(statute.get("personal_information_definition", []))
-            if pi_def:
-                docs.append({
-                    "doc_id": f"statute-{abbr.lower()}-pi-definition",
+            def make_doc(suffix: str, title: str, text: str, category: str) -> dict:
+                return {
+                    "doc_id": f"statute-{abbr.lower()}-{suffix}",
                     "source": "statutes",
                     "doc_type": "statute",
-                    "title": f"{jurisdiction} — Personal Information Definition",
-                    "text": f"Under {citation}, personal information is defined as: {pi_def}",
+                    "title": title,
+                    "text": text,
                     "metadata": {
                         "jurisdiction": abbr,
                         "citation": citation,
                         "practice_area": "privacy",
-                        "category": "pi_definition",
+                        "category": category,
                     },
-                })
+                }
+
+            # 1. Full summary document
+            docs.append(make_doc(
+                "summary",
+                f"{jurisdiction} Data Breach Notification Law",
+                self._build_summary_text(statute),
+                "breach_notification",
+            ))
+
+            # 2. PI definition document
+            pi_def = "; ".join(statute.get("personal_information_definition", []))
+            if pi_def:
+                docs.append(make_doc(
+                    "pi-definition",
+                    f"{jurisdiction} — Personal Information Definition",
+                    f"Under {citation}, personal information is defined as: {pi_def}",
+                    "pi_definition",
+                ))
 
             # 3. Notification timeline document
             timeline = statute.get("notification_timeline", "")
@@ -83,35 +84,21 @@ class StatuteIngestor(BaseIngestor):
             timeline_text = f"Notification timeline: {timeline}"
             if days:
                 timeline_text += f" ({days} days)"
-            docs.append({
-                "doc_id": f"statute-{abbr.lower()}-timeline",
-                "source": "statutes",
-                "doc_type": "statute",
-                "title": f"{jurisdiction} — Notification Timeline",
-                "text": timeline_text,
-                "metadata": {
-                    "jurisdiction": abbr,
-                    "citation": citation,
-                    "practice_area": "privacy",
-                    "category": "notification_timeline",
-                },
-            })
+            docs.append(make_doc(
+                "timeline",
+                f"{jurisdiction} — Notification Timeline",
+                timeline_text,
+                "notification_timeline",
+            ))
 
             # 4. Safe harbor document
             if statute.get("encryption_safe_harbor"):
-                docs.append({
-                    "doc_id": f"statute-{abbr.lower()}-safe-harbor",
-                    "source": "statutes",
-                    "doc_type": "statute",
-                    "title": f"{jurisdiction} — Encryption Safe Harbor",
-                    "text": f"Encryption safe harbor: {statute.get('encryption_safe_harbor_details', 'Yes')}",
-                    "metadata": {
-                        "jurisdiction": abbr,
-                        "citation": citation,
-                        "practice_area": "privacy",
-                        "category": "safe_harbor",
-                    },
-                })
+                docs.append(make_doc(
+                    "safe-harbor",
+                    f"{jurisdiction} — Encryption Safe Harbor",
+                    f"Encryption safe harbor: {statute.get('encryption_safe_harbor_details', 'Yes')}",
+                    "safe_harbor",
+                ))
 
         return docs
 
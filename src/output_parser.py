@@ -8,6 +8,11 @@ JSON with preamble/trailing text, and malformed responses.
 import json
 import re
 
+# ```json ... ``` or ``` ... ```
+_FENCE_RE = re.compile(r"```(?:json)?\s*\n?(.*?)\n?\s*```", re.DOTALL)
+
+_DECODER = json.JSONDecoder()
+
 
 def parse_json_response(text: str) -> dict | None:
     """
@@ -16,7 +21,7 @@ def parse_json_response(text: str) -> dict | None:
     Tries (in order):
     1. Direct JSON parse
     2. Code-fence extraction (```json ... ``` or ``` ... ```)
-    3. Brace-matching extraction
+    3. The first JSON object in the text (preamble/trailing text ignored)
 
     Returns parsed dict or None if no valid JSON found.
     """
@@ -34,8 +39,7 @@ def parse_json_response(text: str) -> dict | None:
         pass
 
     # Strategy 2: Code-fence extraction
-    fence_pattern = r"```(?:json)?\s*\n?(.*?)\n?\s*```"
-    match = re.search(fence_pattern, text, re.DOTALL)
+    match = _FENCE_RE.search(text)
     if match:
         try:
             result = json.loads(match.group(1).strip())
@@ -44,23 +48,16 @@ def parse_json_response(text: str) -> dict | None:
         except (json.JSONDecodeError, TypeError):
             pass
 
-    # Strategy 3: Brace-matching
+    # Strategy 3: Decode the object starting at the first brace, ignoring
+    # whatever follows it
     start = text.find("{")
     if start != -1:
-        depth = 0
-        for i in range(start, len(text)):
-            if text[i] == "{":
-                depth += 1
-            elif text[i] == "}":
-                depth -= 1
-                if depth == 0:
-                    try:
-                        result = json.loads(text[start:i + 1])
-                        if isinstance(result, dict):
-                            return result
-                    except (json.JSONDecodeError, TypeError):
-                        pass
-                    break
+        try:
+            result, _ = _DECODER.raw_decode(text, start)
+            if isinstance(result, dict):
+                return result
+        except json.JSONDecodeError:
+            pass
 
     return None
 
@@ -7,15 +7,22 @@ and generates a clause-by-clause report with gap analysis and redline suggestion
 
 import json
 import logging
+import os
 from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
-from src.contract_chunker import extract_clauses
+import numpy as np
+
+from src.contract_chunker import extract_and_embed_clauses
 from src.retrieval import search_similar_clauses, format_retrieval_results
 from src.generation import generate_analysis
 from src.output_parser import parse_json_response_or_raw
 
 logger = logging.getLogger(__name__)
 
+# Concurrent LLM calls per contract; keep below the provider's rate limit
+REVIEW_MAX_WORKERS = int(os.environ.get("REVIEW_MAX_WORKERS", "8"))
+
 
 def _similarity_label(score: float) -> str:
     """Convert a cosine similarity score to a qualitative label."""
@@ -27,8 +34,20 @@ def _similarity_label(score: float) -> str:
 
 
 def load_playbook(playbook_path: str) -> dict:
-    """Load a playbook JSON file."""
-    with open(playbook_path) as f:
+    """
+    Load a playbook JSON file.
+
+    Parsed playbooks are cached per (real path, mtime), so repeat reviews
+    skip the read and an edited file is picked up on the next call.
+    The returned dict is shared — treat it as read-only.
+    """
+    real_path = os.path.realpath(playbook_path)
+    return _load_playbook(real_path, os.stat(real_path).st_mtime_ns)
+
+
+@lru_cache(maxsize=32)
+def _load_playbook(real_path: str, mtime_ns: int) -> dict:
+    with open(real_path) as f:
         return json.load(f)
 
 
@@ -40,47 +59,61 @@ def find_playbook_position(clause_type: str, playbook: dict) -> dict | None:
     return None
 
 
-REVIEW_PROMPT = """You are a senior contract attorney reviewing a clause against the firm's playbook.
+# Static instructions live in the system prompt so the prefix is identical
+# across clauses and can be served from the provider's prompt cache.
+REVIEW_SYSTEM_PROMPT = """You are an expert contract review attorney reviewing a clause against the firm's playbook. Return only valid JSON.
 
-CLAUSE FROM CONTRACT:
-{clause_text}
-
-PLAYBOOK POSITION:
-Preferred: {preferred}
-Fallback: {fallback}
-Walk-away: {walk_away}
-Notes: {notes}
-
-SIMILAR CLAUSES FROM KNOWLEDGE BASE:
-{retrieved_context}
+You will be given a clause from a contract, the firm's playbook position for that clause type, and similar clauses from the knowledge base.
 
-Analyze how this clause compares to the playbook position. Respond in JSON:
-{{
-    "clause_type": "{clause_type}",
+Analyze how the clause compares to the playbook position. Respond in JSON:
+{
+    "clause_type": "the clause type given in the request",
     "playbook_match": "preferred | fallback | walk_away | not_covered",
     "gaps": [
-        {{
+        {
             "issue": "Description of the gap",
             "severity": "high | medium | low",
             "playbook_says": "What the playbook requires",
             "clause_says": "What the contract actually says"
-        }}
+        }
     ],
     "suggested_redline": "Specific language to add, change, or remove",
     "risk_level": "high | medium | low",
     "negotiation_notes": "Practical advice for negotiating this point",
-    "sources_used": [{{"id": "source-id", "relevance": "why relevant"}}],
+    "sources_used": [{"id": "source-id", "relevance": "why relevant"}],
     "confidence": "high | medium | low"
-}}"""
+}"""
+
+REVIEW_PROMPT = """CLAUSE TYPE: {clause_type}
+
+CLAUSE FROM CONTRACT:
+{clause_text}
+
+PLAYBOOK POSITION:
+Preferred: {preferred}
+Fallback: {fallback}
+Walk-away: {walk_away}
+Notes: {notes}
+
+SIMILAR CLAUSES FROM KNOWLEDGE BASE:
+{retrieved_context}"""
 
 
 def review_clause_against_playbook(
     clause: dict,
     playbook_position: dict,
     db: dict,
+    query_embedding: np.ndarray | None = None,
 ) -> dict:
-    """Review a single clause against its playbook position."""
-    similar = search_similar_clauses(clause["text"], db, top_k=3)
+    """
+    Review a single clause against its playbook position.
+
+    Pass query_embedding when the clause text was already embedded
+    (review_contract embeds all clauses in one batch).
+    """
+    similar = search_similar_clauses(
+        clause["text"], db, top_k=3, query_embedding=query_embedding
+    )
     context = format_retrieval_results(similar)
     retrieval_sources = [
         {
@@ -92,7 +125,7 @@ def review_clause_against_playbook(
     ]
 
     messages = [
-        {"role": "system", "content": "You are an expert contract review attorney. Return only valid JSON."},
+        {"role": "system", "content": REVIEW_SYSTEM_PROMPT},
         {"role": "user", "content": REVIEW_PROMPT.format(
             clause_text=clause["text"],
             preferred=playbook_position["preferred_position"],
@@ -142,7 +175,9 @@ def review_contract(
     playbook = load_playbook(playbook_path)
     logger.info(f"Loaded playbook: {playbook['name']} ({len(playbook['clauses'])} clause types)")
 
-    clauses = extract_clauses(contract_text, db["provider"])
+    # Every clause is embedded alongside classification; embedding only the
+    # playbook matches would have to wait for classification to finish
+    clauses, clause_embeddings = extract_and_embed_clauses(contract_text, db["provider"])
     logger.info(f"Extracted {len(clauses)} clauses from contract")
 
     # Separate clauses with playbook matches (need API calls) from those without
@@ -170,9 +205,11 @@ def review_contract(
     # Review matched clauses in parallel
     if clauses_to_review:
         logger.info(f"Reviewing {len(clauses_to_review)} clauses in parallel...")
-        with ThreadPoolExecutor(max_workers=6) as executor:
+        with ThreadPoolExecutor(max_workers=REVIEW_MAX_WORKERS) as executor:
             futures = [
-                (i, executor.submit(review_clause_against_playbook, clause, playbook_pos, db))
+                (i, executor.submit(
+                    review_clause_against_playbook, clause, playbook_pos, db, clause_embeddings[i]
+                ))
                 for i, clause, playbook_pos in clauses_to_review
             ]
             for i, future in futures:
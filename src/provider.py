@@ -2,26 +2,59 @@
 LLM Provider Abstraction — Multi-Cloud Support
 
 Supports OpenAI (direct), Azure OpenAI, and AWS Bedrock as interchangeable
-LLM backends. Each provider exposes the same two methods: embed() and chat().
+LLM backends. Each provider exposes the same two methods: embed() and chat(),
+plus chat_stream() for incremental output. OpenAI and Azure also offer
+chat_json() for schema-constrained JSON output.
 
 Selection via LLM_PROVIDER env var (default: "openai").
 """
 
+import base64
 import logging
 import os
 import json
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 
-from src.retry import retry_with_backoff
+from src.retry import is_transient_error, retry_with_backoff
 
 logger = logging.getLogger(__name__)
 
+# Concurrent single-text Titan requests per embed() call. get_embeddings runs
+# several embed() calls at once, so keep the product within the connection pool.
+BEDROCK_EMBED_MAX_WORKERS = int(os.environ.get("BEDROCK_EMBED_MAX_WORKERS", "8"))
+
+# Shorter OpenAI v3 embeddings: the API truncates and re-normalizes each
+# vector, so index size and search cost shrink with little recall loss
+OPENAI_EMBED_DIM = int(os.environ.get("OPENAI_EMBED_DIM") or 0) or None
+
+
+def _embeddings_from_response(response) -> np.ndarray:
+    """
+    Decode an OpenAI-style base64 embeddings response into one float32 array.
+
+    Each vector arrives as packed little-endian float32 bytes and is copied
+    straight into its row. Left to pick the format, the SDK also fetches
+    base64 but then expands every vector into a list of Python floats, only
+    for np.array to pack them back.
+    """
+    embeddings = None
+    for item in response.data:
+        row = np.frombuffer(base64.b64decode(item.embedding), dtype="<f4")
+        if embeddings is None:
+            embeddings = np.empty((len(response.data), row.shape[0]), dtype=np.float32)
+        embeddings[item.index] = row
+    return embeddings
+
 
 class OpenAIProvider:
     """Direct OpenAI API provider."""
 
     provider_name = "OpenAI"
     embedding_model = "text-embedding-3-small"
+    embedding_dimensions = OPENAI_EMBED_DIM
     chat_model = "gpt-4o-mini"
 
     def __init__(self):
@@ -29,18 +62,19 @@ class OpenAIProvider:
         self.client = OpenAI()
         logger.info("Initialized OpenAI provider")
 
-    # TODO: narrow to specific exception types (429, 500+)
-    @retry_with_backoff(max_retries=3, base_delay=1.0, retryable_exceptions=(Exception,))
+    @retry_with_backoff(max_retries=3, base_delay=1.0, should_retry=is_transient_error)
     def embed(self, texts: list[str]) -> np.ndarray:
         logger.debug("Embedding %d texts via OpenAI", len(texts))
+        extra = {"dimensions": self.embedding_dimensions} if self.embedding_dimensions else {}
         response = self.client.embeddings.create(
             model=self.embedding_model,
             input=texts,
+            encoding_format="base64",
+            **extra,
         )
-        embeddings = [item.embedding for item in response.data]
-        return np.array(embeddings, dtype="float32")
+        return _embeddings_from_response(response)
 
-    @retry_with_backoff(max_retries=3, base_delay=1.0, retryable_exceptions=(Exception,))
+    @retry_with_backoff(max_retries=3, base_delay=1.0, should_retry=is_transient_error)
     def chat(self, messages: list[dict], model: str | None = None,
              temperature: float = 0.2, max_tokens: int = 1500) -> str:
         logger.debug("Chat request: model=%s, temp=%s", model or self.chat_model, temperature)
@@ -52,6 +86,41 @@ class OpenAIProvider:
         )
         return response.choices[0].message.content
 
+    @retry_with_backoff(max_retries=3, base_delay=1.0, should_retry=is_transient_error)
+    def chat_json(self, messages: list[dict], schema: dict, model: str | None = None,
+                  temperature: float = 0.2, max_tokens: int = 1500) -> str:
+        """Chat whose reply is decoded under a strict JSON schema (Structured Outputs)."""
+        logger.debug("Chat JSON request: model=%s, schema=%s", model or self.chat_model, schema["name"])
+        response = self.client.chat.completions.create(
+            model=model or self.chat_model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format={"type": "json_schema", "json_schema": {**schema, "strict": True}},
+        )
+        return response.choices[0].message.content
+
+    def chat_stream(self, messages: list[dict], model: str | None = None,
+                    temperature: float = 0.2, max_tokens: int = 1500) -> Iterator[str]:
+        """Yield the completion text as it is generated."""
+        stream = self._open_chat_stream(messages, model, temperature, max_tokens)
+        for chunk in stream:
+            # Some chunks carry no text (role header, Azure content-filter results)
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    # Only opening the stream is retried; a stream that fails midway can't be replayed
+    @retry_with_backoff(max_retries=3, base_delay=1.0, should_retry=is_transient_error)
+    def _open_chat_stream(self, messages, model, temperature, max_tokens):
+        logger.debug("Chat stream request: model=%s, temp=%s", model or self.chat_model, temperature)
+        return self.client.chat.completions.create(
+            model=model or self.chat_model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+        )
+
 
 class AzureOpenAIProvider:
     """Azure OpenAI Service provider."""
@@ -63,7 +132,8 @@ class AzureOpenAIProvider:
 
         endpoint = os.environ.get("AZURE_OPENAI_ENDPOINT")
         api_key = os.environ.get("AZURE_OPENAI_API_KEY")
-        api_version = os.environ.get("AZURE_OPENAI_API_VERSION", "2024-02-01")
+        # Structured outputs (chat_json) need 2024-08-01-preview or later
+        api_version = os.environ.get("AZURE_OPENAI_API_VERSION", "2024-08-01-preview")
 
         if not endpoint or not api_key:
             raise ValueError(
@@ -84,17 +154,17 @@ class AzureOpenAIProvider:
             )
         logger.info("Initialized Azure OpenAI provider (endpoint=%s)", endpoint)
 
-    @retry_with_backoff(max_retries=3, base_delay=1.0, retryable_exceptions=(Exception,))
+    @retry_with_backoff(max_retries=3, base_delay=1.0, should_retry=is_transient_error)
     def embed(self, texts: list[str]) -> np.ndarray:
         logger.debug("Embedding %d texts via Azure OpenAI", len(texts))
         response = self.client.embeddings.create(
             model=self.embedding_model,
             input=texts,
+            encoding_format="base64",
         )
-        embeddings = [item.embedding for item in response.data]
-        return np.array(embeddings, dtype="float32")
+        return _embeddings_from_response(response)
 
-    @retry_with_backoff(max_retries=3, base_delay=1.0, retryable_exceptions=(Exception,))
+    @retry_with_backoff(max_retries=3, base_delay=1.0, should_retry=is_transient_error)
     def chat(self, messages: list[dict], model: str | None = None,
              temperature: float = 0.2, max_tokens: int = 1500) -> str:
         logger.debug("Chat request: model=%s, temp=%s", model or self.chat_model, temperature)
@@ -106,6 +176,41 @@ class AzureOpenAIProvider:
         )
         return response.choices[0].message.content
 
+    @retry_with_backoff(max_retries=3, base_delay=1.0, should_retry=is_transient_error)
+    def chat_json(self, messages: list[dict], schema: dict, model: str | None = None,
+                  temperature: float = 0.2, max_tokens: int = 1500) -> str:
+        """Chat whose reply is decoded under a strict JSON schema (Structured Outputs)."""
+        logger.debug("Chat JSON request: model=%s, schema=%s", model or self.chat_model, schema["name"])
+        response = self.client.chat.completions.create(
+            model=model or self.chat_model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format={"type": "json_schema", "json_schema": {**schema, "strict": True}},
+        )
+        return response.choices[0].message.content
+
+    def chat_stream(self, messages: list[dict], model: str | None = None,
+                    temperature: float = 0.2, max_tokens: int = 1500) -> Iterator[str]:
+        """Yield the completion text as it is generated."""
+        stream = self._open_chat_stream(messages, model, temperature, max_tokens)
+        for chunk in stream:
+            # Some chunks carry no text (role header, Azure content-filter results)
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    # Only opening the stream is retried; a stream that fails midway can't be replayed
+    @retry_with_backoff(max_retries=3, base_delay=1.0, should_retry=is_transient_error)
+    def _open_chat_stream(self, messages, model, temperature, max_tokens):
+        logger.debug("Chat stream request: model=%s, temp=%s", model or self.chat_model, temperature)
+        return self.client.chat.completions.create(
+            model=model or self.chat_model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+        )
+
 
 class BedrockProvider:
     """AWS Bedrock provider using Titan for embeddings and Converse API for chat."""
@@ -114,9 +219,17 @@ class BedrockProvider:
 
     def __init__(self):
         import boto3
+        from botocore.config import Config
 
         region = os.environ.get("AWS_REGION", "us-east-1")
-        self.bedrock = boto3.client("bedrock-runtime", region_name=region)
+        # botocore keeps 10 pooled connections by default, fewer than the
+        # classification/review/breach thread pools use at once; calls past
+        # the pool size would each open (and TLS-handshake) a new connection
+        config = Config(
+            max_pool_connections=int(os.environ.get("BEDROCK_MAX_POOL_CONNECTIONS", "64")),
+            tcp_keepalive=True,
+        )
+        self.bedrock = boto3.client("bedrock-runtime", region_name=region, config=config)
         self.embedding_model = os.environ.get(
             "BEDROCK_EMBEDDING_MODEL", "amazon.titan-embed-text-v2:0"
         )
@@ -125,24 +238,35 @@ class BedrockProvider:
         )
         logger.info("Initialized Bedrock provider (region=%s)", region)
 
-    @retry_with_backoff(max_retries=3, base_delay=1.0, retryable_exceptions=(Exception,))
     def embed(self, texts: list[str]) -> np.ndarray:
         logger.debug("Embedding %d texts via Bedrock", len(texts))
-        embeddings = []
-        for text in texts:
-            response = self.bedrock.invoke_model(
-                modelId=self.embedding_model,
-                body=json.dumps({"inputText": text}),
-                contentType="application/json",
-            )
-            result = json.loads(response["body"].read())
-            embeddings.append(result["embedding"])
+        if self.embedding_model.startswith("cohere.embed"):
+            # Cohere embeds a whole batch (up to 96 texts, see embed_batched)
+            # in one request. One input_type serves both documents and queries.
+            result = self._invoke_embedding({"texts": texts, "input_type": "search_document"})
+            return np.array(result["embeddings"], dtype="float32")
+
+        # Titan takes one text per request; issue them concurrently rather
+        # than paying a round-trip per text in sequence
+        workers = max(1, min(BEDROCK_EMBED_MAX_WORKERS, len(texts)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(lambda text: self._invoke_embedding({"inputText": text}), texts)
+            embeddings = [result["embedding"] for result in results]
         return np.array(embeddings, dtype="float32")
 
-    @retry_with_backoff(max_retries=3, base_delay=1.0, retryable_exceptions=(Exception,))
-    def chat(self, messages: list[dict], model: str | None = None,
-             temperature: float = 0.2, max_tokens: int = 1500) -> str:
-        logger.debug("Chat request: model=%s, temp=%s", model or self.chat_model, temperature)
+    # Retried per request, so one throttled text doesn't re-embed the batch
+    @retry_with_backoff(max_retries=3, base_delay=1.0, should_retry=is_transient_error)
+    def _invoke_embedding(self, body: dict) -> dict:
+        response = self.bedrock.invoke_model(
+            modelId=self.embedding_model,
+            body=json.dumps(body),
+            contentType="application/json",
+        )
+        return json.loads(response["body"].read())
+
+    def _converse_kwargs(self, messages: list[dict], model: str | None,
+                         temperature: float, max_tokens: int) -> dict:
+        """Translate chat messages into Converse / ConverseStream arguments."""
         system_parts = []
         converse_messages = []
 
@@ -164,11 +288,36 @@ class BedrockProvider:
             },
         }
         if system_parts:
+            if os.environ.get("BEDROCK_PROMPT_CACHE", "").lower() in ("1", "true", "yes"):
+                # Cache the static system prefix (models with prompt caching only)
+                system_parts = system_parts + [{"cachePoint": {"type": "default"}}]
             kwargs["system"] = system_parts
+        return kwargs
 
+    @retry_with_backoff(max_retries=3, base_delay=1.0, should_retry=is_transient_error)
+    def chat(self, messages: list[dict], model: str | None = None,
+             temperature: float = 0.2, max_tokens: int = 1500) -> str:
+        logger.debug("Chat request: model=%s, temp=%s", model or self.chat_model, temperature)
+        kwargs = self._converse_kwargs(messages, model, temperature, max_tokens)
         response = self.bedrock.converse(**kwargs)
         return response["output"]["message"]["content"][0]["text"]
 
+    def chat_stream(self, messages: list[dict], model: str | None = None,
+                    temperature: float = 0.2, max_tokens: int = 1500) -> Iterator[str]:
+        """Yield the completion text as it is generated."""
+        response = self._open_chat_stream(messages, model, temperature, max_tokens)
+        for event in response["stream"]:
+            text = event.get("contentBlockDelta", {}).get("delta", {}).get("text")
+            if text:
+                yield text
+
+    # Only opening the stream is retried; a stream that fails midway can't be replayed
+    @retry_with_backoff(max_retries=3, base_delay=1.0, should_retry=is_transient_error)
+    def _open_chat_stream(self, messages, model, temperature, max_tokens):
+        logger.debug("Chat stream request: model=%s, temp=%s", model or self.chat_model, temperature)
+        kwargs = self._converse_kwargs(messages, model, temperature, max_tokens)
+        return self.bedrock.converse_stream(**kwargs)
+
 
 _PROVIDERS = {
     "openai": OpenAIProvider,
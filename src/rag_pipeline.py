@@ -6,8 +6,12 @@ Retrieve similar clauses → Augment the prompt with context → Generate analys
 """
 
 import logging
+from collections.abc import Iterator
+
+import numpy as np
 
 from src.embeddings import load_clause_database
+from src.execution_gate import should_short_circuit, remember
 from src.output_parser import parse_json_response_or_raw
 from src.retrieval import search_similar_clauses, format_retrieval_results
 from src.generation import (
@@ -16,6 +20,7 @@ from src.generation import (
     build_few_shot_prompt,
     build_knowledge_base_qa_prompt,
     generate_analysis,
+    generate_analysis_stream,
 )
 
 logger = logging.getLogger(__name__)
@@ -28,6 +33,10 @@ STRATEGIES = {
     "knowledge_base_qa": build_knowledge_base_qa_prompt,
 }
 
+# Strategies that produce a clause analysis; knowledge_base_qa has different
+# output semantics and is served by kb_search (/ask) instead
+ANALYZE_STRATEGIES = frozenset(k for k in STRATEGIES if k != "knowledge_base_qa")
+
 _DISCLAIMER = (
     "DRAFT ANALYSIS — Requires Attorney Review. "
     "This analysis was generated by an AI system and has not been "
@@ -36,6 +45,20 @@ _DISCLAIMER = (
 )
 
 
+def _build_sources(retrieved: list[dict]) -> list[dict]:
+    """Build the source trail from retrieval results."""
+    sources = []
+    for r in retrieved:
+        clause = r["clause"]
+        sources.append({
+            "id": clause.get("id", "unknown"),
+            "title": clause.get("title", ""),
+            "score": round(r["score"], 4),
+            "risk_level": clause.get("risk_level", ""),
+        })
+    return sources
+
+
 def analyze_clause(
     clause_text: str,
     db: dict,
@@ -43,15 +66,38 @@ def analyze_clause(
     top_k: int = 3,
     model: str | None = None,
     temperature: float = 0.2,
+    query_embedding: np.ndarray | None = None,
+    retrieved: list[dict] | None = None,
 ) -> dict:
     """
     Full RAG pipeline: retrieve similar clauses, then generate analysis.
 
     Returns the parsed analysis alongside a source trail, draft framing,
     and pipeline metadata for explainability and audit trail purposes.
+    Pass query_embedding when the caller already embedded clause_text
+    (e.g. for a cache lookup) to avoid a second embedding call, or
+    retrieved to reuse earlier search results and skip retrieval entirely.
+
+    Blank, too-short, or non-contract input is rejected without an LLM
+    call, and an exact repeat of an earlier request returns that result.
     """
     logger.info("Pipeline: strategy=%s, top_k=%d, model=%s", strategy, top_k, model)
-    retrieved = search_similar_clauses(clause_text, db, top_k=top_k)
+    gate_scope = f"{strategy}:{top_k}:{model}:{temperature}"
+    gated = should_short_circuit(clause_text, gate_scope)
+    if gated is not None:
+        return {
+            "sources": [],
+            "strategy": strategy,
+            "model": model or db["provider"].chat_model,
+            "top_k": top_k,
+            "disclaimer": _DISCLAIMER,
+            **gated,
+        }
+
+    if retrieved is None:
+        retrieved = search_similar_clauses(
+            clause_text, db, top_k=top_k, query_embedding=query_embedding
+        )
     context = format_retrieval_results(retrieved)
 
     prompt_builder = STRATEGIES[strategy]
@@ -64,19 +110,10 @@ def analyze_clause(
     # Parse the LLM response into structured JSON
     parsed = parse_json_response_or_raw(raw_analysis)
 
-    # Build source trail from retrieval results
-    sources = []
-    for r in retrieved:
-        clause = r["clause"]
-        sources.append({
-            "id": clause.get("id", "unknown"),
-            "title": clause.get("title", ""),
-            "score": round(r["score"], 4),
-            "risk_level": clause.get("risk_level", ""),
-        })
+    sources = _build_sources(retrieved)
 
     logger.info("Pipeline complete: %d clauses retrieved", len(retrieved))
-    return {
+    result = {
         "analysis": parsed,
         "sources": sources,
         "strategy": strategy,
@@ -85,3 +122,63 @@ def analyze_clause(
         "review_status": "pending_review",
         "disclaimer": _DISCLAIMER,
     }
+    remember(clause_text, result, gate_scope)
+    return result
+
+
+def analyze_clause_stream(
+    clause_text: str,
+    db: dict,
+    strategy: str = "few_shot",
+    top_k: int = 3,
+    model: str | None = None,
+    temperature: float = 0.2,
+    query_embedding: np.ndarray | None = None,
+) -> Iterator[dict]:
+    """
+    Streaming variant of analyze_clause.
+
+    Yields events in order:
+    - {"type": "source", ...} for each retrieved source (before the LLM call)
+    - {"type": "token", "t": text} for each chunk of LLM output
+    - {"type": "done", ...} with the parsed analysis and the same fields
+      analyze_clause returns (minus sources, already sent)
+
+    Gated input (see execution_gate) yields its sources and "done" only.
+    """
+    logger.info("Streaming pipeline: strategy=%s, top_k=%d, model=%s", strategy, top_k, model)
+    result_fields = {
+        "strategy": strategy,
+        "model": model or db["provider"].chat_model,
+        "top_k": top_k,
+        "review_status": "pending_review",
+        "disclaimer": _DISCLAIMER,
+    }
+
+    gate_scope = f"{strategy}:{top_k}:{model}:{temperature}"
+    gated = should_short_circuit(clause_text, gate_scope)
+    if gated is not None:
+        gated = {"sources": [], **result_fields, **gated}
+        for source in gated.pop("sources"):
+            yield {"type": "source", **source}
+        yield {"type": "done", **gated}
+        return
+
+    retrieved = search_similar_clauses(
+        clause_text, db, top_k=top_k, query_embedding=query_embedding
+    )
+    sources = _build_sources(retrieved)
+    for source in sources:
+        yield {"type": "source", **source}
+
+    messages = STRATEGIES[strategy](clause_text, format_retrieval_results(retrieved))
+    chunks = []
+    for chunk in generate_analysis_stream(
+        messages, db["provider"], model=model, temperature=temperature
+    ):
+        chunks.append(chunk)
+        yield {"type": "token", "t": chunk}
+
+    parsed = parse_json_response_or_raw("".join(chunks))
+    remember(clause_text, {"analysis": parsed, "sources": sources, **result_fields}, gate_scope)
+    yield {"type": "done", "analysis": parsed, **result_fields}
@@ -19,6 +19,7 @@ def search_similar_clauses(
     db: dict,
     top_k: int = 3,
     filters: dict[str, str] | None = None,
+    query_embedding: np.ndarray | None = None,
 ) -> list[dict]:
     """
     Find the most similar clauses to a query string.
@@ -28,41 +29,31 @@ def search_similar_clauses(
         db: The database dict from load_clause_database() or load_documents()
         top_k: Number of similar clauses to return
         filters: Optional metadata filters (e.g. {"type": "NDA"})
+        query_embedding: Precomputed embedding for `query`; skips the embed call
 
     Returns:
         List of dicts with 'clause' (reconstructed from metadata) and 'score'.
     """
     logger.info("Search: query='%s...', top_k=%d, filters=%s", query[:80], top_k, filters)
-    query_embedding = get_embeddings([query], db["provider"])
+    if query_embedding is None:
+        query_embedding = get_embeddings([query], db["provider"])
+    return search_similar_clauses_by_vector(query_embedding, db, top_k, filters)
 
-    # L2 normalize using numpy (no FAISS dependency in retrieval layer)
-    norm = np.linalg.norm(query_embedding, axis=1, keepdims=True)
-    norm = np.maximum(norm, 1e-12)
-    query_embedding = query_embedding / norm
-
-    store_results = db["store"].search(query_embedding, top_k, filters)
-
-    results = []
-    for hit in store_results:
-        meta = hit["metadata"]
-        clause = {
-            "id": hit["id"],
-            "title": meta.get("title", ""),
-            "type": meta.get("clause_type", meta.get("type", "")),
-            "category": meta.get("category", ""),
-            "text": meta.get("text", ""),
-            "risk_level": meta.get("risk_level", ""),
-            "notes": meta.get("notes", ""),
-            "source": meta.get("source", ""),
-            "doc_type": meta.get("doc_type", "clause"),
-            "jurisdiction": meta.get("jurisdiction", ""),
-            "citation": meta.get("citation", ""),
-            "position": meta.get("position", ""),
-        }
-        results.append({
-            "clause": clause,
-            "score": hit["score"],
-        })
+
+def search_similar_clauses_by_vector(
+    query_embedding: np.ndarray,
+    db: dict,
+    top_k: int = 3,
+    filters: dict[str, str] | None = None,
+) -> list[dict]:
+    """
+    Find the most similar clauses to an already-computed query embedding.
+
+    Same results as search_similar_clauses() without the embedding call,
+    for callers that embed once and reuse the vector (caching, batching).
+    """
+    store_results = db["store"].search(_normalize_query(query_embedding), top_k, filters)
+    results = [_to_result(hit) for hit in store_results]
 
     if results:
         logger.info("Retrieved %d results, top score: %.3f", len(results), results[0]["score"])
@@ -71,6 +62,60 @@ def search_similar_clauses(
     return results
 
 
+def search_similar_clauses_grouped(
+    query_embedding: np.ndarray,
+    db: dict,
+    group_key: str,
+    group_values: list[str],
+    top_k: int = 3,
+    filters: dict[str, str] | None = None,
+) -> dict[str, list[dict]]:
+    """
+    Top-k results per value of a metadata key (e.g. per jurisdiction) from one query.
+
+    Same per-group results as calling search_similar_clauses_by_vector()
+    with {group_key: value} in the filters, but the store answers every
+    group from a single search.
+    """
+    grouped = db["store"].search_grouped(
+        _normalize_query(query_embedding), group_key, group_values, top_k, filters,
+    )
+    return {value: [_to_result(hit) for hit in hits] for value, hits in grouped.items()}
+
+
+def _normalize_query(query_embedding: np.ndarray) -> np.ndarray:
+    """Reshape to (1, dim) float32 and L2 normalize."""
+    query_embedding = np.asarray(query_embedding, dtype=np.float32).reshape(1, -1)
+
+    # L2 normalize using numpy (no FAISS dependency in retrieval layer)
+    norm = np.linalg.norm(query_embedding, axis=1, keepdims=True)
+    norm = np.maximum(norm, 1e-12)
+    return query_embedding / norm
+
+
+def _to_result(hit: dict) -> dict:
+    """Reconstruct a clause dict from a store hit's metadata."""
+    meta = hit["metadata"]
+    clause = {
+        "id": hit["id"],
+        "title": meta.get("title", ""),
+        "type": meta.get("clause_type", meta.get("type", "")),
+        "category": meta.get("category", ""),
+        "text": meta.get("text", ""),
+        "risk_level": meta.get("risk_level", ""),
+        "notes": meta.get("notes", ""),
+        "source": meta.get("source", ""),
+        "doc_type": meta.get("doc_type", "clause"),
+        "jurisdiction": meta.get("jurisdiction", ""),
+        "citation": meta.get("citation", ""),
+        "position": meta.get("position", ""),
+    }
+    return {
+        "clause": clause,
+        "score": hit["score"],
+    }
+
+
 def format_retrieval_results(results: list[dict]) -> str:
     """
     Format retrieved documents into a readable string.
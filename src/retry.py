@@ -2,21 +2,44 @@
 Retry Decorator — Exponential Backoff for Transient Failures
 
 Configurable retry logic with exponential backoff, max delay cap,
-and selective exception handling.
+jitter, and selective exception handling.
 """
 
 import logging
+import random
 import time
+from collections.abc import Callable
 from functools import wraps
 
 logger = logging.getLogger(__name__)
 
 
+def is_transient_error(exc: Exception) -> bool:
+    """
+    Whether an API error is worth retrying.
+
+    HTTP 408/409/429 and 5xx are transient; other 4xx responses (bad
+    request, auth, not found) fail the same way on every attempt. Reads
+    the status from OpenAI SDK errors (status_code) and botocore
+    ClientErrors (response metadata). Errors without a status, such as
+    connection failures and timeouts, are treated as transient.
+    """
+    status = getattr(exc, "status_code", None)
+    response = getattr(exc, "response", None)
+    if status is None and isinstance(response, dict):
+        status = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    if not isinstance(status, int):
+        return True
+    return status in (408, 409, 429) or status >= 500
+
+
 def retry_with_backoff(
     max_retries: int = 3,
     base_delay: float = 1.0,
     max_delay: float = 60.0,
     retryable_exceptions: tuple = (Exception,),
+    should_retry: Callable[[Exception], bool] | None = None,
+    jitter: bool = True,
 ):
     """
     Decorator that retries a function with exponential backoff.
@@ -26,6 +49,10 @@ def retry_with_backoff(
         base_delay: Initial delay in seconds between retries.
         max_delay: Maximum delay in seconds (caps exponential growth).
         retryable_exceptions: Tuple of exception types to catch and retry.
+        should_retry: Optional predicate; caught exceptions it rejects are
+            re-raised immediately (e.g. is_transient_error).
+        jitter: Sleep a random 50-100% of the backoff delay, so concurrent
+            callers that failed together don't retry in lockstep.
     """
     def decorator(func):
         @wraps(func)
@@ -35,9 +62,13 @@ def retry_with_backoff(
                 try:
                     return func(*args, **kwargs)
                 except retryable_exceptions as e:
+                    if should_retry is not None and not should_retry(e):
+                        raise
                     last_exception = e
                     if attempt < max_retries:
                         delay = min(base_delay * (2 ** attempt), max_delay)
+                        if jitter:
+                            delay *= random.uniform(0.5, 1.0)
                         logger.warning(
                             "Retry %d/%d for %s after error: %s. Waiting %.1fs",
                             attempt + 1, max_retries, func.__name__, e, delay,
@@ -0,0 +1,139 @@
+"""
+Semantic Cache — Reuse responses for near-identical queries.
+
+Keeps a small in-memory index of (query embedding -> response) pairs.
+A lookup returns the cached response when the cosine similarity between
+the new query and a stored query meets the threshold, skipping the
+retrieval and LLM round-trips entirely. Callers that have already
+retrieved can also pass the evidence IDs: a hit then additionally
+requires the new and cached evidence sets to overlap (Jaccard), so a
+similar query answered from different sources is regenerated.
+
+Backed by a preallocated numpy matrix rather than FAISS so it works in
+production deployments where faiss-cpu is not installed.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """Fixed-capacity LRU cache keyed by embedding similarity."""
+
+    def __init__(
+        self,
+        dim: int,
+        threshold: float = 0.97,
+        capacity: int = 1024,
+        evidence_threshold: float = 0.8,
+    ):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.dim = dim
+        self.threshold = threshold
+        self.capacity = capacity
+        self.evidence_threshold = evidence_threshold
+        self._vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self._occupied = np.zeros(capacity, dtype=bool)
+        # row id -> (scope, response, evidence ids); oldest → most recently used
+        self._entries: OrderedDict[int, tuple[str, dict, frozenset[str] | None]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> np.ndarray:
+        vec = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        norm = max(float(np.linalg.norm(vec)), 1e-12)
+        return vec / norm
+
+    @staticmethod
+    def _jaccard(a: frozenset[str], b: frozenset[str]) -> float:
+        if not a and not b:
+            return 1.0
+        return len(a & b) / len(a | b)
+
+    def get(
+        self,
+        embedding: np.ndarray,
+        scope: str = "",
+        evidence_ids: list[str] | None = None,
+    ) -> dict | None:
+        """
+        Return the cached response for the most similar stored query.
+
+        Args:
+            embedding: Query embedding (1-D or shape (1, dim)).
+            scope: Partition key — entries only match within the same scope
+                   (e.g. endpoint + strategy), so different request options
+                   never share a response.
+            evidence_ids: IDs of the documents retrieved for this query. When
+                   given, the best match must also have been stored with
+                   evidence overlapping at least evidence_threshold (Jaccard).
+
+        Returns None on a miss.
+        """
+        query = self._normalize(embedding)
+        with self._lock:
+            if not self._entries:
+                self.misses += 1
+                return None
+
+            scores = self._vectors @ query
+            scores[~self._occupied] = -np.inf
+            for row, (entry_scope, _, _) in self._entries.items():
+                if entry_scope != scope:
+                    scores[row] = -np.inf
+
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                self.misses += 1
+                return None
+
+            cached_evidence = self._entries[best][2]
+            if evidence_ids is not None and (
+                cached_evidence is None
+                or self._jaccard(frozenset(evidence_ids), cached_evidence) < self.evidence_threshold
+            ):
+                self.misses += 1
+                logger.debug("Semantic cache evidence mismatch (scope=%s)", scope)
+                return None
+
+            self._entries.move_to_end(best)
+            self.hits += 1
+            logger.debug("Semantic cache hit (score=%.4f, scope=%s)", scores[best], scope)
+            return self._entries[best][1]
+
+    def put(
+        self,
+        embedding: np.ndarray,
+        response: dict,
+        scope: str = "",
+        evidence_ids: list[str] | None = None,
+    ) -> None:
+        """Store a response, evicting the least recently used entry when full."""
+        vec = self._normalize(embedding)
+        with self._lock:
+            if len(self._entries) < self.capacity:
+                row = int(np.argmin(self._occupied))
+            else:
+                row, _ = self._entries.popitem(last=False)
+            self._vectors[row] = vec
+            self._occupied[row] = True
+            evidence = frozenset(evidence_ids) if evidence_ids is not None else None
+            self._entries[row] = (scope, response, evidence)
+            self._entries.move_to_end(row)
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._entries.clear()
+            self._occupied[:] = False
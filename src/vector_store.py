@@ -6,12 +6,60 @@ pluggable backends (FAISS for local dev, Pinecone for production).
 """
 
 import json
+import logging
+import math
 import os
 import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
+# Index tiers by corpus size: tiny corpora use an exact flat index;
+# mid-sized ones store vectors as INT8 (4x smaller, near-exact scores);
+# large ones add an HNSW graph over the INT8 vectors so a query visits a
+# few hundred vectors instead of all of them; only very large corpora use
+# a trained IVF/PQ index, trading recall for 16-32 byte codes.
+SQ8_INDEX_MIN_VECTORS = 1_000
+FLAT_INDEX_MAX_VECTORS = 10_000
+HNSW_INDEX_MAX_VECTORS = 1_000_000
+HNSW_INDEX_FACTORY = "HNSW32,SQ8"
+# Build-time candidate list; query-time breadth is FAISS_EF_SEARCH
+HNSW_EF_CONSTRUCTION = 200
+
+# The IVF/PQ tier scales with the corpus: more inverted lists keep each
+# probe's scan short, and past this size PQ codes double to 32 bytes to
+# hold recall as neighbours crowd together.
+PQ32_INDEX_MIN_VECTORS = 100_000
+MIN_IVF_LISTS = 256
+# FAISS warns below ~39 training points per list
+IVF_TRAINING_POINTS_PER_LIST = 39
+
+# With FAISS_MMAP=1, index files at least this large are memory-mapped
+# read-only instead of read into RAM (pages load on demand and are shared
+# across worker processes). Smaller files are cheaper to read outright.
+MMAP_MIN_BYTES = 64 * 1024 * 1024
+
+PINECONE_UPSERT_WORKERS = 16
+
+
+def default_index_factory(count: int) -> str:
+    """
+    FAISS factory string for the IVF/PQ tier, sized for `count` vectors.
+
+    Uses ~4*sqrt(N) inverted lists (a power of two, at least 256, capped by
+    the training set size) and 16-byte PQ codes, or 32-byte codes from
+    PQ32_INDEX_MIN_VECTORS up.
+    """
+    nlist = MIN_IVF_LISTS
+    while (nlist * 2 <= 4 * math.sqrt(count)
+           and nlist * 2 * IVF_TRAINING_POINTS_PER_LIST <= count):
+        nlist *= 2
+    pq = 32 if count >= PQ32_INDEX_MIN_VECTORS else 16
+    return f"OPQ{pq}_64,IVF{nlist}_HNSW32,PQ{pq}"
+
 
 class VectorStore(ABC):
     """Abstract base class for vector stores."""
@@ -44,6 +92,28 @@ class VectorStore(ABC):
         """
         ...
 
+    def search_grouped(
+        self,
+        query_embedding: np.ndarray,
+        group_key: str,
+        group_values: list[str],
+        top_k: int = 3,
+        filters: dict | None = None,
+    ) -> dict[str, list[dict]]:
+        """
+        Run one query and return the top_k hits for each value of a metadata key.
+
+        Equivalent to calling search() once per value with
+        {group_key: value} added to the filters. Backends that can
+        answer all groups from a single index query override this.
+
+        Returns {value: [hits]} in group_values order.
+        """
+        return {
+            value: self.search(query_embedding, top_k, {**(filters or {}), group_key: value})
+            for value in group_values
+        }
+
     @abstractmethod
     def delete(self, ids: list[str]) -> int:
         """
@@ -72,11 +142,11 @@ class FaissVectorStore(VectorStore):
     ) -> int:
         import faiss
 
-        embeddings = embeddings.copy().astype(np.float32)
+        # One float32 copy (normalize_L2 works in place; the caller's array is left alone)
+        embeddings = np.array(embeddings, dtype=np.float32)
         faiss.normalize_L2(embeddings)
 
-        dimension = embeddings.shape[1]
-        self._index = faiss.IndexFlatIP(dimension)
+        self._index = self._build_index(embeddings)
         self._index.add(embeddings)
 
         self._ids = list(ids)
@@ -84,6 +154,59 @@ class FaissVectorStore(VectorStore):
 
         return len(ids)
 
+    @staticmethod
+    def _build_index(embeddings: np.ndarray):
+        """
+        Create a search index sized for the corpus.
+
+        Tiny corpora get an exact IndexFlatIP and mid-sized ones an 8-bit
+        IndexScalarQuantizer. Larger ones use the FAISS_INDEX_FACTORY string
+        (default HNSW_INDEX_FACTORY, or default_index_factory() from
+        HNSW_INDEX_MAX_VECTORS up), trained once over the corpus.
+        """
+        import faiss
+
+        count, dimension = embeddings.shape
+        if count < SQ8_INDEX_MIN_VECTORS:
+            return faiss.IndexFlatIP(dimension)
+        if count < FLAT_INDEX_MAX_VECTORS:
+            index = faiss.IndexScalarQuantizer(
+                dimension, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT
+            )
+            index.train(embeddings)
+            return index
+
+        factory = os.environ.get("FAISS_INDEX_FACTORY") or (
+            HNSW_INDEX_FACTORY if count < HNSW_INDEX_MAX_VECTORS else default_index_factory(count)
+        )
+        logger.info("Training %s index over %d vectors", factory, count)
+        index = faiss.index_factory(dimension, factory, faiss.METRIC_INNER_PRODUCT)
+        hnsw = getattr(faiss.downcast_index(index), "hnsw", None)
+        if hnsw is not None:
+            hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        index.train(embeddings)
+        FaissVectorStore._configure_search(index)
+        return index
+
+    @staticmethod
+    def _configure_search(index) -> None:
+        """
+        Apply query-time parameters: efSearch (FAISS_EF_SEARCH) to HNSW
+        indexes and nprobe (FAISS_NPROBE) to IVF indexes.
+        """
+        import faiss
+
+        hnsw = getattr(faiss.downcast_index(index), "hnsw", None)
+        if hnsw is not None:
+            hnsw.efSearch = int(os.environ.get("FAISS_EF_SEARCH", "64"))
+            return
+
+        try:
+            ivf = faiss.extract_index_ivf(index)
+        except RuntimeError:
+            return  # not an IVF index
+        ivf.nprobe = int(os.environ.get("FAISS_NPROBE", "16"))
+
     def search(
         self,
         query_embedding: np.ndarray,
@@ -98,8 +221,9 @@ class FaissVectorStore(VectorStore):
 
         scores, indices = self._index.search(query_embedding, fetch_k)
 
+        # Plain Python lists: iterating numpy rows boxes every element
         results = []
-        for score, idx in zip(scores[0], indices[0]):
+        for score, idx in zip(scores[0].tolist(), indices[0].tolist()):
             if idx == -1:
                 continue
             if idx >= len(self._ids):
@@ -117,7 +241,7 @@ class FaissVectorStore(VectorStore):
 
             results.append({
                 "id": vec_id,
-                "score": float(score),
+                "score": score,
                 "metadata": meta,
             })
 
@@ -126,6 +250,52 @@ class FaissVectorStore(VectorStore):
 
         return results
 
+    def search_grouped(
+        self,
+        query_embedding: np.ndarray,
+        group_key: str,
+        group_values: list[str],
+        top_k: int = 3,
+        filters: dict | None = None,
+    ) -> dict[str, list[dict]]:
+        grouped = {value: [] for value in group_values}
+        if self._index is None or not grouped:
+            return grouped
+
+        # One over-fetched query covers every group. Each group's window is
+        # at least as wide as the one search() would scan for it alone, so
+        # no group gets fewer hits than a per-group search would return.
+        fetch_k = top_k * 5 * len(grouped)
+        scores, indices = self._index.search(query_embedding, fetch_k)
+
+        remaining = len(grouped)
+        for score, idx in zip(scores[0].tolist(), indices[0].tolist()):
+            if idx == -1 or idx >= len(self._ids):
+                continue
+
+            vec_id = self._ids[idx]
+            if vec_id in self._deleted_ids:
+                continue
+            meta = self._metadata.get(vec_id, {})
+
+            hits = grouped.get(meta.get(group_key))
+            if hits is None or len(hits) >= top_k:
+                continue
+            if filters and not all(meta.get(k) == v for k, v in filters.items()):
+                continue
+
+            hits.append({
+                "id": vec_id,
+                "score": score,
+                "metadata": meta,
+            })
+            if len(hits) == top_k:
+                remaining -= 1
+                if not remaining:
+                    break
+
+        return grouped
+
     def delete(self, ids: list[str]) -> int:
         deleted = 0
         for vec_id in ids:
@@ -194,13 +364,14 @@ class FaissVectorStore(VectorStore):
             return False
 
         try:
-            self._index = faiss.read_index(index_file)
+            self._index = self._read_index(index_file)
+            self._configure_search(self._index)
 
             with open(meta_file) as f:
                 meta = json.load(f)
 
             if not all(k in meta for k in ("ids", "metadata", "deleted_ids")):
-                logging.getLogger(__name__).warning("Corrupted meta.json at %s", meta_file)
+                logger.warning("Corrupted meta.json at %s", meta_file)
                 return False
 
             self._ids = meta["ids"]
@@ -208,11 +379,22 @@ class FaissVectorStore(VectorStore):
             self._deleted_ids = set(meta["deleted_ids"])
             self._content_hash = meta.get("content_hash")
         except (json.JSONDecodeError, KeyError, Exception) as e:
-            logging.getLogger(__name__).warning("Failed to load index from %s: %s", path, e)
+            logger.warning("Failed to load index from %s: %s", path, e)
             return False
 
         return True
 
+    @staticmethod
+    def _read_index(index_file: str):
+        """Read an index file, memory-mapping large ones when FAISS_MMAP=1."""
+        import faiss
+
+        use_mmap = os.environ.get("FAISS_MMAP", "").lower() in ("1", "true", "yes")
+        if use_mmap and os.path.getsize(index_file) >= MMAP_MIN_BYTES:
+            logger.info("Memory-mapping FAISS index %s", index_file)
+            return faiss.read_index(index_file, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+        return faiss.read_index(index_file)
+
     def get_content_hash(self) -> str | None:
         """Return the content hash from the last load(), or None."""
         return getattr(self, "_content_hash", None)
@@ -253,31 +435,30 @@ class PineconeVectorStore(VectorStore):
         embeddings: np.ndarray,
         metadata: list[dict],
     ) -> int:
+        # Pinecone caps a request at 100 vectors / 2MB; send batches concurrently
         batch_size = 100
-        total = 0
-
-        for i in range(0, len(ids), batch_size):
-            batch_ids = ids[i : i + batch_size]
-            batch_embeddings = embeddings[i : i + batch_size]
-            batch_metadata = metadata[i : i + batch_size]
+        # Strip None values from metadata (Pinecone rejects them)
+        records = [
+            (vec_id, emb.tolist(), {k: v for k, v in meta.items() if v is not None})
+            for vec_id, emb, meta in zip(ids, embeddings, metadata)
+        ]
+        batches = [records[i:i + batch_size] for i in range(0, len(records), batch_size)]
 
-            vectors = []
-            for vec_id, emb, meta in zip(
-                batch_ids, batch_embeddings, batch_metadata
+        total = 0
+        with ThreadPoolExecutor(max_workers=PINECONE_UPSERT_WORKERS) as executor:
+            for done, batch in enumerate(
+                executor.map(self._upsert_batch, batches), start=1
             ):
-                # Strip None values from metadata (Pinecone rejects them)
-                clean_meta = {k: v for k, v in meta.items() if v is not None}
-                vectors.append({
-                    "id": vec_id,
-                    "values": emb.tolist(),
-                    "metadata": clean_meta,
-                })
-
-            self._index.upsert(vectors=vectors)
-            total += len(vectors)
+                total += len(batch)
+                logger.info("Pinecone upsert: batch %d/%d (%d vectors)",
+                            done, len(batches), total)
 
         return total
 
+    def _upsert_batch(self, batch: list[tuple]) -> list[tuple]:
+        self._index.upsert(vectors=batch)
+        return batch
+
     def search(
         self,
         query_embedding: np.ndarray,
@@ -46,6 +46,19 @@ class MockProvider:
         })
 
 
+@pytest.fixture(autouse=True)
+def _clear_execution_gate():
+    """Duplicate-request results and cached provider state must not leak between tests."""
+    from src import classification_cache, execution_gate, generation
+    execution_gate.clear()
+    classification_cache.clear()
+    generation._JSON_SCHEMA_UNSUPPORTED.clear()
+    yield
+    execution_gate.clear()
+    classification_cache.clear()
+    generation._JSON_SCHEMA_UNSUPPORTED.clear()
+
+
 @pytest.fixture
 def mock_provider():
     return MockProvider()
@@ -56,6 +56,13 @@ class TestHealth:
         assert isinstance(strategies, list)
         assert len(strategies) > 0
 
+    def test_request_is_logged_with_timing(self, client, caplog):
+        with caplog.at_level("INFO", logger="src.api"):
+            client.get("/health")
+        assert any(
+            r.getMessage().startswith("GET /health status=200 time=") for r in caplog.records
+        )
+
     def test_health_requires_no_auth(self, client, monkeypatch):
         monkeypatch.setenv("API_KEY", "secret-key")
         # No X-API-Key header — should still succeed
@@ -97,21 +104,28 @@ class TestAnalyze:
         resp = client.post("/analyze", json={})
         assert resp.status_code == 422
 
-    def test_unknown_strategy_returns_400(self, client):
+    def test_unknown_strategy_returns_422(self, client):
         resp = client.post("/analyze", json={
             "clause_text": "Employee agrees not to compete for 2 years worldwide.",
             "strategy": "nonexistent_strategy"
         })
-        assert resp.status_code == 400
-        assert "nonexistent_strategy" in resp.json()["detail"]
+        assert resp.status_code == 422
+        assert resp.json()["detail"][0]["input"] == "nonexistent_strategy"
 
     def test_unknown_strategy_message_includes_available(self, client):
         resp = client.post("/analyze", json={
             "clause_text": "Employee agrees not to compete for 2 years worldwide.",
             "strategy": "bad_strategy"
         })
-        detail = resp.json()["detail"]
-        assert "Available" in detail or "available" in detail
+        msg = resp.json()["detail"][0]["msg"]
+        assert all(name in msg for name in ("basic", "structured", "few_shot"))
+
+    def test_knowledge_base_qa_not_served_by_analyze(self, client):
+        resp = client.post("/analyze", json={
+            "clause_text": "Employee agrees not to compete for 2 years worldwide.",
+            "strategy": "knowledge_base_qa"
+        })
+        assert resp.status_code == 422
 
     def test_review_status_is_pending_review(self, client):
         resp = client.post("/analyze", json={
@@ -160,6 +174,50 @@ class TestAnalyze:
         assert resp.status_code == 422
 
 
+class TestAnalyzeStream:
+    @staticmethod
+    def _events(resp) -> list[dict]:
+        import json
+        return [
+            json.loads(line[len("data: "):])
+            for line in resp.text.splitlines()
+            if line.startswith("data: ")
+        ]
+
+    def test_streams_sources_tokens_then_done(self, client):
+        resp = client.post("/analyze/stream", json={
+            "clause_text": "Employee agrees not to compete for 2 years worldwide."
+        })
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+
+        events = self._events(resp)
+        types = [e["type"] for e in events]
+        assert types[0] == "source"
+        assert "token" in types
+        assert types[-1] == "done"
+        assert types.index("token") > max(i for i, t in enumerate(types) if t == "source")
+
+        done = events[-1]
+        assert done["review_status"] == "pending_review"
+        assert "disclaimer" in done
+        assert isinstance(done["analysis"], dict)
+
+    def test_unknown_strategy_returns_422(self, client):
+        resp = client.post("/analyze/stream", json={
+            "clause_text": "Employee agrees not to compete for 2 years worldwide.",
+            "strategy": "knowledge_base_qa",
+        })
+        assert resp.status_code == 422
+
+    def test_llm_failure_emits_error_event(self, client):
+        with patch("src.rag_pipeline.generate_analysis_stream", side_effect=RuntimeError("boom")):
+            resp = client.post("/analyze/stream", json={
+                "clause_text": "Employee agrees not to compete for 2 years worldwide."
+            })
+        assert self._events(resp)[-1]["type"] == "error"
+
+
 # --- Search endpoint ---
 
 class TestSearch:
@@ -296,3 +354,50 @@ class TestErrorHandling:
             assert resp.status_code == 500
         finally:
             app.dependency_overrides.clear()
+
+
+# --- Startup ---
+
+class TestLifespan:
+    def test_database_loaded_once_at_startup(self, loaded_faiss_db):
+        from src.api import app
+
+        with patch("src.api.load_clause_database", return_value=loaded_faiss_db) as mock_load:
+            with TestClient(app) as startup_client:
+                first = startup_client.get("/health")
+                second = startup_client.get("/health")
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        mock_load.assert_called_once()
+
+    def test_loaded_database_kept_on_app_state(self, loaded_faiss_db):
+        from src.api import app
+
+        with patch("src.api.load_clause_database", return_value=loaded_faiss_db):
+            with TestClient(app) as startup_client:
+                startup_client.get("/health")
+                assert app.state.db is loaded_faiss_db
+
+    def test_failed_load_surfaces_as_500(self):
+        from src.api import app
+
+        with patch("src.api.load_clause_database", side_effect=RuntimeError("index missing")):
+            with TestClient(app, raise_server_exceptions=False) as startup_client:
+                resp = startup_client.get("/health")
+
+        assert resp.status_code == 500
+        assert app.state.db is None
+
+    def test_thread_limit_configured_at_startup(self, loaded_faiss_db, monkeypatch):
+        import anyio.to_thread
+        from src.api import app
+
+        monkeypatch.setenv("API_THREAD_LIMIT", "96")
+        with patch("src.api.load_clause_database", return_value=loaded_faiss_db):
+            with TestClient(app) as startup_client:
+                limit = startup_client.portal.call(
+                    lambda: anyio.to_thread.current_default_thread_limiter().total_tokens
+                )
+
+        assert limit == 96
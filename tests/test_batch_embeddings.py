@@ -37,11 +37,9 @@ def test_large_batch_multiple_calls():
     result = get_embeddings(texts, provider, batch_size=100)
 
     assert provider.embed.call_count == 3
-    # Verify batch sizes: 100, 100, 50
+    # Verify batch sizes: 100, 100, 50 (batches run concurrently, in any order)
     call_args = provider.embed.call_args_list
-    assert len(call_args[0][0][0]) == 100
-    assert len(call_args[1][0][0]) == 100
-    assert len(call_args[2][0][0]) == 50
+    assert sorted(len(c[0][0]) for c in call_args) == [50, 100, 100]
 
 
 def test_result_shape_matches_input():
@@ -92,11 +90,10 @@ def test_batched_output_is_concatenated():
     provider_single.embed.return_value = fixed_embeddings
     result_single = get_embeddings(texts, provider_single, batch_size=100)
 
-    # Batched: returns 2 chunks of 5
+    # Batched: 2 chunks of 5, possibly embedded concurrently
     provider_batched = MagicMock()
-    provider_batched.embed.side_effect = [
-        fixed_embeddings[:5],
-        fixed_embeddings[5:],
+    provider_batched.embed.side_effect = lambda batch: fixed_embeddings[
+        [texts.index(t) for t in batch]
     ]
     result_batched = get_embeddings(texts, provider_batched, batch_size=5)
 
@@ -112,3 +109,78 @@ def test_batch_size_of_one():
 
     assert provider.embed.call_count == 4
     assert result.shape == (4, 4)
+
+
+def test_embed_batched_preserves_order():
+    """embed_batched() returns rows in input order across concurrent batches."""
+    from src.embeddings import embed_batched
+
+    provider = MagicMock()
+    provider.embed.side_effect = lambda texts: np.array(
+        [[float(t.split()[1])] for t in texts], dtype=np.float32
+    )
+    texts = [f"text {i}" for i in range(25)]
+
+    result = embed_batched(texts, provider, batch_size=4, max_workers=3)
+
+    assert provider.embed.call_count == 7
+    np.testing.assert_array_equal(result[:, 0], np.arange(25, dtype=np.float32))
+
+
+def test_embed_batched_single_batch_one_call():
+    from src.embeddings import embed_batched
+
+    provider = _make_provider()
+    texts = [f"text {i}" for i in range(5)]
+
+    result = embed_batched(texts, provider, batch_size=96)
+
+    provider.embed.assert_called_once_with(texts)
+    assert result.shape == (5, 8)
+
+
+def test_concurrency_defaults_to_embed_max_workers(monkeypatch):
+    """At most EMBED_MAX_WORKERS batches are in flight when max_workers isn't given."""
+    import threading
+    import time
+
+    monkeypatch.setattr("src.embeddings.EMBED_MAX_WORKERS", 2)
+    lock = threading.Lock()
+    in_flight = peak = 0
+
+    def embed(texts):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight -= 1
+        return np.zeros((len(texts), 4), dtype=np.float32)
+
+    provider = MagicMock()
+    provider.embed.side_effect = embed
+    get_embeddings([f"text {i}" for i in range(12)], provider, batch_size=2)
+
+    assert peak == 2
+
+
+def test_out_of_order_batches_land_at_their_offsets():
+    """A batch finishing before earlier ones is written to its own rows."""
+    import threading
+
+    first_done = threading.Event()
+
+    def embed(texts):
+        if texts[0] == "text 0":
+            # Hold the first batch until the last one has completed
+            first_done.wait(timeout=5)
+        elif texts[0] == "text 4":
+            first_done.set()
+        return np.array([[float(t.split()[1])] for t in texts], dtype=np.float32)
+
+    provider = MagicMock()
+    provider.embed.side_effect = embed
+    result = get_embeddings([f"text {i}" for i in range(6)], provider, batch_size=2, max_workers=3)
+
+    np.testing.assert_array_equal(result[:, 0], np.arange(6, dtype=np.float32))
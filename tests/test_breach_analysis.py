@@ -86,6 +86,41 @@ class TestRetrieveApplicableStatutes:
         assert isinstance(results["UK"], list)
 
 
+    def test_embeds_query_once_for_all_states(self, loaded_multi_source_db, monkeypatch):
+        """The breach query is the same for every state, so it's embedded once."""
+        provider = loaded_multi_source_db["provider"]
+        calls = []
+        real_embed = provider.embed
+        monkeypatch.setattr(provider, "embed", lambda texts: calls.append(texts) or real_embed(texts))
+
+        params = {
+            "data_types_compromised": ["ssn"],
+            "affected_states": ["UK", "CA", "NY"],
+        }
+        results = retrieve_applicable_statutes(params, loaded_multi_source_db)
+        assert set(results) == {"UK", "CA", "NY"}
+        assert len(calls) == 1
+
+    def test_all_states_answered_by_one_store_search(self, loaded_multi_source_db, monkeypatch):
+        """States are deduplicated case-insensitively and served by a single grouped search."""
+        store = loaded_multi_source_db["store"]
+        calls = []
+        real_search_grouped = store.search_grouped
+
+        def spy(query_embedding, group_key, group_values, top_k=3, filters=None):
+            calls.append(group_values)
+            return real_search_grouped(query_embedding, group_key, group_values, top_k, filters)
+
+        monkeypatch.setattr(store, "search_grouped", spy)
+        params = {
+            "data_types_compromised": ["ssn"],
+            "affected_states": ["uk", "UK", "CA"],
+        }
+        results = retrieve_applicable_statutes(params, loaded_multi_source_db)
+        assert list(results) == ["UK", "CA"]
+        assert calls == [["UK", "CA"]]
+
+
 # --- analyze_breach_for_state ---
 
 class TestAnalyzeBreachForState:
@@ -118,6 +153,20 @@ class TestAnalyzeBreachForState:
         result = analyze_breach_for_state(params, "CA", statute_results, mock_provider)
         assert isinstance(result, dict)
 
+    def test_prompt_uses_compact_params(self, mock_provider, monkeypatch):
+        """Breach parameters are sent without indentation whitespace."""
+        prompts = []
+        real_chat = mock_provider.chat
+
+        def spy(messages, **kwargs):
+            prompts.append(messages[1]["content"])
+            return real_chat(messages, **kwargs)
+
+        monkeypatch.setattr(mock_provider, "chat", spy)
+        params = {"data_types_compromised": ["ssn"], "affected_states": ["CA"]}
+        analyze_breach_for_state(params, "CA", [], mock_provider)
+        assert '{"data_types_compromised":["ssn"],"affected_states":["CA"]}' in prompts[0]
+
 
 # --- generate_breach_report ---
 
@@ -227,6 +276,26 @@ class TestBuildSummary:
         summary = _build_summary(params, analyses)
         assert "30 days" in summary["earliest_deadline"]
 
+    def test_earliest_deadline_compares_durations_not_text_length(self):
+        """72 hours is earlier than 30 days even though the string is longer."""
+        analyses = [
+            {"jurisdiction": "FL", "deadline": "30 days"},
+            {"jurisdiction": "NY", "deadline": "Within 72 hours of discovery"},
+            {"jurisdiction": "CO", "deadline": "Within 45 days"},
+        ]
+        summary = _build_summary({"data_types_compromised": ["ssn"]}, analyses)
+        assert summary["earliest_deadline"] == "Within 72 hours of discovery"
+        assert summary["earliest_deadline_state"] == "NY"
+
+    def test_business_days_parsed(self):
+        analyses = [
+            {"jurisdiction": "TX", "deadline": "60 days"},
+            {"jurisdiction": "XX", "deadline": "10 business days after discovery"},
+            {"jurisdiction": "ZZ", "deadline": None},
+        ]
+        summary = _build_summary({"data_types_compromised": ["ssn"]}, analyses)
+        assert summary["earliest_deadline_state"] == "XX"
+
     def test_no_deadline_fallback(self):
         """_build_summary falls back when no deadline has day/hour."""
         analyses = [
@@ -235,3 +304,26 @@ class TestBuildSummary:
         params = {"data_types_compromised": ["ssn"]}
         summary = _build_summary(params, analyses)
         assert summary["earliest_deadline"] == "See individual state analyses"
+
+    def test_accepts_breach_request_model(self, loaded_multi_source_db):
+        """A validated BreachRequest is accepted directly and echoed as a dict."""
+        from src.api_models import BreachRequest
+
+        req = BreachRequest(data_types_compromised=["ssn"], affected_states=["UK"])
+        report = generate_breach_report(req, loaded_multi_source_db)
+        assert report["breach_params"]["data_types_compromised"] == ["ssn"]
+        assert report["summary"]["encryption_status"] == "unknown"
+
+    def test_failed_state_is_isolated(self, loaded_multi_source_db, monkeypatch):
+        """One state's LLM failure becomes an error entry; the report still completes."""
+        def flaky(breach_params, state, statute_results, provider, params_json=None):
+            raise RuntimeError("LLM unavailable")
+
+        monkeypatch.setattr("src.breach_analysis.analyze_breach_for_state", flaky)
+        params = {
+            "data_types_compromised": ["ssn"],
+            "affected_states": ["UK"],
+        }
+        report = generate_breach_report(params, loaded_multi_source_db)
+        assert report["state_analyses"][0]["jurisdiction"] == "UK"
+        assert "error" in report["state_analyses"][0]
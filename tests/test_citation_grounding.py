@@ -14,6 +14,12 @@ from src.generation import (
 )
 
 
+CONFIDENTIALITY_CLAUSE = (
+    "The Receiving Party shall keep all Confidential Information "
+    "strictly confidential for three years."
+)
+
+
 class TestFormatRetrievalResultsIncludesIDs:
     def test_source_id_in_output(self):
         results = [
@@ -83,12 +89,12 @@ class TestFormatRetrievalResultsIncludesIDs:
 
 class TestPipelineOutputHasSources:
     def test_sources_key_present(self, loaded_faiss_db):
-        result = analyze_clause("test confidential clause", loaded_faiss_db)
+        result = analyze_clause(CONFIDENTIALITY_CLAUSE, loaded_faiss_db)
         assert "sources" in result
         assert isinstance(result["sources"], list)
 
     def test_sources_have_required_fields(self, loaded_faiss_db):
-        result = analyze_clause("test confidential clause", loaded_faiss_db)
+        result = analyze_clause(CONFIDENTIALITY_CLAUSE, loaded_faiss_db)
         for src in result["sources"]:
             assert "id" in src
             assert "title" in src
@@ -107,29 +113,29 @@ class TestPipelineOutputHasSources:
                 },
             ]
             mock_gen.return_value = '{"risk_level": "low"}'
-            result = analyze_clause("test confidential clause", loaded_faiss_db)
+            result = analyze_clause(CONFIDENTIALITY_CLAUSE, loaded_faiss_db)
             for src in result["sources"]:
                 assert src["score"] > 0
 
 
 class TestPipelineOutputHasDraftFraming:
     def test_review_status_is_pending_review(self, loaded_faiss_db):
-        result = analyze_clause("test clause", loaded_faiss_db)
+        result = analyze_clause(CONFIDENTIALITY_CLAUSE, loaded_faiss_db)
         assert result["review_status"] == "pending_review"
 
     def test_disclaimer_contains_draft(self, loaded_faiss_db):
-        result = analyze_clause("test clause", loaded_faiss_db)
+        result = analyze_clause(CONFIDENTIALITY_CLAUSE, loaded_faiss_db)
         assert "DRAFT" in result["disclaimer"]
 
     def test_disclaimer_mentions_attorney(self, loaded_faiss_db):
-        result = analyze_clause("test clause", loaded_faiss_db)
+        result = analyze_clause(CONFIDENTIALITY_CLAUSE, loaded_faiss_db)
         assert "attorney" in result["disclaimer"].lower() or "Attorney" in result["disclaimer"]
 
 
 class TestPipelineAnalysisIsParsed:
     def test_analysis_is_dict_when_json_returned(self, loaded_faiss_db):
         # MockProvider.chat() returns valid JSON, so analysis should be a dict
-        result = analyze_clause("test clause", loaded_faiss_db)
+        result = analyze_clause(CONFIDENTIALITY_CLAUSE, loaded_faiss_db)
         assert isinstance(result["analysis"], dict)
 
     def test_analysis_parse_failure_returns_raw_response(self, loaded_faiss_db, monkeypatch):
@@ -138,7 +144,7 @@ class TestPipelineAnalysisIsParsed:
             loaded_faiss_db["provider"], "chat",
             lambda *a, **kw: non_json_response,
         )
-        result = analyze_clause("test clause", loaded_faiss_db)
+        result = analyze_clause(CONFIDENTIALITY_CLAUSE, loaded_faiss_db)
         assert isinstance(result["analysis"], dict)
         assert result["analysis"].get("parse_error") is True
         assert "raw_response" in result["analysis"]
@@ -168,7 +174,7 @@ class TestSourcesMatchRetrievedClauses:
             ]
             mock_gen.return_value = '{"risk_level": "low"}'
 
-            result = analyze_clause("test clause", loaded_faiss_db)
+            result = analyze_clause(CONFIDENTIALITY_CLAUSE, loaded_faiss_db)
 
             source_ids = [s["id"] for s in result["sources"]]
             assert "nda-001" in source_ids
@@ -178,23 +184,23 @@ class TestSourcesMatchRetrievedClauses:
 
 class TestPromptBuildersIncludeCitationInstructions:
     def test_basic_prompt_has_citation_instruction(self):
-        messages = build_basic_prompt("test clause", "context")
+        messages = build_basic_prompt(CONFIDENTIALITY_CLAUSE, "context")
         system_content = messages[0]["content"].lower()
         assert "source" in system_content or "cite" in system_content
 
     def test_structured_prompt_has_citation_instruction(self):
-        messages = build_structured_prompt("test clause", "context")
+        messages = build_structured_prompt(CONFIDENTIALITY_CLAUSE, "context")
         system_content = messages[0]["content"].lower()
         assert "source" in system_content or "cite" in system_content
 
     def test_few_shot_prompt_has_citation_instruction(self):
-        messages = build_few_shot_prompt("test clause", "context")
+        messages = build_few_shot_prompt(CONFIDENTIALITY_CLAUSE, "context")
         # System message is first
         system_content = messages[0]["content"].lower()
         assert "source" in system_content or "cite" in system_content
 
     def test_few_shot_example_has_inline_citations(self):
-        messages = build_few_shot_prompt("test clause", "context")
+        messages = build_few_shot_prompt(CONFIDENTIALITY_CLAUSE, "context")
         # The assistant example message should have inline citations
         assistant_messages = [m for m in messages if m["role"] == "assistant"]
         assert len(assistant_messages) > 0
@@ -202,7 +208,7 @@ class TestPromptBuildersIncludeCitationInstructions:
         assert "[emp-001]" in example_content or "[emp-002]" in example_content
 
     def test_few_shot_example_has_sources_used_field(self):
-        messages = build_few_shot_prompt("test clause", "context")
+        messages = build_few_shot_prompt(CONFIDENTIALITY_CLAUSE, "context")
         assistant_messages = [m for m in messages if m["role"] == "assistant"]
         assert len(assistant_messages) > 0
         parsed = json.loads(assistant_messages[0]["content"])
@@ -211,7 +217,7 @@ class TestPromptBuildersIncludeCitationInstructions:
         assert len(parsed["sources_used"]) > 0
 
     def test_few_shot_example_has_confidence_fields(self):
-        messages = build_few_shot_prompt("test clause", "context")
+        messages = build_few_shot_prompt(CONFIDENTIALITY_CLAUSE, "context")
         assistant_messages = [m for m in messages if m["role"] == "assistant"]
         parsed = json.loads(assistant_messages[0]["content"])
         assert "confidence" in parsed
@@ -0,0 +1,129 @@
+"""Tests for src/classification_cache.py"""
+
+import json
+
+import numpy as np
+
+from src import classification_cache
+from src.contract_chunker import (
+    _PROMPT_DIGEST, classify_clause_type, classify_clauses_batch, extract_clauses,
+)
+
+
+class TestClassificationCache:
+    def test_miss_then_hit(self):
+        assert classification_cache.get("Vendor shall indemnify customer.", "m") is None
+        classification_cache.put("Vendor shall indemnify customer.", "m",
+                                 {"clause_type": "indemnification", "confidence": "high"})
+        assert classification_cache.get("Vendor shall indemnify customer.", "m") == {
+            "clause_type": "indemnification", "confidence": "high",
+        }
+
+    def test_case_and_whitespace_insensitive(self):
+        classification_cache.put("Vendor shall  indemnify\ncustomer.", "m",
+                                 {"clause_type": "indemnification", "confidence": "high"})
+        assert classification_cache.get("VENDOR shall indemnify customer.", "m") is not None
+
+    def test_keyed_by_model(self):
+        classification_cache.put("Vendor shall indemnify customer.", "model-a",
+                                 {"clause_type": "indemnification", "confidence": "high"})
+        assert classification_cache.get("Vendor shall indemnify customer.", "model-b") is None
+
+    def test_keyed_by_prompt(self):
+        classification_cache.put("Vendor shall indemnify customer.", "m",
+                                 {"clause_type": "indemnification", "confidence": "high"}, "prompt-v1")
+        assert classification_cache.get("Vendor shall indemnify customer.", "m", "prompt-v2") is None
+
+    def test_disabled_by_env(self, monkeypatch):
+        monkeypatch.setenv("CLASSIFY_CACHE_ENABLED", "false")
+        classification_cache.put("Vendor shall indemnify customer.", "m",
+                                 {"clause_type": "indemnification", "confidence": "high"})
+        assert classification_cache.get("Vendor shall indemnify customer.", "m") is None
+
+    def test_sqlite_persists_across_clear(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("CLASSIFY_CACHE_DB", str(tmp_path / "cache.sqlite3"))
+        classification_cache.put("Vendor shall indemnify customer.", "m",
+                                 {"clause_type": "indemnification", "confidence": "high"})
+        classification_cache.clear()
+        assert classification_cache.get("Vendor shall indemnify customer.", "m") == {
+            "clause_type": "indemnification", "confidence": "high",
+        }
+
+    def test_sqlite_uses_wal(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("CLASSIFY_CACHE_DB", str(tmp_path / "cache.sqlite3"))
+        classification_cache.put("Vendor shall indemnify customer.", "m",
+                                 {"clause_type": "indemnification", "confidence": "high"})
+        assert (tmp_path / "cache.sqlite3-wal").exists()
+
+
+class TestClassifierUsesCache:
+    def test_repeat_clause_skips_llm(self, mock_provider, monkeypatch):
+        calls = []
+
+        def mock_chat(messages, model=None, temperature=0.0, max_tokens=100):
+            calls.append(messages)
+            return json.dumps({"clause_type": "governing_law", "confidence": "high"})
+
+        monkeypatch.setattr(mock_provider, "chat", mock_chat)
+        first = classify_clause_type("This Agreement is governed by the laws of Delaware.", mock_provider)
+        second = classify_clause_type("This Agreement is governed by the laws of Delaware.", mock_provider)
+        assert first == second
+        assert len(calls) == 1
+
+    def test_failures_are_not_cached(self, mock_provider, monkeypatch):
+        monkeypatch.setattr(mock_provider, "chat", lambda *a, **kw: "not json")
+        classify_clause_type("This Agreement is governed by the laws of Delaware.", mock_provider)
+        assert classification_cache.get(
+            "This Agreement is governed by the laws of Delaware.", mock_provider.chat_model, _PROMPT_DIGEST
+        ) is None
+
+    def test_batch_sends_only_uncached_clauses(self, mock_provider, monkeypatch):
+        classification_cache.put("Notices must be in writing.", mock_provider.chat_model,
+                                 {"clause_type": "notices", "confidence": "high"}, _PROMPT_DIGEST)
+        prompts = []
+
+        def mock_chat(messages, model=None, temperature=0.0, max_tokens=100):
+            prompts.append(messages[1]["content"])
+            return json.dumps({"classifications": [
+                {"index": 0, "clause_type": "termination", "confidence": "high"},
+                {"index": 1, "clause_type": "indemnification", "confidence": "high"},
+            ]})
+
+        monkeypatch.setattr(mock_provider, "chat", mock_chat)
+        results = classify_clauses_batch(
+            ["Either party may terminate.", "Notices must be in writing.", "Vendor shall indemnify."],
+            mock_provider,
+        )
+        assert [r["clause_type"] for r in results] == ["termination", "notices", "indemnification"]
+        assert len(prompts) == 1
+        assert "Notices must be in writing." not in prompts[0]
+
+    def test_near_duplicate_served_by_semantic_cache(self, mock_provider, monkeypatch):
+        monkeypatch.setenv("CLASSIFY_SEMANTIC_CACHE", "1")
+        calls = []
+
+        def mock_chat(messages, model=None, temperature=0.0, max_tokens=100):
+            calls.append(messages)
+            return json.dumps({"clause_type": "governing_law", "confidence": "high"})
+
+        # Both wordings embed to the same vector
+        monkeypatch.setattr(mock_provider, "chat", mock_chat)
+        monkeypatch.setattr(mock_provider, "embed", lambda texts: np.ones((len(texts), 8), dtype="float32"))
+        monkeypatch.setattr("src.contract_chunker.chunk_contract", lambda t: [
+            {"text": t, "position": 0, "heading": None}
+        ])
+        first = extract_clauses("Acme's agreement is governed by Delaware law.", mock_provider)
+        second = extract_clauses("Globex's agreement is governed by Delaware law.", mock_provider)
+        assert len(calls) == 1
+        assert second[0]["clause_type"] == first[0]["clause_type"] == "governing_law"
+
+    def test_semantic_cache_off_by_default(self, mock_provider, monkeypatch):
+        embeds = []
+        monkeypatch.setattr(mock_provider, "embed", lambda texts: embeds.append(texts))
+        monkeypatch.setattr(mock_provider, "chat", lambda *a, **kw: json.dumps(
+            {"clause_type": "governing_law", "confidence": "high"}))
+        monkeypatch.setattr("src.contract_chunker.chunk_contract", lambda t: [
+            {"text": t, "position": 0, "heading": None}
+        ])
+        extract_clauses("This agreement is governed by Delaware law.", mock_provider)
+        assert embeds == []
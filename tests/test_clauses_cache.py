@@ -0,0 +1,28 @@
+"""Tests for src/clauses_cache.py"""
+
+import json
+import os
+
+from src.clauses_cache import load_clauses
+
+
+class TestLoadClauses:
+    def test_parses_file(self, tmp_path):
+        path = tmp_path / "clauses.json"
+        path.write_text(json.dumps([{"id": "a"}]))
+        assert load_clauses(str(path)) == [{"id": "a"}]
+
+    def test_repeat_load_is_memoized(self, tmp_path):
+        path = tmp_path / "clauses.json"
+        path.write_text(json.dumps([{"id": "a"}]))
+        assert load_clauses(str(path)) is load_clauses(str(path))
+
+    def test_modified_file_is_reparsed(self, tmp_path):
+        path = tmp_path / "clauses.json"
+        path.write_text(json.dumps([{"id": "a"}]))
+        load_clauses(str(path))
+
+        path.write_text(json.dumps([{"id": "b"}]))
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert load_clauses(str(path)) == [{"id": "b"}]
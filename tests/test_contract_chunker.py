@@ -1,12 +1,13 @@
 """Tests for the contract chunker module."""
 
 import json
+import logging
 
 import pytest
 
 from src.contract_chunker import (
-    chunk_contract, classify_clause_type, extract_clauses,
-    _normalize_text, MIN_CHUNK_LENGTH, MAX_CHUNK_LENGTH,
+    chunk_contract, classify_clause_type, classify_clauses_batch, extract_clauses,
+    _chunk_pieces, _classify_by_heading, _normalize_text, MIN_CHUNK_LENGTH, MAX_CHUNK_LENGTH,
 )
 
 
@@ -33,6 +34,10 @@ class TestNormalizeText:
         assert "\n\n\n" not in result
         assert "para1\n\npara2\n\npara3" == result
 
+    def test_blank_lines_collapsed_after_line_ending_conversion(self):
+        """Blank lines made of \\r\\n or bare \\r are collapsed too."""
+        assert _normalize_text("para1\r\n\r\n\r\npara2\r\r\r\rpara3") == "para1\n\npara2\n\npara3"
+
 
 class TestChunkContract:
     """Tests for chunk_contract()."""
@@ -263,6 +268,102 @@ class TestChunkContract:
         for i, chunk in enumerate(chunks):
             assert chunk["position"] == i
 
+    def test_repeat_call_reuses_split_with_fresh_dicts(self, monkeypatch):
+        """The same text is only scanned once; callers can't corrupt the cached result."""
+        import src.contract_chunker as cc
+
+        text = "1. FIRST\nContent of the first section with sufficient length."
+        first = chunk_contract(text)
+        first[0]["heading"] = "mutated"
+        monkeypatch.setattr(cc, "_find_sections", lambda t: pytest.fail("section scan repeated"))
+        second = chunk_contract(text)
+        assert second[0]["heading"] == "1"
+        assert second[0] is not first[0]
+
+
+class TestSectionPatternPerformance:
+    """
+    Inputs that once made the scan or the splitter quadratic. Each test checks
+    the chunks, then guards the complexity by comparing run time at n and 4n
+    (linear is ~4x, quadratic ~16x) rather than against a wall-clock limit.
+    """
+
+    @staticmethod
+    def _assert_linear(make_text):
+        import time
+
+        def best_time(text):
+            # _chunk_pieces, since chunk_contract() memoizes repeated texts
+            times = []
+            for _ in range(3):
+                start = time.perf_counter()
+                _chunk_pieces(text)
+                times.append(time.perf_counter() - start)
+            return min(times)
+
+        small, large = make_text(1), make_text(4)
+        assert best_time(large) < 10 * best_time(small)
+
+    def test_long_space_runs_scan_in_linear_time(self):
+        """Space-padded text (common in PDF extraction) must not backtrack quadratically."""
+        def make_text(scale):
+            return "1. TERMINATION Either party may terminate." + " " * (20_000 * scale) + "on notice."
+
+        chunks = chunk_contract(make_text(1))
+        assert len(chunks) == 1
+        assert chunks[0]["heading"] == "1"
+        assert chunks[0]["text"].endswith("on notice.")
+        self._assert_linear(make_text)
+
+    def test_large_all_caps_contract_chunks_linearly(self):
+        """ALL-CAPS-heavy text finds every heading in a linear scan."""
+        section = (
+            "\n\nLIMITATION OF LIABILITY\n"
+            "IN NO EVENT SHALL EITHER PARTY BE LIABLE FOR INDIRECT DAMAGES. " * 20
+        )
+
+        def make_text(scale):
+            return section * (100 * scale)
+
+        chunks = chunk_contract(make_text(4))
+        headings = [c["heading"] for c in chunks]
+        assert headings.count("LIMITATION OF LIABILITY") == 20 * 400
+        self._assert_linear(make_text)
+
+    def test_unterminated_caps_heading_candidate_is_linear(self):
+        """An ALL-CAPS run that never ends its line fails the heading branch in one pass."""
+        def make_text(scale):
+            return "Preamble text here.\n\n" + "ACME WIDGET " * (25_000 * scale) + "shall deliver the goods."
+
+        chunks = chunk_contract(make_text(4))
+        assert len(chunks) == 1
+        assert chunks[0]["heading"] is None
+        self._assert_linear(make_text)
+
+    def test_many_short_sentences_split_linearly(self):
+        """A section of tiny sentences is packed without per-sentence string rebuilding."""
+        def make_text(scale):
+            return "1. Preamble. " + "Ok. " * (60_000 * scale)
+
+        chunks = chunk_contract(make_text(4))
+        assert len(chunks) > 300
+        assert all(len(c["text"]) <= MAX_CHUNK_LENGTH for c in chunks)
+        assert chunks[0]["heading"] == "1"
+        assert all(c["heading"] == "1 (cont.)" for c in chunks[1:])
+        self._assert_linear(make_text)
+
+    @pytest.mark.parametrize("text", [
+        "WHEREAS THE PARTIES\nagree.\n\n1. TERM  2. FEES apply.\n\nCONFIDENTIALITY\nSecret.",
+        "  ARTICLE I Scope.\nSection 2.1 Fees.  SCHEDULE A Rates.",
+        "Preamble text.\n\nGOVERNING LAW\nDelaware.\nNOW, THEREFORE, the parties agree.",
+    ])
+    def test_fast_scan_finds_same_sections(self, text):
+        """_find_sections matches a plain finditer of _SECTION_PATTERN, including at position 0."""
+        from src.contract_chunker import _SECTION_PATTERN, _find_sections
+
+        expected = [(m.start(), m.group()) for m in _SECTION_PATTERN.finditer(text)]
+        assert [(m.start(), m.group()) for m in _find_sections(text)] == expected
+
 
 class TestClassifyClauseType:
     """Tests for classify_clause_type() with mock provider."""
@@ -277,6 +378,21 @@ class TestClassifyClauseType:
         assert result["clause_type"] == "indemnification"
         assert result["confidence"] == "high"
 
+    def test_prompt_prefix_is_shared_across_clauses(self, mock_provider, monkeypatch):
+        """Only the user message varies between clauses, so the system prefix is cacheable."""
+        calls = []
+
+        def mock_chat(messages, model=None, temperature=0.0, max_tokens=100):
+            calls.append(messages)
+            return json.dumps({"clause_type": "other", "confidence": "low"})
+
+        monkeypatch.setattr(mock_provider, "chat", mock_chat)
+        classify_clause_type("Vendor shall indemnify customer.", mock_provider)
+        classify_clause_type("Either party may terminate.", mock_provider)
+        assert calls[0][0] == calls[1][0]
+        assert "indemnification" in calls[0][0]["content"]
+        assert calls[0][1]["content"].endswith("Vendor shall indemnify customer.")
+
 
 class TestExtractClauses:
     """Tests for extract_clauses() pipeline."""
@@ -300,3 +416,292 @@ class TestExtractClauses:
             assert "heading" in r
             assert "clause_type" in r
             assert "confidence" in r
+
+    def test_classification_calls_run_concurrently(self, mock_provider, monkeypatch):
+        """All chunks are classified at once, not one LLM round-trip after another."""
+        import threading
+
+        text = "\n".join(
+            f"{n}. SECTION {n}\nEither party may terminate this agreement on {n} days notice."
+            for n in range(1, 5)
+        )
+        # Every call waits for the others; sequential calls would time out
+        barrier = threading.Barrier(4, timeout=5)
+
+        def mock_chat(messages, model=None, temperature=0.0, max_tokens=100):
+            barrier.wait()
+            return json.dumps({"clause_type": "termination", "confidence": "high"})
+
+        monkeypatch.setattr(mock_provider, "chat", mock_chat)
+        monkeypatch.setattr("src.contract_chunker.CLASSIFY_BATCH_SIZE", 1)
+        results = extract_clauses(text, mock_provider)
+        assert len(results) == 4
+        assert all(r["clause_type"] == "termination" for r in results)
+
+    def test_chunks_classified_in_one_batched_call(self, mock_provider, monkeypatch):
+        """Up to CLASSIFY_BATCH_SIZE chunks share a single LLM call."""
+        text = "\n".join(
+            f"{n}. SECTION {n}\nEither party may terminate this agreement on {n} days notice."
+            for n in range(1, 5)
+        )
+        calls = []
+
+        def mock_chat(messages, model=None, temperature=0.0, max_tokens=100):
+            calls.append(messages)
+            return json.dumps({"classifications": [
+                {"index": i, "clause_type": "termination", "confidence": "high"}
+                for i in range(4)
+            ]})
+
+        monkeypatch.setattr(mock_provider, "chat", mock_chat)
+        results = extract_clauses(text, mock_provider)
+        assert len(calls) == 1
+        assert [r["clause_type"] for r in results] == ["termination"] * 4
+
+
+    def test_repeated_chunks_classified_once(self, mock_provider, monkeypatch):
+        """Identical boilerplate chunks share one classification."""
+        batch_sizes = []
+
+        def mock_chat(messages, model=None, temperature=0.0, max_tokens=100):
+            prompt = messages[1]["content"]
+            batch_sizes.append(prompt.count("All notices") + prompt.count("Either party"))
+            return json.dumps({"classifications": [
+                {"index": 0, "clause_type": "notices", "confidence": "high"},
+                {"index": 1, "clause_type": "termination", "confidence": "high"},
+            ]})
+
+        monkeypatch.setattr(mock_provider, "chat", mock_chat)
+        monkeypatch.setattr("src.contract_chunker.chunk_contract", lambda t: [
+            {"text": c, "position": i, "heading": None}
+            for i, c in enumerate(["All notices in writing."] * 3 + ["Either party may terminate."])
+        ])
+        results = extract_clauses("(chunking patched)", mock_provider)
+        assert batch_sizes == [2]
+        assert [r["clause_type"] for r in results] == ["notices"] * 3 + ["termination"]
+        assert [r["position"] for r in results] == [0, 1, 2, 3]
+
+    def test_logs_typed_and_other_counts(self, mock_provider, monkeypatch, caplog):
+        def mock_chat(messages, model=None, temperature=0.0, max_tokens=100):
+            return json.dumps({"classifications": [
+                {"index": 0, "clause_type": "notices", "confidence": "high"},
+                {"index": 1, "clause_type": "other", "confidence": "low"},
+            ]})
+
+        monkeypatch.setattr(mock_provider, "chat", mock_chat)
+        monkeypatch.setattr("src.contract_chunker.chunk_contract", lambda t: [
+            {"text": c, "position": i, "heading": None}
+            for i, c in enumerate(["All notices in writing.", "Signature page.", "All notices in writing."])
+        ])
+        with caplog.at_level(logging.INFO, logger="src.contract_chunker"):
+            extract_clauses("(chunking patched)", mock_provider)
+        assert "Classified 3 clauses: 2 typed, 1 other" in caplog.text
+
+
+class TestStructuredClassification:
+    def test_schema_limits_clause_types(self):
+        from src.contract_chunker import CLASSIFY_BATCH_SCHEMA, CLASSIFY_SCHEMA, KNOWN_CLAUSE_TYPES
+
+        single = CLASSIFY_SCHEMA["schema"]["properties"]["clause_type"]["enum"]
+        batch = CLASSIFY_BATCH_SCHEMA["schema"]["properties"]["classifications"]["items"]
+        assert single == KNOWN_CLAUSE_TYPES + ["other"]
+        assert batch["properties"]["clause_type"]["enum"] == single
+        assert batch["required"] == ["index", "clause_type", "confidence"]
+
+    def test_providers_with_chat_json_get_schema(self, mock_provider, monkeypatch):
+        from src.contract_chunker import CLASSIFY_SCHEMA
+
+        calls = []
+
+        def chat_json(messages, schema, model=None, temperature=0.0, max_tokens=100):
+            calls.append((schema, max_tokens))
+            return json.dumps({"clause_type": "termination", "confidence": "high"})
+
+        monkeypatch.setattr(mock_provider, "chat_json", chat_json, raising=False)
+        result = classify_clause_type("Either party may terminate this agreement.", mock_provider)
+        assert result == {"clause_type": "termination", "confidence": "high"}
+        assert calls == [(CLASSIFY_SCHEMA, 40)]
+
+    def test_unsupported_json_schema_falls_back_to_chat(self, mock_provider, monkeypatch):
+        def chat_json(messages, schema, model=None, temperature=0.0, max_tokens=100):
+            exc = Exception("Error code: 400 - response_format value as json_schema is enabled "
+                            "only for api versions 2024-08-01-preview and later")
+            exc.status_code = 400
+            raise exc
+
+        def mock_chat(messages, model=None, temperature=0.0, max_tokens=100):
+            if "classifications" in messages[0]["content"]:
+                return json.dumps({"classifications": [
+                    {"index": 0, "clause_type": "termination", "confidence": "high"},
+                    {"index": 1, "clause_type": "indemnification", "confidence": "medium"},
+                ]})
+            return json.dumps({"clause_type": "termination", "confidence": "high"})
+
+        monkeypatch.setattr(mock_provider, "chat_json", chat_json, raising=False)
+        monkeypatch.setattr(mock_provider, "chat", mock_chat)
+        assert classify_clause_type("Either party may terminate this agreement.", mock_provider) == {
+            "clause_type": "termination", "confidence": "high",
+        }
+        assert classify_clauses_batch(
+            ["Either party may terminate.", "Vendor shall indemnify Customer."], mock_provider
+        ) == [
+            {"clause_type": "termination", "confidence": "high"},
+            {"clause_type": "indemnification", "confidence": "medium"},
+        ]
+
+
+class TestClassifyModel:
+    def test_classify_model_overrides_chat_model(self, mock_provider, monkeypatch):
+        from src import classification_cache
+
+        models = []
+
+        def mock_chat(messages, model=None, temperature=0.0, max_tokens=100):
+            models.append(model)
+            return json.dumps({"clause_type": "termination", "confidence": "high"})
+
+        monkeypatch.setattr(mock_provider, "chat", mock_chat)
+        monkeypatch.setattr("src.contract_chunker.CLASSIFY_MODEL", "small-classifier")
+        text = "Either party may terminate this agreement on notice."
+        classify_clause_type(text, mock_provider)
+
+        assert models == ["small-classifier"]
+        # Cached under the model that produced the result
+        from src.contract_chunker import _PROMPT_DIGEST
+        assert classification_cache.get(text, "small-classifier", _PROMPT_DIGEST) is not None
+        assert classification_cache.get(text, mock_provider.chat_model, _PROMPT_DIGEST) is None
+
+    def test_defaults_to_provider_model(self, mock_provider, monkeypatch):
+        models = []
+
+        def mock_chat(messages, model=None, temperature=0.0, max_tokens=100):
+            models.append(model)
+            return json.dumps({"clause_type": "termination", "confidence": "high"})
+
+        monkeypatch.setattr(mock_provider, "chat", mock_chat)
+        classify_clause_type("Either party may terminate this agreement on notice.", mock_provider)
+        assert models == [None]
+
+
+class TestClassifyByHeading:
+    @pytest.mark.parametrize("text,heading,expected", [
+        ("2. LIMITATION OF LIABILITY\nIn no event shall either party be liable.", "2", "limitation_of_liability"),
+        ("ARTICLE IV. GOVERNING LAW\nDelaware law governs.", "ARTICLE IV", "governing_law"),
+        ("Section 8 Term and Termination\nEither party may terminate.", "Section 8", "termination"),
+        ("CONFIDENTIALITY\n\nEach party shall keep information confidential.", "CONFIDENTIALITY", "confidentiality"),
+    ])
+    def test_title_naming_one_type(self, text, heading, expected):
+        assert _classify_by_heading(text, heading) == {"clause_type": expected, "confidence": "high"}
+
+    @pytest.mark.parametrize("text,heading", [
+        ("1. DEFINITIONS\nTerms have the meaning given.", "1"),
+        ("7. REPRESENTATIONS AND WARRANTIES\nEach party represents that...", "7"),
+        ("All notices must be in writing and delivered by courier.", None),
+        ("5. Either party may give notices of termination by email, and such notices are effective on receipt.\nMore.",
+         "5"),
+        # Hard-wrapped body text: short first line, but not a title
+        ("3. The Supplier may audit\nthe Customer's records once per year.", "3"),
+        ("any waiver of rights under this Agreement shall\nnot be effective unless in writing.", None),
+        # Continuation pieces and the preamble never classify by heading
+        ("any waiver of rights under this Agreement shall\nnot be effective unless in writing.", "9 (cont.)"),
+        ("WAIVER\nNo waiver is effective unless in writing.", "WAIVER (cont.)"),
+        ("NOTICES\nThis agreement is made between the parties.", "PREAMBLE"),
+    ])
+    def test_ambiguous_or_missing_title_left_to_llm(self, text, heading):
+        assert _classify_by_heading(text, heading) is None
+
+    def test_body_text_first_line_goes_to_llm(self, mock_provider, monkeypatch):
+        prompts = []
+
+        def mock_chat(messages, model=None, temperature=0.0, max_tokens=100):
+            prompts.append(messages[1]["content"])
+            return json.dumps({"clause_type": "other", "confidence": "low"})
+
+        monkeypatch.setattr(mock_provider, "chat", mock_chat)
+        text = (
+            "1. DEFINITIONS\nTerms used in this agreement have the meaning given.\n"
+            "2. Either party may assign\nthis agreement to an affiliate with written consent.\n"
+        )
+        results = extract_clauses(text, mock_provider)
+        assert [r["clause_type"] for r in results] == ["other", "other"]
+        assert any("Either party may assign" in prompt for prompt in prompts)
+
+    def test_extract_skips_llm_for_titled_clauses(self, mock_provider, monkeypatch):
+        prompts = []
+
+        def mock_chat(messages, model=None, temperature=0.0, max_tokens=100):
+            prompts.append(messages[1]["content"])
+            return json.dumps({"clause_type": "other", "confidence": "low"})
+
+        monkeypatch.setattr(mock_provider, "chat", mock_chat)
+        text = (
+            "1. DEFINITIONS\nTerms used in this agreement have the meaning given.\n"
+            "2. GOVERNING LAW\nThis agreement is governed by the laws of Delaware.\n"
+        )
+        results = extract_clauses(text, mock_provider)
+        assert [r["clause_type"] for r in results] == ["other", "governing_law"]
+        assert len(prompts) == 1 and "DEFINITIONS" in prompts[0]
+
+
+class TestClassifyClausesBatch:
+    def test_maps_results_by_index(self, mock_provider, monkeypatch):
+        def mock_chat(messages, model=None, temperature=0.0, max_tokens=100):
+            return json.dumps({"classifications": [
+                {"index": 1, "clause_type": "indemnification", "confidence": "high"},
+                {"index": 0, "clause_type": "termination", "confidence": "low"},
+            ]})
+
+        monkeypatch.setattr(mock_provider, "chat", mock_chat)
+        results = classify_clauses_batch(["Either party may terminate.", "Vendor shall indemnify."], mock_provider)
+        assert results == [
+            {"clause_type": "termination", "confidence": "low"},
+            {"clause_type": "indemnification", "confidence": "high"},
+        ]
+
+    def test_missing_entries_fall_back_to_single_calls(self, mock_provider, monkeypatch):
+        def mock_chat(messages, model=None, temperature=0.0, max_tokens=100):
+            if "classifications" in messages[0]["content"]:
+                return json.dumps({"classifications": [
+                    {"index": 0, "clause_type": "termination", "confidence": "high"},
+                ]})
+            return json.dumps({"clause_type": "indemnification", "confidence": "medium"})
+
+        monkeypatch.setattr(mock_provider, "chat", mock_chat)
+        results = classify_clauses_batch(["Either party may terminate.", "Vendor shall indemnify."], mock_provider)
+        assert [r["clause_type"] for r in results] == ["termination", "indemnification"]
+
+    def test_transient_batch_failure_does_not_fan_out(self, mock_provider, monkeypatch):
+        calls = []
+
+        def mock_chat(messages, model=None, temperature=0.0, max_tokens=100):
+            calls.append(messages)
+            exc = RuntimeError("rate limited")
+            exc.status_code = 429
+            raise exc
+
+        monkeypatch.setattr(mock_provider, "chat", mock_chat)
+        results = classify_clauses_batch(["Clause one text.", "Clause two text."], mock_provider)
+        assert len(calls) == 1
+        assert results == [{"clause_type": "other", "confidence": "low"}] * 2
+
+    def test_rejected_batch_falls_back_to_single_calls(self, mock_provider, monkeypatch):
+        def mock_chat(messages, model=None, temperature=0.0, max_tokens=100):
+            if "classifications" in messages[0]["content"]:
+                exc = RuntimeError("context length exceeded")
+                exc.status_code = 400
+                raise exc
+            return json.dumps({"clause_type": "warranty", "confidence": "low"})
+
+        monkeypatch.setattr(mock_provider, "chat", mock_chat)
+        results = classify_clauses_batch(["Clause one text.", "Clause two text."], mock_provider)
+        assert [r["clause_type"] for r in results] == ["warranty", "warranty"]
+
+    def test_unparseable_batch_falls_back(self, mock_provider, monkeypatch):
+        def mock_chat(messages, model=None, temperature=0.0, max_tokens=100):
+            if "classifications" in messages[0]["content"]:
+                return "not json"
+            return json.dumps({"clause_type": "warranty", "confidence": "low"})
+
+        monkeypatch.setattr(mock_provider, "chat", mock_chat)
+        results = classify_clauses_batch(["Clause one text.", "Clause two text."], mock_provider)
+        assert [r["clause_type"] for r in results] == ["warranty", "warranty"]
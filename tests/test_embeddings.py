@@ -33,7 +33,7 @@ class TestInferPracticeArea:
 
 
 class TestLoadClauseDatabase:
-    def test_returns_dict_with_correct_keys_and_counts(self, mock_provider):
+    def test_returns_dict_with_correct_keys_and_counts(self, mock_provider, tmp_path):
         mock_store = MagicMock()
         mock_store.upsert.return_value = 15
         mock_store.total_vectors = 0
@@ -41,7 +41,7 @@ class TestLoadClauseDatabase:
         with patch("src.embeddings.create_provider", return_value=mock_provider), \
              patch("src.embeddings.create_vector_store", return_value=mock_store):
             from src.embeddings import load_clause_database
-            db = load_clause_database()
+            db = load_clause_database(index_path=str(tmp_path / "main"))
 
             assert "store" in db
             assert "clauses" in db
@@ -85,7 +85,7 @@ class TestLoadDocuments:
             assert len(db["documents"]) == 3
             assert db["documents"][0]["doc_id"] == "uni-001"
 
-    def test_backward_compat(self, mock_provider):
+    def test_backward_compat(self, mock_provider, tmp_path):
         mock_store = MagicMock()
         mock_store.upsert.return_value = 15
         mock_store.total_vectors = 0
@@ -93,7 +93,7 @@ class TestLoadDocuments:
         with patch("src.embeddings.create_provider", return_value=mock_provider), \
              patch("src.embeddings.create_vector_store", return_value=mock_store):
             from src.embeddings import load_clause_database
-            db = load_clause_database()
+            db = load_clause_database(index_path=str(tmp_path / "main"))
 
             assert "store" in db
             assert "clauses" in db
@@ -124,3 +124,95 @@ class TestLoadDocuments:
             db = load_documents(documents=[invalid_doc])
             assert len(db["documents"]) == 1
             assert any("validation" in r.message for r in caplog.records)
+
+    def test_persisted_index_reused_until_content_changes(self, mock_provider, sample_unified_documents,
+                                                          tmp_path, monkeypatch):
+        import copy
+        from src.embeddings import load_documents
+        from src.vector_store import FaissVectorStore
+
+        calls = []
+        real_embed = mock_provider.embed
+        monkeypatch.setattr(mock_provider, "embed", lambda texts: calls.append(texts) or real_embed(texts))
+        index_path = str(tmp_path / "main")
+
+        def load(documents):
+            with patch("src.embeddings.create_provider", return_value=mock_provider), \
+                 patch("src.embeddings.create_vector_store", side_effect=lambda name: FaissVectorStore()):
+                return load_documents(documents=documents, index_path=index_path)
+
+        documents = copy.deepcopy(sample_unified_documents)
+        documents[0]["text"] += " Each party shall protect the other's information with reasonable care."
+        load(documents)
+        load(copy.deepcopy(documents))
+        assert len(calls) == 1
+
+        # An edit past the start of the text must invalidate the index;
+        # only the edited document is embedded again
+        edited = copy.deepcopy(documents)
+        edited[0]["text"] += " Amended."
+        load(edited)
+        assert len(calls) == 2
+        assert calls[1] == [f"{edited[0]['title']}: {edited[0]['text']}"]
+
+        # So must a metadata edit, since metadata is restored from the saved
+        # index; the text is unchanged, so every vector comes from the cache
+        edited[0]["metadata"]["risk_level"] = "high"
+        db = load(edited)
+        assert len(calls) == 2
+        assert db["store"]._metadata[edited[0]["doc_id"]]["risk_level"] == "high"
+
+    def test_provider_created_while_index_loads(self, mock_provider, sample_unified_documents, tmp_path):
+        import threading
+        from src.embeddings import load_documents
+        from src.vector_store import FaissVectorStore
+
+        index_loading = threading.Event()
+
+        class SignallingStore(FaissVectorStore):
+            def load(self, path=None):
+                index_loading.set()
+                return super().load(path)
+
+        def slow_provider():
+            # Only returns once the index load has started in the caller
+            assert index_loading.wait(timeout=5)
+            return mock_provider
+
+        with patch("src.embeddings.create_provider", side_effect=slow_provider), \
+             patch("src.embeddings.create_vector_store", side_effect=lambda name: SignallingStore()):
+            db = load_documents(documents=sample_unified_documents, index_path=str(tmp_path / "main"))
+        assert db["provider"] is mock_provider
+
+    def test_duplicate_texts_embedded_once(self, mock_provider, monkeypatch):
+        from src.embeddings import _embed_documents, get_embeddings
+
+        calls = []
+        real_embed = mock_provider.embed
+        monkeypatch.setattr(mock_provider, "embed", lambda texts: calls.append(texts) or real_embed(texts))
+        texts = ["notice clause", "payment clause", "notice clause"]
+        result = _embed_documents(texts, mock_provider, None)
+
+        assert calls == [["notice clause", "payment clause"]]
+        np.testing.assert_array_equal(result, get_embeddings(texts, mock_provider))
+
+    def test_cached_vectors_match_fresh_embeddings(self, mock_provider, tmp_path):
+        from src.embeddings import _embed_documents, get_embeddings
+
+        texts = ["alpha clause", "beta clause", "gamma clause"]
+        cache_path = str(tmp_path / "idx" / "main.embeddings.sqlite3")
+        _embed_documents(texts[:2], mock_provider, cache_path)
+        result = _embed_documents(texts, mock_provider, cache_path)
+        np.testing.assert_array_equal(result, get_embeddings(texts, mock_provider))
+
+    def test_dimension_change_reembeds(self, mock_provider, tmp_path, monkeypatch):
+        from src.embeddings import _embed_documents
+
+        calls = []
+        real_embed = mock_provider.embed
+        monkeypatch.setattr(mock_provider, "embed", lambda texts: calls.append(texts) or real_embed(texts))
+        cache_path = str(tmp_path / "main.embeddings.sqlite3")
+        _embed_documents(["alpha clause"], mock_provider, cache_path)
+        monkeypatch.setattr(mock_provider, "embedding_dimensions", 256, raising=False)
+        _embed_documents(["alpha clause"], mock_provider, cache_path)
+        assert len(calls) == 2
@@ -83,3 +83,22 @@ class TestJudgePrompt:
         assert "{expected_risk}" in JUDGE_PROMPT
         assert "{must_identify}" in JUDGE_PROMPT
         assert "{analysis}" in JUDGE_PROMPT
+
+    def test_cases_judged_concurrently(self, loaded_faiss_db, monkeypatch):
+        """Test cases don't wait on each other's LLM round-trips."""
+        import threading
+
+        # Every judge call waits for all of them; sequential calls would time out
+        barrier = threading.Barrier(len(TEST_CASES), timeout=5)
+
+        def judge(*a, **kw):
+            barrier.wait()
+            return json.dumps({"risk_accuracy": 5, "issue_coverage": 5,
+                               "actionability": 5, "grounding": 5, "total": 20})
+
+        with patch("src.evaluation.analyze_clause", return_value={"analysis": "test analysis"}):
+            monkeypatch.setattr(loaded_faiss_db["provider"], "chat", judge)
+            results = evaluate_generation(loaded_faiss_db, strategy="basic")
+
+        assert [tc["name"] for tc in results["test_cases"]] == [t["name"] for t in TEST_CASES]
+        assert results["avg_scores"]["total"] == 20
@@ -0,0 +1,63 @@
+"""Tests for src/execution_gate.py and its use in the RAG pipeline."""
+
+from unittest.mock import patch
+
+from src import execution_gate
+from src.execution_gate import should_short_circuit, remember
+from src.rag_pipeline import analyze_clause
+
+CLAUSE = "Employee agrees not to compete with the Company for 2 years worldwide."
+
+
+class TestShouldShortCircuit:
+    def test_blank_rejected(self):
+        result = should_short_circuit("   \n ")
+        assert result["review_status"] == "rejected"
+        assert result["analysis"]["reason"] == "too_short"
+
+    def test_short_rejected(self):
+        assert should_short_circuit("Party shall pay.")["analysis"]["reason"] == "too_short"
+
+    def test_non_contract_text_rejected(self):
+        result = should_short_circuit("The weather today is sunny and warm with a light breeze.")
+        assert result["analysis"]["reason"] == "not_contract_text"
+
+    def test_contract_clause_passes(self):
+        assert should_short_circuit(CLAUSE) is None
+
+    def test_duplicate_returns_remembered_result(self):
+        remember(CLAUSE, {"analysis": {"risk_level": "high"}}, scope="few_shot")
+        assert should_short_circuit(CLAUSE, scope="few_shot") == {"analysis": {"risk_level": "high"}}
+        assert should_short_circuit(f"  {CLAUSE}\n", scope="few_shot") is not None
+
+    def test_duplicate_scoped_by_options(self):
+        remember(CLAUSE, {"analysis": {}}, scope="few_shot")
+        assert should_short_circuit(CLAUSE, scope="basic") is None
+
+    def test_cache_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(execution_gate, "DUPLICATE_CACHE_SIZE", 2)
+        for i in range(3):
+            remember(f"{CLAUSE} {i}", {"n": i})
+        assert should_short_circuit(f"{CLAUSE} 0") is None
+        assert should_short_circuit(f"{CLAUSE} 2") == {"n": 2}
+
+
+class TestAnalyzeClauseGate:
+    def test_rejected_clause_skips_llm(self, loaded_faiss_db):
+        with patch("src.rag_pipeline.generate_analysis") as mock_gen:
+            result = analyze_clause("hello", loaded_faiss_db, strategy="basic")
+
+        mock_gen.assert_not_called()
+        assert result["review_status"] == "rejected"
+        assert result["sources"] == []
+        assert result["strategy"] == "basic"
+        assert "disclaimer" in result
+
+    def test_repeat_clause_skips_llm(self, loaded_faiss_db):
+        with patch("src.rag_pipeline.generate_analysis", return_value='{"risk_level": "high"}') as mock_gen:
+            first = analyze_clause(CLAUSE, loaded_faiss_db)
+            second = analyze_clause(CLAUSE, loaded_faiss_db)
+            analyze_clause(CLAUSE, loaded_faiss_db, strategy="basic")
+
+        assert second == first
+        assert mock_gen.call_count == 2
@@ -79,3 +79,19 @@ class TestFaissPersistence:
         store.save(nested)
         assert os.path.exists(f"{nested}.index")
         assert os.path.exists(f"{nested}.meta.json")
+
+    def test_mmap_load_roundtrip(self, populated_store, tmp_path, monkeypatch):
+        import src.vector_store as vector_store
+        monkeypatch.setenv("FAISS_MMAP", "1")
+        monkeypatch.setattr(vector_store, "MMAP_MIN_BYTES", 0)
+
+        store, ids, embeddings, _ = populated_store
+        base = str(tmp_path / "mmap")
+        store.save(base)
+
+        new_store = FaissVectorStore()
+        assert new_store.load(base) is True
+        query = embeddings[2:3].copy()
+        import faiss
+        faiss.normalize_L2(query)
+        assert new_store.search(query, top_k=1)[0]["id"] == ids[2]
@@ -2,11 +2,14 @@
 
 from unittest.mock import MagicMock
 
+import pytest
+
 from src.generation import (
     build_basic_prompt,
     build_structured_prompt,
     build_few_shot_prompt,
     generate_analysis,
+    generate_json,
 )
 
 
@@ -63,3 +66,50 @@ class TestGenerateAnalysis:
             messages, model="custom-model", temperature=0.5, max_tokens=500
         )
         assert result == "analysis result"
+
+
+class TestGenerateJson:
+    SCHEMA = {"name": "test", "schema": {"type": "object"}}
+
+    def test_uses_chat_json_when_available(self):
+        provider = MagicMock()
+        provider.chat_json.return_value = "{}"
+        messages = [{"role": "user", "content": "test"}]
+
+        assert generate_json(messages, provider, self.SCHEMA, max_tokens=30) == "{}"
+        provider.chat_json.assert_called_once_with(
+            messages, self.SCHEMA, model=None, temperature=0.2, max_tokens=30
+        )
+        provider.chat.assert_not_called()
+
+    def test_falls_back_to_chat(self, mock_provider):
+        result = generate_json([{"role": "user", "content": "test"}], mock_provider, self.SCHEMA)
+        assert isinstance(result, str)
+
+    @staticmethod
+    def _bad_request(message):
+        exc = Exception(message)
+        exc.status_code = 400
+        return exc
+
+    def test_rejected_response_format_retries_with_chat(self):
+        provider = MagicMock()
+        provider.chat_json.side_effect = self._bad_request(
+            "Invalid parameter: 'response_format' of type 'json_schema' is not supported with this model."
+        )
+        provider.chat.return_value = '{"ok": true}'
+        messages = [{"role": "user", "content": "test"}]
+
+        assert generate_json(messages, provider, self.SCHEMA) == '{"ok": true}'
+        assert generate_json(messages, provider, self.SCHEMA) == '{"ok": true}'
+        # The second call goes straight to chat()
+        provider.chat_json.assert_called_once()
+        assert provider.chat.call_count == 2
+
+    def test_other_errors_propagate(self):
+        provider = MagicMock()
+        provider.chat_json.side_effect = self._bad_request("This model's maximum context length is exceeded")
+
+        with pytest.raises(Exception, match="maximum context length"):
+            generate_json([{"role": "user", "content": "test"}], provider, self.SCHEMA)
+        provider.chat.assert_not_called()
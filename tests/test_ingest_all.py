@@ -63,3 +63,19 @@ def test_register_ingestors_common_paper_only():
     ingestors = register_ingestors(sources=["common_paper"])
     assert "common_paper" in ingestors
     assert len(ingestors) == 1
+
+
+def test_main_builds_index_at_save_path(monkeypatch):
+    """main() hands --save-index to load_documents so reruns reuse the index and its vectors."""
+    from unittest.mock import MagicMock, patch
+
+    from src.ingest import ingest_all
+
+    ingestor = MagicMock()
+    ingestor.ingest.return_value = [{"doc_id": "d1", "source": "clauses_json"}]
+    monkeypatch.setattr("sys.argv", ["ingest_all", "--save-index", "out/idx"])
+    with patch.object(ingest_all, "register_ingestors", return_value={"clauses_json": lambda: ingestor}), \
+         patch.object(ingest_all, "load_documents") as load:
+        ingest_all.main()
+
+    load.assert_called_once_with(documents=ingestor.ingest.return_value, index_path="out/idx")
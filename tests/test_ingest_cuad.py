@@ -1,4 +1,4 @@
-"""Tests for CuadIngestor — only tests transform() with mock data (no HuggingFace download)."""
+"""Tests for CuadIngestor — mock data and a patched load_dataset (no HuggingFace download)."""
 
 import pytest
 from src.ingest.cuad import CuadIngestor, QUESTION_TO_CLAUSE_TYPE
@@ -42,6 +42,14 @@ class TestExtractClauseType:
         result = ingestor._extract_clause_type(INDEMNIFICATION_Q)
         assert result == "indemnification"
 
+    def test_dataset_question_with_details_maps_by_label(self):
+        """Dataset questions carry a "Details:" suffix; the quoted label still maps."""
+        ingestor = CuadIngestor()
+        question = ('Highlight the parts (if any) of this contract related to "Rofr/Rofo/Rofn" '
+                    'that should be reviewed by a lawyer. Details: Is there a clause granting '
+                    'one party a right of first refusal?')
+        assert ingestor._extract_clause_type(question) == "right_of_first_refusal"
+
     def test_unknown_question_extracts_quoted_portion(self):
         """Unknown question → extracts quoted portion as fallback."""
         ingestor = CuadIngestor()
@@ -198,3 +206,27 @@ class TestTransform:
         ingestor = self._make_ingestor()
         result = ingestor.transform([])
         assert result == []
+
+
+class TestLoadRaw:
+    def test_loads_only_the_columns_transform_reads(self):
+        """load_raw drops the repeated contract "context" column."""
+        from unittest.mock import patch
+
+        import datasets
+
+        dataset = datasets.Dataset.from_dict({
+            "id": ["1"],
+            "title": ["ACME_Corp_Agreement.pdf"],
+            "context": ["Full contract text..."],
+            "question": [GOVERNING_LAW_Q],
+            "answers": [{"text": ["Governed by Delaware law."], "answer_start": [0]}],
+        })
+        with patch("datasets.load_dataset", return_value=dataset):
+            raw = CuadIngestor().load_raw()
+
+        assert raw == [{
+            "title": "ACME_Corp_Agreement.pdf",
+            "question": GOVERNING_LAW_Q,
+            "answers": {"text": ["Governed by Delaware law."], "answer_start": [0]},
+        }]
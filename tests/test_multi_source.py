@@ -51,14 +51,14 @@ class TestLoadDocumentsWithUnifiedSchema:
 
 
 class TestBackwardCompat:
-    def test_load_clause_database_returns_expected_keys(self, mock_provider):
+    def test_load_clause_database_returns_expected_keys(self, mock_provider, tmp_path):
         mock_store = MagicMock()
         mock_store.upsert.return_value = 15
         mock_store.total_vectors = 0
 
         with patch("src.embeddings.create_provider", return_value=mock_provider), \
              patch("src.embeddings.create_vector_store", return_value=mock_store):
-            db = load_clause_database()
+            db = load_clause_database(index_path=str(tmp_path / "main"))
             assert "store" in db
             assert "clauses" in db
             assert "provider" in db
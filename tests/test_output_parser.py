@@ -30,6 +30,11 @@ class TestParseJsonResponse:
         result = parse_json_response(text)
         assert result == {"key": "value"}
 
+    def test_braces_inside_strings_with_trailing(self):
+        text = 'Result: {"summary": "uses } and { in text"} -- end'
+        result = parse_json_response(text)
+        assert result == {"summary": "uses } and { in text"}
+
     def test_preamble_fenced_trailing(self):
         text = 'Here it is:\n```json\n{"key": "value"}\n```\nDone.'
         result = parse_json_response(text)
@@ -52,6 +52,24 @@ def test_load_playbook(sample_playbook):
     assert len(pb["clauses"]) == 2
 
 
+def test_load_playbook_is_cached_until_file_changes(sample_playbook):
+    """Repeat loads reuse the parsed playbook; a modified file is re-read."""
+    import os
+
+    first = load_playbook(sample_playbook)
+    assert load_playbook(sample_playbook) is first
+
+    with open(sample_playbook) as f:
+        data = json.load(f)
+    data["name"] = "Renamed Playbook"
+    with open(sample_playbook, "w") as f:
+        json.dump(data, f)
+    stat = os.stat(sample_playbook)
+    os.utime(sample_playbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert load_playbook(sample_playbook)["name"] == "Renamed Playbook"
+
+
 def test_find_playbook_position_found(sample_playbook):
     """find_playbook_position returns the matching clause position."""
     pb = load_playbook(sample_playbook)
@@ -89,7 +107,8 @@ def test_review_contract_with_mocked_extraction(
         },
     ]
     monkeypatch.setattr(
-        "src.playbook_review.extract_clauses", lambda text, provider: fake_clauses
+        "src.playbook_review.extract_and_embed_clauses",
+        lambda text, provider: (fake_clauses, provider.embed([c["text"] for c in fake_clauses])),
     )
 
     result = review_contract("dummy contract text " * 5, sample_playbook, loaded_multi_source_db)
@@ -166,3 +185,42 @@ def test_build_contract_summary_walk_away_is_high_risk():
     assert summary["walk_away_triggered"] == 1
     assert len(summary["critical_issues"]) == 1
     assert "Liability cap" in summary["critical_issues"][0]
+
+
+def test_review_contract_embeds_clauses_while_classifying(
+    sample_playbook, loaded_multi_source_db, monkeypatch
+):
+    """All clauses are embedded in one provider call that overlaps classification."""
+    import json
+    import threading
+
+    texts = [f"Either party may terminate this agreement under clause {n}." for n in range(3)]
+    monkeypatch.setattr("src.contract_chunker.chunk_contract", lambda t: [
+        {"text": text, "position": n, "heading": None} for n, text in enumerate(texts)
+    ])
+    provider = loaded_multi_source_db["provider"]
+    embed_started = threading.Event()
+    calls = []
+    real_embed = provider.embed
+
+    def embed(batch):
+        calls.append(batch)
+        embed_started.set()
+        return real_embed(batch)
+
+    def chat(messages, model=None, temperature=0.0, max_tokens=100):
+        if "classifications" in messages[0]["content"]:
+            # Classification only finishes once the embedding call is in flight
+            assert embed_started.wait(timeout=5)
+            return json.dumps({"classifications": [
+                {"index": n, "clause_type": "termination", "confidence": "high"} for n in range(3)
+            ]})
+        return json.dumps({"playbook_match": "preferred", "gaps": [], "risk_level": "low"})
+
+    monkeypatch.setattr(provider, "embed", embed)
+    monkeypatch.setattr(provider, "chat", chat)
+
+    result = review_contract("dummy contract text " * 5, sample_playbook, loaded_multi_source_db)
+
+    assert calls[0] == texts
+    assert len(result["clause_analyses"]) == 3
@@ -78,3 +78,168 @@ class TestCreateProvider:
         # OpenAI has class-level model attributes; Azure/Bedrock set them in __init__
         assert hasattr(OpenAIProvider, "embedding_model")
         assert hasattr(OpenAIProvider, "chat_model")
+
+
+class TestBedrockClient:
+    def test_connection_pool_sized_for_thread_fan_out(self, monkeypatch):
+        monkeypatch.setenv("BEDROCK_MAX_POOL_CONNECTIONS", "48")
+        with patch("boto3.client") as mock_client:
+            BedrockProvider()
+        config = mock_client.call_args.kwargs["config"]
+        assert config.max_pool_connections == 48
+        assert config.tcp_keepalive is True
+
+
+class TestBedrockEmbed:
+    @staticmethod
+    def _provider(model):
+        provider = BedrockProvider.__new__(BedrockProvider)
+        provider.embedding_model = model
+        provider.bedrock = MagicMock()
+        return provider
+
+    @staticmethod
+    def _body(payload):
+        import io
+        import json
+        return {"body": io.BytesIO(json.dumps(payload).encode())}
+
+    def test_titan_one_request_per_text_in_input_order(self):
+        import json
+        provider = self._provider("amazon.titan-embed-text-v2:0")
+        provider.bedrock.invoke_model.side_effect = lambda **kw: self._body(
+            {"embedding": [float(json.loads(kw["body"])["inputText"][-1])]}
+        )
+
+        result = provider.embed([f"text {i}" for i in range(5)])
+        assert provider.bedrock.invoke_model.call_count == 5
+        assert result.tolist() == [[0.0], [1.0], [2.0], [3.0], [4.0]]
+
+    def test_cohere_embeds_batch_in_one_request(self):
+        import json
+        provider = self._provider("cohere.embed-english-v3")
+        provider.bedrock.invoke_model.return_value = self._body({"embeddings": [[1.0], [2.0]]})
+
+        result = provider.embed(["a", "b"])
+        provider.bedrock.invoke_model.assert_called_once()
+        body = json.loads(provider.bedrock.invoke_model.call_args.kwargs["body"])
+        assert body["texts"] == ["a", "b"]
+        assert result.tolist() == [[1.0], [2.0]]
+
+
+class TestOpenAIEmbed:
+    def test_base64_vectors_decoded_in_response_order(self):
+        import base64
+        import numpy as np
+
+        def item(index, values):
+            i = MagicMock()
+            i.index = index
+            i.embedding = base64.b64encode(np.array(values, dtype="<f4").tobytes()).decode()
+            return i
+
+        provider = OpenAIProvider.__new__(OpenAIProvider)
+        provider.embedding_model = "test-embed"
+        provider.client = MagicMock()
+        provider.client.embeddings.create.return_value.data = [
+            item(1, [3.0, 4.0]), item(0, [1.0, 2.0]),
+        ]
+
+        result = provider.embed(["a", "b"])
+        assert provider.client.embeddings.create.call_args.kwargs["encoding_format"] == "base64"
+        assert result.dtype == np.float32
+        np.testing.assert_array_equal(result, [[1.0, 2.0], [3.0, 4.0]])
+
+    def test_dimensions_sent_only_when_configured(self):
+        provider = OpenAIProvider.__new__(OpenAIProvider)
+        provider.client = MagicMock()
+        provider.client.embeddings.create.return_value.data = []
+
+        provider.embedding_dimensions = None
+        provider.embed(["a"])
+        assert "dimensions" not in provider.client.embeddings.create.call_args.kwargs
+
+        provider.embedding_dimensions = 512
+        provider.embed(["a"])
+        assert provider.client.embeddings.create.call_args.kwargs["dimensions"] == 512
+
+
+class TestOpenAIChatJson:
+    def test_sends_strict_json_schema(self):
+        provider = OpenAIProvider.__new__(OpenAIProvider)
+        provider.client = MagicMock()
+        provider.client.chat.completions.create.return_value.choices[0].message.content = "{}"
+        schema = {"name": "clause", "schema": {"type": "object"}}
+
+        assert provider.chat_json([{"role": "user", "content": "hi"}], schema, max_tokens=30) == "{}"
+        kwargs = provider.client.chat.completions.create.call_args.kwargs
+        assert kwargs["response_format"] == {
+            "type": "json_schema",
+            "json_schema": {"name": "clause", "schema": {"type": "object"}, "strict": True},
+        }
+        assert kwargs["max_tokens"] == 30
+
+
+class TestBedrockPromptCache:
+    def _provider(self):
+        provider = BedrockProvider.__new__(BedrockProvider)
+        provider.bedrock = MagicMock()
+        provider.bedrock.converse.return_value = {
+            "output": {"message": {"content": [{"text": "ok"}]}}
+        }
+        provider.chat_model = "test-model"
+        return provider
+
+    def test_cache_point_added_when_enabled(self, monkeypatch):
+        monkeypatch.setenv("BEDROCK_PROMPT_CACHE", "1")
+        provider = self._provider()
+        provider.chat([
+            {"role": "system", "content": "static"},
+            {"role": "user", "content": "hi"},
+        ])
+        system = provider.bedrock.converse.call_args.kwargs["system"]
+        assert system == [{"text": "static"}, {"cachePoint": {"type": "default"}}]
+
+    def test_no_cache_point_by_default(self, monkeypatch):
+        monkeypatch.delenv("BEDROCK_PROMPT_CACHE", raising=False)
+        provider = self._provider()
+        provider.chat([
+            {"role": "system", "content": "static"},
+            {"role": "user", "content": "hi"},
+        ])
+        system = provider.bedrock.converse.call_args.kwargs["system"]
+        assert system == [{"text": "static"}]
+
+
+class TestChatStream:
+    def test_openai_yields_text_deltas(self):
+        def chunk(content, has_choice=True):
+            c = MagicMock()
+            if has_choice:
+                c.choices = [MagicMock()]
+                c.choices[0].delta.content = content
+            else:
+                c.choices = []
+            return c
+
+        provider = OpenAIProvider.__new__(OpenAIProvider)
+        provider.client = MagicMock()
+        provider.client.chat.completions.create.return_value = iter(
+            [chunk(None, has_choice=False), chunk(None), chunk("Hel"), chunk("lo")]
+        )
+
+        assert list(provider.chat_stream([{"role": "user", "content": "hi"}])) == ["Hel", "lo"]
+        assert provider.client.chat.completions.create.call_args.kwargs["stream"] is True
+
+    def test_bedrock_yields_content_block_deltas(self):
+        provider = BedrockProvider.__new__(BedrockProvider)
+        provider.chat_model = "test-model"
+        provider.bedrock = MagicMock()
+        provider.bedrock.converse_stream.return_value = {"stream": [
+            {"messageStart": {"role": "assistant"}},
+            {"contentBlockDelta": {"delta": {"text": "Hel"}}},
+            {"contentBlockDelta": {"delta": {"text": "lo"}}},
+            {"messageStop": {"stopReason": "end_turn"}},
+        ]}
+
+        assert list(provider.chat_stream([{"role": "user", "content": "hi"}])) == ["Hel", "lo"]
@@ -5,6 +5,12 @@ from unittest.mock import patch
 from src.rag_pipeline import STRATEGIES, analyze_clause
 
 
+CONFIDENTIALITY_CLAUSE = (
+    "The Receiving Party shall keep all Confidential Information "
+    "strictly confidential for three years."
+)
+
+
 class TestStrategies:
     def test_has_expected_keys(self):
         assert set(STRATEGIES.keys()) == {"basic", "structured", "few_shot", "knowledge_base_qa"}
@@ -28,7 +34,7 @@ class TestAnalyzeClause:
             ]
             mock_gen.return_value = '{"risk_level": "low"}'
 
-            result = analyze_clause("test clause", loaded_faiss_db)
+            result = analyze_clause(CONFIDENTIALITY_CLAUSE, loaded_faiss_db)
 
             assert "analysis" in result
             assert "sources" in result
@@ -53,7 +59,7 @@ class TestAnalyzeClause:
             ]
             mock_gen.return_value = '{"risk_level": "low"}'
 
-            result = analyze_clause("test clause", loaded_faiss_db)
+            result = analyze_clause(CONFIDENTIALITY_CLAUSE, loaded_faiss_db)
 
             assert "retrieved_clauses" not in result
             assert len(result["sources"]) == 1
@@ -67,7 +73,7 @@ class TestAnalyzeClause:
                 mock_gen.return_value = "analysis"
 
                 result = analyze_clause(
-                    "test clause", loaded_faiss_db, strategy=strategy_name
+                    CONFIDENTIALITY_CLAUSE, loaded_faiss_db, strategy=strategy_name
                 )
                 assert result["strategy"] == strategy_name
 
@@ -77,7 +83,7 @@ class TestAnalyzeClause:
             mock_search.return_value = []
             mock_gen.return_value = "analysis"
 
-            result = analyze_clause("test clause", loaded_faiss_db)
+            result = analyze_clause(CONFIDENTIALITY_CLAUSE, loaded_faiss_db)
             assert result["strategy"] == "few_shot"
 
     def test_review_status_and_disclaimer(self, loaded_faiss_db):
@@ -86,6 +92,42 @@ class TestAnalyzeClause:
             mock_search.return_value = []
             mock_gen.return_value = "analysis"
 
-            result = analyze_clause("test clause", loaded_faiss_db)
+            result = analyze_clause(CONFIDENTIALITY_CLAUSE, loaded_faiss_db)
             assert result["review_status"] == "pending_review"
             assert "DRAFT" in result["disclaimer"]
+
+    def test_precomputed_retrieval_skips_search(self, loaded_faiss_db):
+        retrieved = [
+            {
+                "clause": {
+                    "id": "nda-001", "title": "Test NDA", "type": "NDA",
+                    "category": "c", "text": "t", "risk_level": "low",
+                    "notes": "n",
+                },
+                "score": 0.85,
+            },
+        ]
+        with patch("src.rag_pipeline.search_similar_clauses") as mock_search, \
+             patch("src.rag_pipeline.generate_analysis") as mock_gen:
+            mock_gen.return_value = '{"risk_level": "low"}'
+
+            result = analyze_clause(CONFIDENTIALITY_CLAUSE, loaded_faiss_db, retrieved=retrieved)
+
+            mock_search.assert_not_called()
+            assert result["sources"][0]["id"] == "nda-001"
+
+
+class TestAnalyzeStrategies:
+    def test_excludes_knowledge_base_qa(self):
+        from src.rag_pipeline import ANALYZE_STRATEGIES
+
+        assert isinstance(ANALYZE_STRATEGIES, frozenset)
+        assert ANALYZE_STRATEGIES == {"basic", "structured", "few_shot"}
+
+    def test_matches_api_request_literal(self):
+        from typing import get_args
+
+        from src.api_models import AnalyzeStrategy
+        from src.rag_pipeline import ANALYZE_STRATEGIES
+
+        assert set(get_args(AnalyzeStrategy)) == ANALYZE_STRATEGIES
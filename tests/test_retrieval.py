@@ -2,10 +2,31 @@
 
 import pytest
 
-from src.retrieval import search_similar_clauses, format_retrieval_results
+from src.retrieval import (
+    search_similar_clauses, search_similar_clauses_by_vector, format_retrieval_results,
+)
 
 
 class TestSearchSimilarClauses:
+    def test_by_vector_matches_text_search(self, loaded_faiss_db):
+        query = "confidentiality agreement"
+        vec = loaded_faiss_db["provider"].embed([query])[0]
+        by_text = search_similar_clauses(query, loaded_faiss_db, top_k=3)
+        by_vector = search_similar_clauses_by_vector(vec, loaded_faiss_db, top_k=3)
+        assert [r["clause"]["id"] for r in by_vector] == [r["clause"]["id"] for r in by_text]
+
+    def test_precomputed_embedding_skips_embed(self, loaded_faiss_db, monkeypatch):
+        vec = loaded_faiss_db["provider"].embed(["confidentiality agreement"])
+
+        def fail(texts):
+            raise AssertionError("embed should not be called")
+
+        monkeypatch.setattr(loaded_faiss_db["provider"], "embed", fail)
+        results = search_similar_clauses(
+            "confidentiality agreement", loaded_faiss_db, top_k=1, query_embedding=vec
+        )
+        assert len(results) == 1
+
     def test_returns_results_with_clause_and_score(self, loaded_faiss_db):
         results = search_similar_clauses(
             "confidentiality agreement", loaded_faiss_db, top_k=3
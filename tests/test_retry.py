@@ -5,7 +5,7 @@ from unittest.mock import patch
 
 import pytest
 
-from src.retry import retry_with_backoff
+from src.retry import is_transient_error, retry_with_backoff
 
 
 class TestRetryWithBackoff:
@@ -71,3 +71,54 @@ class TestRetryWithBackoff:
             fail_once()
 
         assert "Retry" in caplog.text
+
+    def test_should_retry_rejects_immediately(self):
+        calls = []
+
+        @retry_with_backoff(max_retries=3, base_delay=0.01, should_retry=lambda e: False)
+        def bad_request():
+            calls.append(1)
+            raise ValueError("400")
+
+        with pytest.raises(ValueError):
+            bad_request()
+        assert len(calls) == 1
+
+    def test_jitter_stays_within_half_to_full_delay(self):
+        @retry_with_backoff(max_retries=4, base_delay=1.0)
+        def always_fail():
+            raise ValueError("fail")
+
+        with patch("src.retry.time.sleep") as mock_sleep:
+            with pytest.raises(ValueError):
+                always_fail()
+
+        for attempt, call in enumerate(mock_sleep.call_args_list):
+            assert 0.5 * 2 ** attempt <= call[0][0] <= 2 ** attempt
+
+
+class TestIsTransientError:
+    @staticmethod
+    def _status_error(status):
+        exc = Exception("api error")
+        exc.status_code = status
+        return exc
+
+    @pytest.mark.parametrize("status", [408, 409, 429, 500, 503])
+    def test_retryable_statuses(self, status):
+        assert is_transient_error(self._status_error(status))
+
+    @pytest.mark.parametrize("status", [400, 401, 403, 404, 422])
+    def test_client_errors_not_retried(self, status):
+        assert not is_transient_error(self._status_error(status))
+
+    def test_botocore_style_response(self):
+        exc = Exception("ThrottlingException")
+        exc.response = {"Error": {"Code": "ThrottlingException"},
+                        "ResponseMetadata": {"HTTPStatusCode": 429}}
+        assert is_transient_error(exc)
+        exc.response["ResponseMetadata"]["HTTPStatusCode"] = 400
+        assert not is_transient_error(exc)
+
+    def test_errors_without_status_are_transient(self):
+        assert is_transient_error(ConnectionError("reset"))
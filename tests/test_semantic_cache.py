@@ -0,0 +1,156 @@
+"""Tests for src/semantic_cache.py and its use in the API."""
+
+import numpy as np
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+from src import execution_gate
+from src.semantic_cache import SemanticCache
+
+
+def _vec(seed: int, dim: int = 16) -> np.ndarray:
+    return np.random.RandomState(seed).randn(dim).astype(np.float32)
+
+
+class TestSemanticCache:
+    def test_empty_cache_misses(self):
+        cache = SemanticCache(dim=16)
+        assert cache.get(_vec(1)) is None
+        assert cache.misses == 1
+
+    def test_identical_embedding_hits(self):
+        cache = SemanticCache(dim=16)
+        cache.put(_vec(1), {"answer": "cached"})
+        assert cache.get(_vec(1)) == {"answer": "cached"}
+        assert cache.hits == 1
+
+    def test_scaled_embedding_hits(self):
+        """Lookup is by cosine similarity, so vector magnitude is irrelevant."""
+        cache = SemanticCache(dim=16)
+        cache.put(_vec(1), {"answer": "cached"})
+        assert cache.get(_vec(1) * 3.0) == {"answer": "cached"}
+
+    def test_dissimilar_embedding_misses(self):
+        cache = SemanticCache(dim=16)
+        cache.put(_vec(1), {"answer": "cached"})
+        assert cache.get(_vec(2)) is None
+
+    def test_accepts_2d_embedding(self):
+        cache = SemanticCache(dim=16)
+        cache.put(_vec(1).reshape(1, -1), {"answer": "cached"})
+        assert cache.get(_vec(1).reshape(1, -1)) == {"answer": "cached"}
+
+    def test_scope_isolates_entries(self):
+        cache = SemanticCache(dim=16)
+        cache.put(_vec(1), {"answer": "basic"}, scope="analyze:basic")
+        assert cache.get(_vec(1), scope="analyze:few_shot") is None
+        assert cache.get(_vec(1), scope="analyze:basic") == {"answer": "basic"}
+
+    def test_evicts_least_recently_used(self):
+        cache = SemanticCache(dim=16, capacity=2)
+        cache.put(_vec(1), {"n": 1})
+        cache.put(_vec(2), {"n": 2})
+        cache.get(_vec(1))  # touch 1 so 2 becomes LRU
+        cache.put(_vec(3), {"n": 3})
+
+        assert len(cache) == 2
+        assert cache.get(_vec(2)) is None
+        assert cache.get(_vec(1)) == {"n": 1}
+        assert cache.get(_vec(3)) == {"n": 3}
+
+    def test_clear(self):
+        cache = SemanticCache(dim=16)
+        cache.put(_vec(1), {"n": 1})
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.get(_vec(1)) is None
+
+    def test_evidence_overlap_required_when_given(self):
+        cache = SemanticCache(dim=16, evidence_threshold=0.8)
+        cache.put(_vec(1), {"n": 1}, evidence_ids=["a", "b", "c", "d", "e"])
+        # 4 of 5 shared -> Jaccard 0.8
+        assert cache.get(_vec(1), evidence_ids=["a", "b", "c", "d"]) == {"n": 1}
+        # 3 shared of 7 distinct -> too different
+        assert cache.get(_vec(1), evidence_ids=["a", "b", "c", "x", "y"]) is None
+
+    def test_entry_without_evidence_misses_evidence_lookup(self):
+        cache = SemanticCache(dim=16)
+        cache.put(_vec(1), {"n": 1})
+        assert cache.get(_vec(1), evidence_ids=["a"]) is None
+        assert cache.get(_vec(1)) == {"n": 1}
+
+    def test_zero_capacity_rejected(self):
+        with pytest.raises(ValueError):
+            SemanticCache(dim=16, capacity=0)
+
+
+class TestApiSemanticCache:
+    @pytest.fixture
+    def client(self, loaded_faiss_db, monkeypatch):
+        import src.api as api
+        from src.api import app, get_db
+
+        monkeypatch.setenv("SEMANTIC_CACHE_ENABLED", "1")
+        monkeypatch.setattr(api, "_semantic_cache", None)
+        app.dependency_overrides[get_db] = lambda: loaded_faiss_db
+        yield TestClient(app)
+        app.dependency_overrides.clear()
+
+    def test_repeat_analyze_skips_llm(self, client):
+        body = {"clause_text": "Employee agrees not to compete for 2 years worldwide."}
+        with patch("src.rag_pipeline.generate_analysis", return_value='{"risk_level": "high"}') as mock_gen:
+            first = client.post("/analyze", json=body)
+            second = client.post("/analyze", json=body)
+
+        assert first.status_code == 200
+        assert second.json() == first.json()
+        assert mock_gen.call_count == 1
+
+    def test_different_strategy_is_not_shared(self, client):
+        text = "Employee agrees not to compete for 2 years worldwide."
+        with patch("src.rag_pipeline.generate_analysis", return_value='{"risk_level": "high"}') as mock_gen:
+            client.post("/analyze", json={"clause_text": text, "strategy": "basic"})
+            resp = client.post("/analyze", json={"clause_text": text, "strategy": "structured"})
+
+        assert resp.json()["strategy"] == "structured"
+        assert mock_gen.call_count == 2
+
+    def test_disabled_by_default(self, client, monkeypatch):
+        monkeypatch.delenv("SEMANTIC_CACHE_ENABLED")
+        with patch("src.rag_pipeline.generate_analysis", return_value='{"risk_level": "high"}') as mock_gen:
+            # Not byte-identical, so the execution gate's exact-duplicate check doesn't apply
+            client.post("/analyze", json={"clause_text": "Employee agrees not to compete for 2 years worldwide."})
+            client.post("/analyze", json={"clause_text": "Employee agrees not to compete for 2 years worldwide!"})
+
+        assert mock_gen.call_count == 2
+
+    def test_analyze_hit_requires_same_sources(self, client, monkeypatch):
+        body = {"clause_text": "Employee agrees not to compete for 2 years worldwide."}
+        with patch("src.rag_pipeline.generate_analysis", return_value='{"risk_level": "high"}') as mock_gen:
+            client.post("/analyze", json=body)
+            execution_gate.clear()  # only the semantic cache may answer the repeat
+            # Same query, but retrieval now surfaces different evidence
+            monkeypatch.setattr(
+                "src.api.search_similar_clauses_by_vector",
+                lambda *a, **kw: [],
+            )
+            client.post("/analyze", json=body)
+
+        assert mock_gen.call_count == 2
+
+    def test_repeat_breach_reuses_state_analyses(self, client, loaded_multi_source_db):
+        from src.api import app, get_db
+
+        app.dependency_overrides[get_db] = lambda: loaded_multi_source_db
+        body = {"data_types_compromised": ["ssn"], "affected_states": ["UK"]}
+        with patch("src.breach_analysis.analyze_breach_for_state",
+                   return_value={"jurisdiction": "UK", "notification_required": True}) as mock_analyze:
+            first = client.post("/breach-analysis", json=body)
+            second = client.post("/breach-analysis", json=body)
+            changed = client.post("/breach-analysis", json={**body, "encryption_status": "encrypted"})
+
+        assert first.status_code == 200
+        assert second.json()["state_analyses"] == first.json()["state_analyses"]
+        assert changed.status_code == 200
+        assert mock_analyze.call_count == 2
@@ -6,7 +6,7 @@ from unittest.mock import patch
 import numpy as np
 import pytest
 
-from src.vector_store import FaissVectorStore, create_vector_store
+from src.vector_store import FaissVectorStore, create_vector_store, default_index_factory
 
 
 def _make_vectors(n, dim=1536):
@@ -108,6 +108,38 @@ class TestFaissVectorStore:
         for r in results:
             assert r["metadata"]["type"] == "NDA"
 
+    def test_search_grouped_matches_per_group_search(self):
+        store = FaissVectorStore()
+        vecs = _make_vectors(30)
+        ids = [f"id-{i}" for i in range(30)]
+        meta = [
+            {"jurisdiction": ["CA", "NY", "TX"][i % 3], "source": "statutes" if i % 4 else "clauses"}
+            for i in range(30)
+        ]
+        store.upsert(ids, vecs, meta)
+
+        query = vecs[0:1].copy()
+        grouped = store.search_grouped(
+            query, "jurisdiction", ["NY", "CA", "FL"], top_k=3, filters={"source": "statutes"},
+        )
+        assert list(grouped) == ["NY", "CA", "FL"]
+        for state, hits in grouped.items():
+            expected = store.search(query, top_k=3, filters={"source": "statutes", "jurisdiction": state})
+            # Same ranking; the wider shared window can only add hits a
+            # per-group search missed
+            assert [h["id"] for h in hits][:len(expected)] == [h["id"] for h in expected]
+            assert len(hits) <= 3
+        assert grouped["FL"] == []
+
+    def test_search_grouped_single_index_query(self):
+        store = FaissVectorStore()
+        vecs = _make_vectors(6)
+        store.upsert([f"id-{i}" for i in range(6)], vecs, [{"jurisdiction": "CA"}] * 6)
+
+        with patch.object(store._index, "search", wraps=store._index.search) as index_search:
+            store.search_grouped(vecs[0:1].copy(), "jurisdiction", ["CA", "NY", "TX"], top_k=2)
+        index_search.assert_called_once()
+
     def test_delete_removes_from_search(self):
         store = FaissVectorStore()
         vecs = _make_vectors(5)
@@ -136,6 +168,95 @@ class TestFaissVectorStore:
         assert deleted == 0
 
 
+class TestDefaultIndexFactory:
+    def test_lists_and_codes_scale_with_corpus(self):
+        assert default_index_factory(10_000) == "OPQ16_64,IVF256_HNSW32,PQ16"
+        assert default_index_factory(100_000) == "OPQ32_64,IVF1024_HNSW32,PQ32"
+        assert default_index_factory(1_000_000) == "OPQ32_64,IVF2048_HNSW32,PQ32"
+
+    def test_lists_capped_by_training_points(self):
+        # 4*sqrt(19k) ~ 551 would allow 512 lists, but 512 lists need ~20k training points
+        assert "IVF256_" in default_index_factory(19_000)
+        assert "IVF512_" in default_index_factory(20_000)
+
+
+class TestFaissIndexSelection:
+    @pytest.fixture
+    def small_ivf(self, monkeypatch):
+        """Lower the flat cutoff and use a cheap IVF factory so training is fast."""
+        import src.vector_store as vector_store
+        monkeypatch.setattr(vector_store, "SQ8_INDEX_MIN_VECTORS", 50)
+        monkeypatch.setattr(vector_store, "FLAT_INDEX_MAX_VECTORS", 100)
+        monkeypatch.setenv("FAISS_INDEX_FACTORY", "IVF4,Flat")
+        monkeypatch.setenv("FAISS_NPROBE", "4")
+
+    def test_small_corpus_uses_flat_index(self):
+        import faiss
+        store = FaissVectorStore()
+        store.upsert(["a", "b"], _make_vectors(2, dim=32), [{}, {}])
+        assert isinstance(store._index, faiss.IndexFlatIP)
+
+    def test_mid_corpus_uses_int8_scalar_quantizer(self, monkeypatch):
+        import faiss
+        import src.vector_store as vector_store
+        monkeypatch.setattr(vector_store, "SQ8_INDEX_MIN_VECTORS", 50)
+        vecs = _make_vectors(200, dim=32)
+        ids = [f"id-{i}" for i in range(200)]
+        store = FaissVectorStore()
+        store.upsert(ids, vecs, [{} for _ in ids])
+
+        assert isinstance(store._index, faiss.IndexScalarQuantizer)
+        results = store.search(vecs[3:4].copy(), top_k=1)
+        assert results[0]["id"] == "id-3"
+        assert results[0]["score"] == pytest.approx(1.0, abs=0.02)
+
+    def test_large_corpus_uses_hnsw_over_int8(self, monkeypatch):
+        import faiss
+        import src.vector_store as vector_store
+        monkeypatch.setattr(vector_store, "SQ8_INDEX_MIN_VECTORS", 50)
+        monkeypatch.setattr(vector_store, "FLAT_INDEX_MAX_VECTORS", 100)
+        monkeypatch.delenv("FAISS_INDEX_FACTORY", raising=False)
+        monkeypatch.setenv("FAISS_EF_SEARCH", "48")
+        vecs = _make_vectors(300, dim=32)
+        ids = [f"id-{i}" for i in range(300)]
+        store = FaissVectorStore()
+        store.upsert(ids, vecs, [{} for _ in ids])
+
+        index = faiss.downcast_index(store._index)
+        assert isinstance(index, faiss.IndexHNSWSQ)
+        assert index.hnsw.efConstruction == vector_store.HNSW_EF_CONSTRUCTION
+        assert index.hnsw.efSearch == 48
+        results = store.search(vecs[11:12].copy(), top_k=1)
+        assert results[0]["id"] == "id-11"
+
+    def test_large_corpus_uses_trained_ivf_index(self, small_ivf):
+        import faiss
+        vecs = _make_vectors(400, dim=32)
+        ids = [f"id-{i}" for i in range(400)]
+        store = FaissVectorStore()
+        store.upsert(ids, vecs, [{} for _ in ids])
+
+        ivf = faiss.extract_index_ivf(store._index)
+        assert ivf.is_trained
+        assert ivf.nprobe == 4
+        assert store.total_vectors == 400
+
+        results = store.search(vecs[7:8].copy(), top_k=1)
+        assert results[0]["id"] == "id-7"
+
+    def test_nprobe_restored_after_load(self, small_ivf, tmp_path):
+        import faiss
+        vecs = _make_vectors(400, dim=32)
+        ids = [f"id-{i}" for i in range(400)]
+        store = FaissVectorStore()
+        store.upsert(ids, vecs, [{} for _ in ids])
+        store.save(str(tmp_path / "ivf"))
+
+        loaded = FaissVectorStore()
+        assert loaded.load(str(tmp_path / "ivf"))
+        assert faiss.extract_index_ivf(loaded._index).nprobe == 4
+
+
 class TestVectorStoreFactory:
     def test_faiss_factory(self):
         store = create_vector_store("faiss")
@@ -149,3 +270,33 @@ class TestVectorStoreFactory:
     def test_unknown_provider(self):
         with pytest.raises(ValueError, match="Unknown vector store provider"):
             create_vector_store("unknown")
+
+
+class TestPineconeUpsert:
+    @pytest.fixture
+    def store(self):
+        from unittest.mock import MagicMock
+        from src.vector_store import PineconeVectorStore
+
+        store = PineconeVectorStore.__new__(PineconeVectorStore)
+        store._index = MagicMock()
+        return store
+
+    def test_upserts_in_batches_of_100(self, store):
+        vecs = _make_vectors(250, dim=8)
+        ids = [f"id-{i}" for i in range(250)]
+
+        count = store.upsert(ids, vecs, [{"k": "v"} for _ in ids])
+
+        assert count == 250
+        sizes = sorted(len(c.kwargs["vectors"]) for c in store._index.upsert.call_args_list)
+        assert sizes == [50, 100, 100]
+
+    def test_strips_none_metadata(self, store):
+        vecs = _make_vectors(1, dim=8)
+        store.upsert(["a"], vecs, [{"keep": "x", "drop": None}])
+
+        (vec_id, values, meta), = store._index.upsert.call_args.kwargs["vectors"]
+        assert vec_id == "a"
+        assert len(values) == 8
+        assert meta == {"keep": "x"}